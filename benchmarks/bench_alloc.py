@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Per-frame memory churn of the inference loop, measured with tracemalloc.
+
+Replays synthetic hands through the per-frame path of scripts/infer.py
+(features, motion gate, temporal window, prediction, smoothing) twice:
+- lists: `landmarks_to_feature_vector` and `predict_proba([feat])`
+- buffers: `FeatureExtractor` writing into reused arrays
+For each, it reports the mean per-frame peak of memory allocated above the
+frame's starting point (tracemalloc; temporaries that are freed again
+within the frame), the bytes still held after all frames (bounded caches
+show up here, growth would mean a leak) and the time per frame.
+
+Usage:
+	python benchmarks/bench_alloc.py
+	python benchmarks/bench_alloc.py --model models/slr_svm.compiled.joblib --window 8
+"""
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from slr.classifier import load_model_bundle, train_svm_classifier
+from slr.features import FeatureExtractor, landmarks_to_feature_vector
+from slr.gating import MotionGate
+from slr.landmarks import HandLandmarks
+from slr.synthetic import synthetic_feature_dataset, synthetic_hand_frames
+from slr.temporal import SlidingWindowFeatures
+from slr.text_buffer import TemporalLabelSmoother
+
+
+def _measure(step: Callable[[List[HandLandmarks]], None], frames: List[List[HandLandmarks]], warmup: int) -> Dict[str, float]:
+	for hands in frames[:warmup]:
+		step(hands)
+	frames = frames[warmup:]
+	t0 = time.perf_counter()
+	for hands in frames:
+		step(hands)
+	elapsed = time.perf_counter() - t0
+	gc.collect()
+	tracemalloc.start()
+	start = tracemalloc.get_traced_memory()[0]
+	churn = 0
+	for hands in frames:
+		tracemalloc.reset_peak()
+		before = tracemalloc.get_traced_memory()[0]
+		step(hands)
+		churn += tracemalloc.get_traced_memory()[1] - before
+	held = tracemalloc.get_traced_memory()[0] - start
+	tracemalloc.stop()
+	return {
+		"churn": churn / len(frames),
+		"held": held,
+		"us": elapsed / len(frames) * 1e6,
+	}
+
+
+def _loop(predictor, window, buffers: bool, predict: bool) -> Callable[[List[HandLandmarks]], None]:
+	extract = FeatureExtractor()
+	gate = MotionGate(0.0)
+	temporal = SlidingWindowFeatures(window) if window else None
+	smoother = TemporalLabelSmoother()
+	classes = predictor.classes_
+
+	def step(hands: List[HandLandmarks]) -> None:
+		if buffers:
+			feat = extract(hands)
+			has_hands = feat.any()
+		else:
+			feat = landmarks_to_feature_vector(hands)
+			has_hands = feat and any(feat)
+		if not has_hands:
+			return
+		gate.lookup(feat)
+		model_input = temporal.push(feat) if temporal is not None else feat
+		if not predict:
+			return
+		proba = predictor.predict_proba(model_input[None] if buffers else [model_input])[0]
+		gate.store(feat, proba)
+		smoother.push(classes[int(np.argmax(proba))])
+
+	return step
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--model", dest="model", type=Path, default=None, help="Model to predict with (default: a throwaway SVM on synthetic data)")
+	parser.add_argument("--window", dest="window", type=int, default=None, help="Temporal window, for models trained with --window")
+	parser.add_argument("--frames", dest="frames", type=int, default=2000)
+	parser.add_argument("--warmup", dest="warmup", type=int, default=200)
+	args = parser.parse_args()
+
+	if args.model:
+		predictor, info = load_model_bundle(args.model)
+		window = args.window or info.get("feature_window")
+	else:
+		X, y = synthetic_feature_dataset(n_labels=5, n_per_label=100)
+		with tempfile.TemporaryDirectory() as tmp:
+			predictor, _ = load_model_bundle(train_svm_classifier(X, y, Path(tmp) / "model.joblib").model_path)
+		window = args.window
+	frames = synthetic_hand_frames(args.frames + args.warmup, seed=1)
+
+	print(f"{'path':28s} {'peak/frame':>12s} {'held':>10s} {'us/frame':>9s}")
+	for predict in (False, True):
+		for buffers in (False, True):
+			name = f"{'buffers' if buffers else 'lists'}{' + predict' if predict else ' (features)'}"
+			result = _measure(_loop(predictor, window, buffers, predict), frames, args.warmup)
+			print(f"{name:28s} {result['churn']:10.0f} B {result['held']:8.0f} B {result['us']:9.1f}")
+
+
+if __name__ == "__main__":
+	main()
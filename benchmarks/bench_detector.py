@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Per-frame cost of the detector's display path vs headless mode.
+
+Always times the frame preparation around MediaPipe (mirror, RGB
+conversion, visualization copy) on its own. With MediaPipe Hands available
+it also times `MediaPipeHandDetector.process_bgr_frame` end to end in both
+modes.
+
+Usage:
+	python benchmarks/bench_detector.py
+	python benchmarks/bench_detector.py --source recordings/session.mp4 --frames 300
+"""
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from slr.sources import iter_frames
+
+
+def _load_frames(source, count: int, width: int, height: int):
+	if source is None:
+		rng = np.random.default_rng(0)
+		return [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(min(count, 32))]
+	return [frame for _, frame in iter_frames(source, 0, count)]
+
+
+def _time_per_frame(fn, frames, count: int) -> float:
+	fn(frames[0])
+	t0 = time.perf_counter()
+	for i in range(count):
+		fn(frames[i % len(frames)])
+	return (time.perf_counter() - t0) / count
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--source", dest="source", type=Path, default=None, help="Video file or frame directory (default: synthetic frames)")
+	parser.add_argument("--frames", dest="frames", type=int, default=300)
+	parser.add_argument("--width", dest="width", type=int, default=640)
+	parser.add_argument("--height", dest="height", type=int, default=480)
+	args = parser.parse_args()
+
+	frames = _load_frames(args.source, args.frames, args.width, args.height)
+	h, w = frames[0].shape[:2]
+	flip_buf = np.empty_like(frames[0])
+	rgb_buf = np.empty_like(frames[0])
+
+	def display_prep(frame):
+		flipped = cv2.flip(frame, 1)
+		rgb = cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB)
+		return rgb, flipped.copy()
+
+	def headless_prep(frame):
+		flipped = cv2.flip(frame, 1, dst=flip_buf)
+		return cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+
+	print(f"{len(frames)} frames of {w}x{h}")
+	prep_display = _time_per_frame(display_prep, frames, args.frames)
+	prep_headless = _time_per_frame(headless_prep, frames, args.frames)
+	print(f"frame prep  display {prep_display * 1e6:8.1f} us  headless {prep_headless * 1e6:8.1f} us")
+
+	try:
+		from slr.hand import MediaPipeHandDetector
+		detectors = {
+			"display": MediaPipeHandDetector(),
+			"headless": MediaPipeHandDetector(headless=True),
+		}
+	except RuntimeError as exc:
+		print("Skipping end-to-end detector timing:", exc)
+		return
+	results = {}
+	for name, detector in detectors.items():
+		results[name] = _time_per_frame(detector.process_bgr_frame, frames, args.frames)
+		detector.close()
+	saved = results["display"] - results["headless"]
+	print(
+		f"detector    display {results['display'] * 1e3:8.2f} ms  headless {results['headless'] * 1e3:8.2f} ms"
+		f"  saved {saved * 1e3:.2f} ms/frame"
+	)
+
+
+if __name__ == "__main__":
+	main()
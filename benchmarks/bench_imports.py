@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Startup time of the entry points and which heavy packages they import.
+
+Each entry point runs with `--help` in a fresh interpreter under
+`-X importtime`, so the time is interpreter start plus module imports. The
+cumulative import time of cv2, mediapipe and sklearn is read from the
+importtime log; "-" means the package was not imported at all.
+
+Usage:
+	python benchmarks/bench_imports.py
+	python benchmarks/bench_imports.py --runs 10 scripts/train.py scripts/serve.py
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("cv2", "mediapipe", "sklearn")
+DEFAULT_TARGETS = (
+	"scripts/train.py",
+	"scripts/serve.py",
+	"scripts/export_model.py",
+	"scripts/convert_dataset.py",
+	"scripts/dedup_dataset.py",
+	"scripts/infer.py",
+)
+
+
+def _run(target: str) -> Tuple[float, Dict[str, float]]:
+	"""Wall seconds of one `--help` run and cumulative seconds per heavy package."""
+	env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+	t0 = time.perf_counter()
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", str(ROOT / target), "--help"],
+		env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+	)
+	wall = time.perf_counter() - t0
+	if proc.returncode != 0:
+		raise RuntimeError(f"{target} --help failed:\n{proc.stderr[-2000:]}")
+	heavy: Dict[str, float] = {}
+	for line in proc.stderr.splitlines():
+		# import time: self [us] | cumulative | imported package
+		parts = line.split("|")
+		if len(parts) == 3 and parts[2].strip() in HEAVY:
+			heavy[parts[2].strip()] = int(parts[1]) / 1e6
+	return wall, heavy
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS), help="Scripts relative to the repository root")
+	parser.add_argument("--runs", dest="runs", type=int, default=5, help="Runs per target; the median is reported")
+	args = parser.parse_args()
+
+	print(f"{'entry point':28s} {'median':>9s} " + " ".join(f"{name:>10s}" for name in HEAVY))
+	for target in args.targets:
+		runs: List[Tuple[float, Dict[str, float]]] = [_run(target) for _ in range(args.runs)]
+		wall = statistics.median(r[0] for r in runs)
+		cells = []
+		for name in HEAVY:
+			times = [r[1][name] for r in runs if name in r[1]]
+			cells.append(f"{statistics.median(times) * 1e3:8.0f}ms" if times else f"{'-':>10s}")
+		print(f"{target:28s} {wall * 1e3:7.0f}ms " + " ".join(cells))
+
+
+if __name__ == "__main__":
+	main()
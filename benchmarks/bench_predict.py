@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Per-frame latency of the sklearn pipeline vs the compiled NumPy predictor.
+
+Usage:
+	python benchmarks/bench_predict.py --model models/slr_svm.joblib
+	python benchmarks/bench_predict.py  # trains a throwaway model on synthetic data
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from slr.classifier import load_model, train_svm_classifier
+from slr.compiled import CompiledSVMPredictor
+
+
+def _synthetic_model(n_labels: int, n_per_label: int, seed: int = 0):
+	rng = np.random.default_rng(seed)
+	centers = rng.normal(size=(n_labels, 126))
+	X = np.concatenate([c + 0.3 * rng.normal(size=(n_per_label, 126)) for c in centers])
+	y = np.repeat([f"SIGN_{i}" for i in range(n_labels)], n_per_label)
+	with tempfile.TemporaryDirectory() as tmp:
+		res = train_svm_classifier(X, y, Path(tmp) / "model.joblib")
+		return load_model(res.model_path)[0], X
+
+
+def _time_per_call(fn, rows, repeats: int) -> float:
+	fn(rows[0])
+	t0 = time.perf_counter()
+	for i in range(repeats):
+		fn(rows[i % len(rows)])
+	return (time.perf_counter() - t0) / repeats
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--model", dest="model", type=Path, default=None)
+	parser.add_argument("--labels", dest="labels", type=int, default=10, help="Synthetic labels when no model is given")
+	parser.add_argument("--samples", dest="samples", type=int, default=200, help="Synthetic samples per label")
+	parser.add_argument("--repeats", dest="repeats", type=int, default=2000)
+	args = parser.parse_args()
+
+	if args.model:
+		pipeline, _ = load_model(args.model)
+		if not hasattr(pipeline, "named_steps"):
+			sys.exit(
+				f"{args.model} loads as {type(pipeline).__name__}, not a StandardScaler + SVC pipeline; "
+				"pass the model saved by scripts/train.py (before export_model.py)"
+			)
+		rng = np.random.default_rng(1)
+		rows = rng.normal(size=(256, pipeline.named_steps["scaler"].n_features_in_))
+	else:
+		pipeline, rows = _synthetic_model(args.labels, args.samples)
+	compiled64 = CompiledSVMPredictor.from_pipeline(pipeline)
+	compiled32 = CompiledSVMPredictor.from_pipeline(pipeline, dtype=np.float32)
+
+	feats = [row.tolist() for row in rows[:256]]
+	ref = pipeline.predict_proba(feats)
+	ref_votes = pipeline.predict(feats)
+	for name, model in (("float64", compiled64), ("float32", compiled32)):
+		proba = model.predict_proba(np.asarray(feats))
+		same_proba = np.array_equal(ref.argmax(axis=1), proba.argmax(axis=1))
+		same_votes = np.array_equal(ref_votes, model.predict(np.asarray(feats)))
+		print(
+			f"compiled {name}: max |dp| = {np.abs(ref - proba).max():.2e}, "
+			f"argmax(predict_proba) identical: {same_proba}, predict (ovo vote) identical: {same_votes}"
+		)
+
+	n_sv = len(pipeline.named_steps["clf"].support_vectors_)
+	print(f"{len(pipeline.classes_)} classes, {n_sv} support vectors")
+	results = {
+		"sklearn pipeline": _time_per_call(lambda f: pipeline.predict_proba([f]), feats, args.repeats),
+		"compiled float64": _time_per_call(lambda f: compiled64.predict_proba([f]), feats, args.repeats),
+		"compiled float32": _time_per_call(lambda f: compiled32.predict_proba([f]), feats, args.repeats),
+	}
+	base = results["sklearn pipeline"]
+	for name, seconds in results.items():
+		print(f"{name:18s} {seconds * 1e6:9.1f} us/frame  x{base / seconds:5.2f}")
+
+
+if __name__ == "__main__":
+	main()
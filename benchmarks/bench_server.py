@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Throughput and latency of the inference server vs its batch window.
+
+Starts `InferenceServer` in-process on a Unix socket for each batch window
+and drives it with concurrent `InferenceClient` threads sending synthetic
+feature vectors.
+
+Usage:
+	python benchmarks/bench_server.py --model models/slr_svm.joblib --clients 16
+	python benchmarks/bench_server.py --windows 0 1 5 --requests 500
+"""
+import argparse
+import asyncio
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from slr.classifier import load_model_bundle, train_svm_classifier
+from slr.server import InferenceClient, InferenceServer
+from slr.synthetic import synthetic_feature_dataset
+
+
+def _run_server(server: InferenceServer, path: str) -> threading.Thread:
+	loop = asyncio.new_event_loop()
+	task_holder = {}
+
+	def run():
+		asyncio.set_event_loop(loop)
+		task_holder["task"] = loop.create_task(server.serve(path))
+		try:
+			loop.run_until_complete(task_holder["task"])
+		except asyncio.CancelledError:
+			pass
+
+	thread = threading.Thread(target=run, daemon=True)
+	thread.start()
+	while not Path(path).exists():
+		time.sleep(0.01)
+	thread.stop = lambda: loop.call_soon_threadsafe(task_holder["task"].cancel)  # type: ignore[attr-defined]
+	return thread
+
+
+def _client(path: str, rows: np.ndarray, count: int, latencies: list) -> None:
+	with InferenceClient(path) as client:
+		for i in range(count):
+			t0 = time.perf_counter()
+			client.classify(rows[i % len(rows)])
+			latencies.append(time.perf_counter() - t0)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--model", dest="model", type=Path, default=None, help="Model bundle (default: train one on synthetic data)")
+	parser.add_argument("--clients", dest="clients", type=int, default=8)
+	parser.add_argument("--requests", dest="requests", type=int, default=300, help="Requests per client")
+	parser.add_argument("--windows", dest="windows", type=float, nargs="+", default=[0.0, 1.0, 2.0, 5.0], help="Batch windows in ms")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		X, y = synthetic_feature_dataset(10, 100, seed=3)
+		model_path = args.model
+		if model_path is None:
+			model_path = train_svm_classifier(X, y, Path(tmp) / "model.joblib").model_path
+		predictor, info = load_model_bundle(model_path)
+		if info.get("feature_window"):
+			raise SystemExit("Use a model trained without --window for this benchmark")
+		path = str(Path(tmp) / "slr.sock")
+		print(f"{args.clients} clients x {args.requests} requests")
+		for window_ms in args.windows:
+			server = InferenceServer(predictor, info, batch_window=window_ms / 1000.0)
+			thread = _run_server(server, path)
+			latencies: list = []
+			clients = [
+				threading.Thread(target=_client, args=(path, X[i::args.clients], args.requests, latencies))
+				for i in range(args.clients)
+			]
+			t0 = time.perf_counter()
+			for c in clients:
+				c.start()
+			for c in clients:
+				c.join()
+			elapsed = time.perf_counter() - t0
+			thread.stop()
+			thread.join(timeout=2.0)
+			lat = np.asarray(latencies) * 1e3
+			print(
+				f"window {window_ms:4.1f} ms  {len(lat) / elapsed:8.0f} req/s  mean batch {server.mean_batch_size:5.1f}"
+				f"  p50 {np.percentile(lat, 50):6.2f} ms  p99 {np.percentile(lat, 99):6.2f} ms"
+			)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for the slr hot paths on synthetic landmarks.
+
+Needs no camera or MediaPipe: hands come from `slr.synthetic`. Times
+feature extraction, temporal windows, single-row and batched prediction
+(sklearn pipeline and compiled predictor), label smoothing and text
+building over several input sizes, and writes the results as JSON.
+Pass `--compare` with an earlier results file to print speed ratios.
+
+Usage:
+	python benchmarks/run.py --out bench.json
+	python benchmarks/run.py --quick --out new.json --compare bench.json
+	python benchmarks/run.py --only features predict
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import sklearn
+
+from slr.classifier import load_model, train_svm_classifier
+from slr.compiled import CompiledSVMPredictor
+from slr.features import hands_to_landmark_array, landmarks_to_feature_matrix, landmarks_to_feature_vector
+from slr.synthetic import synthetic_feature_dataset, synthetic_hand_frames
+from slr.temporal import SlidingWindowFeatures
+from slr.text_buffer import ProbabilityWindowDecoder, TemporalLabelSmoother, TextBuilder, ViterbiLabelDecoder
+
+
+GROUPS = ["features", "temporal", "predict", "smoothing", "text"]
+
+
+def _measure(fn: Callable[[], object], items: int, rounds: int, min_seconds: float) -> Dict[str, float]:
+	"""Time `fn` (which processes `items` inputs) and report per-item times.
+
+	Calls are grouped into rounds of at least `min_seconds`; the median and
+	best rounds are reported, in microseconds per item.
+	"""
+	fn()
+	calls = 1
+	while True:
+		t0 = time.perf_counter()
+		for _ in range(calls):
+			fn()
+		if time.perf_counter() - t0 >= min_seconds or calls >= 1 << 20:
+			break
+		calls *= 2
+	per_item = []
+	for _ in range(rounds):
+		t0 = time.perf_counter()
+		for _ in range(calls):
+			fn()
+		per_item.append((time.perf_counter() - t0) / (calls * items))
+	per_item_us = np.asarray(per_item) * 1e6
+	return {
+		"items": items,
+		"calls": calls * rounds,
+		"median_us": float(np.median(per_item_us)),
+		"min_us": float(per_item_us.min()),
+		"max_us": float(per_item_us.max()),
+	}
+
+
+class Suite:
+	def __init__(self, rounds: int, min_seconds: float):
+		self.rounds = rounds
+		self.min_seconds = min_seconds
+		self.results: List[Dict] = []
+
+	def run(self, name: str, size: int, fn: Callable[[], object], items: int = 1) -> None:
+		stats = _measure(fn, items, self.rounds, self.min_seconds)
+		self.results.append({"name": name, "size": size, **stats})
+		print(f"{name:34s} {size:6d} {stats['median_us']:11.2f} us/item  (min {stats['min_us']:.2f})", flush=True)
+
+
+def _cycle(items):
+	"""Callable returning the next element of `items` on each call."""
+	state = {"i": 0}
+
+	def next_item():
+		i = state["i"]
+		state["i"] = (i + 1) % len(items)
+		return items[i]
+
+	return next_item
+
+
+def bench_features(suite: Suite, sizes: List[int]) -> None:
+	for two_hands in (False, True):
+		frames = synthetic_hand_frames(256, two_hands=two_hands, seed=1)
+		hands_n = 2 if two_hands else 1
+		nxt = _cycle(frames)
+		suite.run(f"features.vector[{hands_n}h]", 1, lambda: landmarks_to_feature_vector(nxt()))
+		for n in sizes:
+			batch = (frames * (n // len(frames) + 1))[:n]
+
+			def matrix():
+				arrays = [hands_to_landmark_array(h) for h in batch]
+				landmarks_to_feature_matrix(np.stack([a for a, _ in arrays]), np.stack([m for _, m in arrays]))
+
+			suite.run(f"features.matrix[{hands_n}h]", n, matrix, items=n)
+
+
+def bench_temporal(suite: Suite, sizes: List[int]) -> None:
+	frames = [landmarks_to_feature_vector(h) for h in synthetic_hand_frames(256, seed=2)]
+	for window in sorted({max(s, 2) for s in sizes if s <= 64} | {8}):
+		temporal = SlidingWindowFeatures(window)
+		nxt = _cycle(frames)
+		suite.run("temporal.push", window, lambda: temporal.push(nxt()))
+
+
+def _train_model(n_labels: int, n_per_label: int):
+	X, y = synthetic_feature_dataset(n_labels, n_per_label, seed=3)
+	with tempfile.TemporaryDirectory() as tmp:
+		res = train_svm_classifier(X, y, Path(tmp) / "model.joblib")
+		return load_model(res.model_path)[0], X
+
+
+def bench_predict(suite: Suite, sizes: List[int], n_labels: int, n_per_label: int) -> None:
+	pipeline, X = _train_model(n_labels, n_per_label)
+	models = {
+		"sklearn": pipeline,
+		"compiled64": CompiledSVMPredictor.from_pipeline(pipeline),
+		"compiled32": CompiledSVMPredictor.from_pipeline(pipeline, dtype=np.float32),
+	}
+	rows = [row.tolist() for row in X[:256]]
+	for name, model in models.items():
+		nxt = _cycle(rows)
+		suite.run(f"predict.single[{name}]", 1, lambda: model.predict_proba([nxt()]))
+		for n in sizes:
+			batch = X[np.arange(n) % len(X)]
+			suite.run(f"predict.batch[{name}]", n, lambda: model.predict_proba(batch), items=n)
+
+
+def bench_smoothing(suite: Suite, sizes: List[int], n_labels: int) -> None:
+	rng = np.random.default_rng(4)
+	classes = [f"SIGN_{i}" for i in range(n_labels)]
+	runs = np.repeat(rng.integers(0, n_labels, 64), 12)
+	probas = rng.dirichlet(np.ones(n_labels), len(runs))
+	probas[np.arange(len(runs)), runs] += 1.0
+	probas /= probas.sum(axis=1, keepdims=True)
+	labels = [classes[i] for i in probas.argmax(axis=1)]
+	for window in sorted({max(s, 2) for s in sizes if s <= 64} | {8}):
+		vote = TemporalLabelSmoother(window_size=window, min_count=window // 2 + 1)
+		nxt_label = _cycle(labels)
+		suite.run("smoothing.vote", window, lambda: vote.push(nxt_label()))
+		prob = ProbabilityWindowDecoder(classes, window_size=window)
+		nxt_proba = _cycle(list(probas))
+		suite.run("smoothing.prob", window, lambda: prob.push(nxt_proba()))
+	viterbi = ViterbiLabelDecoder(classes)
+	nxt_proba = _cycle(list(probas))
+	suite.run("smoothing.viterbi", n_labels, lambda: viterbi.push(nxt_proba()))
+
+
+def bench_text(suite: Suite, sizes: List[int]) -> None:
+	words = [f"SIGN_{i}" for i in range(8)]
+	for n in sizes:
+		# Phrase of n words built from scratch; cost grows with phrase length.
+		def build():
+			builder = TextBuilder()
+			for i in range(n):
+				builder.push_label(words[i % len(words)])
+
+		suite.run("text.push_label", n, build, items=n)
+
+
+def _metadata() -> Dict:
+	try:
+		commit = subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		commit = None
+	return {
+		"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"commit": commit,
+		"python": sys.version.split()[0],
+		"numpy": np.__version__,
+		"sklearn": sklearn.__version__,
+		"platform": platform.platform(),
+		"processor": platform.processor() or platform.machine(),
+	}
+
+
+def _compare(results: List[Dict], baseline_path: Path) -> None:
+	baseline = {(r["name"], r["size"]): r for r in json.loads(baseline_path.read_text())["results"]}
+	print(f"\nvs {baseline_path} (ratio > 1 means faster now)")
+	for r in results:
+		old = baseline.get((r["name"], r["size"]))
+		if old is None:
+			continue
+		ratio = old["median_us"] / r["median_us"]
+		flag = "  <-- slower" if ratio < 0.9 else ""
+		print(f"{r['name']:34s} {r['size']:6d} {old['median_us']:11.2f} -> {r['median_us']:11.2f} us  x{ratio:5.2f}{flag}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--out", dest="out", type=Path, default=None, help="Write results JSON here")
+	parser.add_argument("--compare", dest="compare", type=Path, default=None, help="Earlier results JSON to compare against")
+	parser.add_argument("--only", dest="only", nargs="+", choices=GROUPS, default=GROUPS)
+	parser.add_argument("--sizes", dest="sizes", type=int, nargs="+", default=[1, 8, 64, 512], help="Batch, window and phrase sizes")
+	parser.add_argument("--labels", dest="labels", type=int, default=10, help="Synthetic labels for the model and decoders")
+	parser.add_argument("--samples", dest="samples", type=int, default=200, help="Synthetic training samples per label")
+	parser.add_argument("--rounds", dest="rounds", type=int, default=5)
+	parser.add_argument("--min-time", dest="min_time", type=float, default=0.05, help="Minimum seconds per round")
+	parser.add_argument("--quick", action="store_true", help="Fewer, shorter rounds for a fast smoke run")
+	args = parser.parse_args()
+	if args.quick:
+		args.rounds, args.min_time = 3, 0.01
+
+	suite = Suite(args.rounds, args.min_time)
+	print(f"{'benchmark':34s} {'size':>6s} {'median':>11s}")
+	if "features" in args.only:
+		bench_features(suite, args.sizes)
+	if "temporal" in args.only:
+		bench_temporal(suite, args.sizes)
+	if "predict" in args.only:
+		bench_predict(suite, args.sizes, args.labels, args.samples)
+	if "smoothing" in args.only:
+		bench_smoothing(suite, args.sizes, args.labels)
+	if "text" in args.only:
+		bench_text(suite, args.sizes)
+
+	if args.out:
+		args.out.parent.mkdir(parents=True, exist_ok=True)
+		args.out.write_text(json.dumps({"metadata": _metadata(), "results": suite.results}, indent=1))
+		print(f"Wrote {len(suite.results)} results to {args.out}")
+	if args.compare:
+		_compare(suite.results, args.compare)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from slr.hand import MediaPipeHandDetector
+from slr.features import landmarks_to_feature_vector
+from slr.classifier import load_model_bundle
+from slr.sources import iter_frames, probe_source
+from slr.temporal import SlidingWindowFeatures
+
+
+CSV_COLUMNS = ["source", "frame", "timestamp", "hands", "label", "confidence"]
+
+_detector: Optional[MediaPipeHandDetector] = None
+_pipeline = None
+_window: Optional[int] = None
+
+
+def _init_worker(model_path: Path) -> None:
+	"""Give each worker process its own detector and model."""
+	global _detector, _pipeline, _window
+	_detector = MediaPipeHandDetector(headless=True)
+	_pipeline, info = load_model_bundle(model_path)
+	_window = info.get("feature_window")
+
+
+def _process_segment(task: Tuple[str, int, Optional[int], float]) -> List[Dict]:
+	source, start, stop, fps = task
+	records: List[Dict] = []
+	# Segments reach workers in any order and from any source; MediaPipe's
+	# tracking state must not carry over from the previous one.
+	_detector.reset()
+	temporal = SlidingWindowFeatures(_window) if _window else None
+	# Temporal features only depend on the last `_window` frames, so
+	# detecting the window - 1 frames before `start` (without reporting
+	# them) gives the first frames of the segment the same window as a
+	# single pass, and warms up detector tracking.
+	preroll = min(start, _window - 1) if _window else 0
+	for index, frame in iter_frames(Path(source), start - preroll, stop):
+		hands, _ = _detector.process_bgr_frame(frame)
+		feat = landmarks_to_feature_vector(hands)
+		label = None
+		conf = 0.0
+		if feat and any(feat):
+			if temporal is not None:
+				feat = temporal.push(feat)
+			if index < start:
+				continue
+			proba = _pipeline.predict_proba([feat])[0]
+			idx = int(np.argmax(proba))
+			label = str(_pipeline.classes_[idx])
+			conf = float(proba[idx])
+		elif temporal is not None:
+			temporal.reset()
+		if index < start:
+			continue
+		records.append({
+			"source": source,
+			"frame": index,
+			"timestamp": index / fps if fps > 0 else None,
+			"hands": len(hands),
+			"label": label,
+			"confidence": conf,
+		})
+	return records
+
+
+def _plan_segments(sources: List[Path], segment_frames: int) -> List[Tuple[str, int, Optional[int], float]]:
+	"""Split each source into frame ranges; the last range reads to the end."""
+	tasks = []
+	for source in sources:
+		count, fps = probe_source(source)
+		if segment_frames <= 0 or count <= segment_frames:
+			tasks.append((str(source), 0, None, fps))
+			continue
+		starts = list(range(0, count, segment_frames))
+		for i, start in enumerate(starts):
+			stop = starts[i + 1] if i + 1 < len(starts) else None
+			tasks.append((str(source), start, stop, fps))
+	return tasks
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Offline SLR inference over video files or frame directories")
+	parser.add_argument("sources", type=Path, nargs="+", help="Video files and/or directories of image frames")
+	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_svm.joblib"))
+	parser.add_argument("--out", dest="out", type=Path, default=None, help="Output file (default: stdout)")
+	parser.add_argument("--format", dest="format", choices=["jsonl", "csv"], default="jsonl")
+	parser.add_argument("--workers", dest="workers", type=int, default=mp.cpu_count(), help="Detector processes")
+	parser.add_argument("--segment-frames", dest="segment_frames", type=int, default=600, help="Frames per work unit; 0 keeps each source whole. With a temporal model (train.py --window) each segment also re-detects the window - 1 frames before it, so its first predictions see a full window")
+	args = parser.parse_args()
+
+	tasks = _plan_segments(args.sources, args.segment_frames)
+	out = args.out.open("w", newline="") if args.out else sys.stdout
+	writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS) if args.format == "csv" else None
+	if writer:
+		writer.writeheader()
+
+	frames = 0
+	t0 = time.perf_counter()
+	try:
+		with mp.Pool(args.workers, initializer=_init_worker, initargs=(args.model,)) as pool:
+			# Ordered imap streams results per segment while keeping frame order.
+			for records in pool.imap(_process_segment, tasks, chunksize=1):
+				for record in records:
+					if writer:
+						writer.writerow(record)
+					else:
+						out.write(json.dumps(record) + "\n")
+				frames += len(records)
+	finally:
+		if args.out:
+			out.close()
+	elapsed = time.perf_counter() - t0
+	print(f"Processed {frames} frames from {len(args.sources)} sources in {elapsed:.1f}s ({frames / max(elapsed, 1e-9):.1f} fps)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
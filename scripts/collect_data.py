@@ -7,41 +7,92 @@ import cv2
 
 from slr.hand import MediaPipeHandDetector, webcam_capture
 from slr.features import landmarks_to_feature_vector
-from slr.dataset import CsvDataset, Sample
+from slr.dataset import BufferedSampleSink, Sample, open_dataset
+from slr.dedup import NearDuplicateFilter
+from slr.metrics import MetricsExporter, StageTimer, draw_overlay
 
 
 def main():
 	parser = argparse.ArgumentParser(description="Collect SLR training data from webcam")
 	parser.add_argument("label", type=str, help="Label to record, e.g. HELLO")
-	parser.add_argument("--out", dest="out", type=Path, default=Path("data/dataset.csv"))
+	parser.add_argument("--out", dest="out", type=Path, default=Path("data/dataset.csv"), help="CSV file or chunked dataset directory")
 	parser.add_argument("--frames", dest="frames", type=int, default=200)
+	parser.add_argument("--flush-every", dest="flush_every", type=int, default=64, help="Write samples in batches of this size")
+	parser.add_argument("--flush-interval", dest="flush_interval", type=float, default=1.0, help="Max seconds between writes")
+	parser.add_argument("--dedup", dest="dedup", type=float, default=0.0, help="Skip frames within this RMS landmark distance of one already kept for the label, e.g. 0.02 (0 keeps every frame)")
+	parser.add_argument("--headless", action="store_true", help="No window or drawing; print progress to stdout (Ctrl+C to stop)")
+	parser.add_argument("--overlay", action="store_true", help="Draw per-stage p50/p95/p99 latencies on the video")
+	parser.add_argument("--metrics-out", dest="metrics_out", type=Path, default=None, help="Periodically write per-stage latency percentiles to this JSON (or .csv) file")
+	parser.add_argument("--metrics-interval", dest="metrics_interval", type=float, default=5.0, help="Seconds between metrics file writes")
+	parser.add_argument("--metrics-port", dest="metrics_port", type=int, default=None, help="Serve per-stage latencies in Prometheus text format on this port (/metrics)")
 	args = parser.parse_args()
 
-	dataset = CsvDataset(args.out)
-	detector = MediaPipeHandDetector()
+	dataset = open_dataset(args.out, create=True)
+	dedup = NearDuplicateFilter(args.dedup) if args.dedup > 0 else None
+	if dedup is not None:
+		# Frames close to ones already saved for this label are skipped too.
+		X_old, y_old = dataset.read_arrays()
+		if len(X_old):
+			dedup.filter(X_old[y_old == args.label], [args.label] * int((y_old == args.label).sum()))
+		primed_seen, primed_dropped = dedup.seen, dedup.dropped
+	detector = MediaPipeHandDetector(headless=args.headless)
+	timer = StageTimer(enabled=bool(args.overlay or args.metrics_out or args.metrics_port is not None))
+	exporter = MetricsExporter(timer, args.metrics_out, args.metrics_interval, args.metrics_port) if timer.enabled else None
 
-	with webcam_capture() as cap:
+	with webcam_capture() as cap, BufferedSampleSink(
+		dataset, batch_size=args.flush_every, flush_interval=args.flush_interval
+	) as sink:
 		count = 0
-		while cap.isOpened() and count < args.frames:
-			ret, frame = cap.read()
-			if not ret:
-				break
-			hands, vis = detector.process_bgr_frame(frame)
-			feat = landmarks_to_feature_vector(hands)
-			if feat and any(feat):
-				dataset.append(Sample(features=feat, label=args.label))
-				count += 1
-				cv2.putText(vis, f"Recording {args.label} {count}/{args.frames}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 0), 2)
-			else:
-				cv2.putText(vis, "Show hands to record", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-			cv2.imshow("Collect Data - press q to quit", vis)
-			if cv2.waitKey(1) & 0xFF == ord('q'):
-				break
+		try:
+			while cap.isOpened() and count < args.frames:
+				with timer.span("capture"):
+					ret, frame = cap.read()
+				if not ret:
+					break
+				with timer.span("detect"):
+					hands, vis = detector.process_bgr_frame(frame)
+				with timer.span("features"):
+					feat = landmarks_to_feature_vector(hands)
+				has_hands = bool(feat and any(feat))
+				recorded = has_hands
+				if has_hands and dedup is not None:
+					with timer.span("dedup"):
+						recorded = dedup.add(feat, args.label)
+				if recorded:
+					with timer.span("write"):
+						sink.put(Sample(features=feat, label=args.label))
+					count += 1
+				if args.headless:
+					if recorded and (count % 50 == 0 or count == args.frames):
+						print(f"Recording {args.label} {count}/{args.frames}", flush=True)
+					continue
+				with timer.span("render"):
+					if has_hands:
+						cv2.putText(vis, f"Recording {args.label} {count}/{args.frames}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 200, 0), 2)
+					else:
+						cv2.putText(vis, "Show hands to record", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+					if args.overlay:
+						draw_overlay(vis, timer)
+					cv2.imshow("Collect Data - press q to quit", vis)
+					quit_pressed = cv2.waitKey(1) & 0xFF == ord('q')
+				if quit_pressed:
+					break
+		except KeyboardInterrupt:
+			pass
 
 		detector.close()
-		cv2.destroyAllWindows()
+		if not args.headless:
+			cv2.destroyAllWindows()
+	if exporter is not None:
+		exporter.close()
+	print(f"Saved {sink.written} samples for {args.label} to {args.out}")
+	if dedup is not None:
+		print(f"Skipped {dedup.dropped - primed_dropped} of {dedup.seen - primed_seen} frames as near-duplicates")
+	if timer.enabled:
+		print("Stage latency:")
+		for line in timer.overlay_lines():
+			print(" ", line)
 
 
 if __name__ == "__main__":
 	main()
-
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+import argparse
+from pathlib import Path
+
+from slr.dataset import convert_csv_to_chunked
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Convert a CSV dataset to the chunked binary format")
+	parser.add_argument("csv", type=Path, help="Source CSV dataset, e.g. data/dataset.csv")
+	parser.add_argument("out", type=Path, help="Target chunked dataset directory, e.g. data/dataset")
+	parser.add_argument("--chunk-rows", dest="chunk_rows", type=int, default=65536)
+	parser.add_argument("--compact", action="store_true", help="Merge chunks into one after converting")
+	args = parser.parse_args()
+
+	dataset = convert_csv_to_chunked(args.csv, args.out, chunk_rows=args.chunk_rows)
+	if args.compact:
+		dataset.compact()
+	print(f"Converted {dataset.num_rows} rows, {len(dataset.labels)} labels to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from slr.dataset import CsvDataset, Sample, open_dataset
+from slr.dedup import NearDuplicateFilter
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Drop near-duplicate samples from a dataset")
+	parser.add_argument("data", type=Path, help="Source dataset (CSV file or chunked directory)")
+	parser.add_argument("out", type=Path, nargs="?", default=None, help="Target dataset for the kept samples (CSV file or chunked directory)")
+	parser.add_argument("--threshold", type=float, default=0.02, help="RMS landmark distance (normalized units) below which samples count as duplicates")
+	parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="Only report how much the dataset would shrink")
+	args = parser.parse_args()
+
+	if args.out is None and not args.dry_run:
+		parser.error("out is required unless --dry-run is given")
+	if args.out is not None and args.out.resolve() == args.data.resolve():
+		parser.error("out must differ from data")
+
+	X, y = open_dataset(args.data).read_arrays()
+	dedup = NearDuplicateFilter(args.threshold)
+	keep = dedup.filter(X, y)
+	for line in dedup.report():
+		print(line)
+	if args.dry_run:
+		return
+
+	target = open_dataset(args.out, create=True)
+	X_kept, y_kept = X[keep], y[keep]
+	if isinstance(target, CsvDataset):
+		target.append_many([Sample(features=row.tolist(), label=str(label)) for row, label in zip(X_kept, y_kept)])
+	else:
+		target.append_arrays(np.ascontiguousarray(X_kept), [str(label) for label in y_kept])
+	print(f"Wrote {int(keep.sum())} of {len(X)} samples to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import argparse
+from pathlib import Path
+
+from slr.dataset import open_dataset
+from slr.knn import enroll_knn_samples, remove_knn_labels
+from slr.registry import ModelRegistry
+from slr.temporal import segment_ids_from_labels, windowed_feature_matrix
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Add or remove signs in a nearest-neighbour model without retraining")
+	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_knn.joblib"), help="knn model to update (created if missing)")
+	parser.add_argument("--data", dest="data", type=Path, default=None, help="CSV file or chunked dataset directory with samples to enroll")
+	parser.add_argument("--label", dest="labels", type=str, nargs="*", default=None, help="Only enroll these labels from --data")
+	parser.add_argument("--replace", action="store_true", help="Delete existing samples of the enrolled labels first (re-recorded signs)")
+	parser.add_argument("--remove", dest="remove", type=str, nargs="*", default=[], help="Delete all samples of these labels")
+	parser.add_argument("--neighbors", dest="neighbors", type=int, default=5, help="k when the model is created")
+	parser.add_argument("--window", dest="window", type=int, default=None, help="Sliding-window temporal features; must match the model")
+	parser.add_argument("--registry", dest="registry", type=Path, default=None, help="Also publish the updated model to this registry as its new LATEST version")
+	args = parser.parse_args()
+	if args.data is None and not args.remove:
+		parser.error("nothing to do: give --data and/or --remove")
+
+	if args.remove:
+		removed = remove_knn_labels(args.model, args.remove)
+		print(f"Removed {removed} samples of {', '.join(args.remove)}")
+	if args.data is not None:
+		X, y = open_dataset(args.data).read_arrays()
+		if args.window:
+			X = windowed_feature_matrix(X, args.window, segment_ids_from_labels(y))
+		if args.labels:
+			wanted = set(args.labels)
+			keep = [label in wanted for label in y]
+			X, y = X[keep], y[keep]
+		if len(X) == 0:
+			print("No samples to enroll.")
+			return
+		labels = enroll_knn_samples(X, y, args.model, k=args.neighbors, replace=args.replace, metadata={"feature_window": args.window})
+		print(f"Enrolled {len(X)} samples of {len(set(y.tolist()))} labels; model now knows {len(labels)} labels")
+	print("Model saved to:", args.model)
+	if args.registry is not None:
+		version = ModelRegistry(args.registry).publish(args.model)
+		print(f"Published to {args.registry} as {version}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from slr.classifier import load_model_bundle
+from slr.compiled import CompiledSVMPredictor, export_compiled_model
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Export a trained SVM pipeline to a compiled NumPy artifact")
+	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_svm.joblib"))
+	parser.add_argument("--out", dest="out", type=Path, default=Path("models/slr_svm.compiled.joblib"))
+	parser.add_argument("--float32", action="store_true", help="Evaluate the compiled model in single precision")
+	args = parser.parse_args()
+
+	pipeline, info = load_model_bundle(args.model)
+	if isinstance(pipeline, CompiledSVMPredictor):
+		print("Model is already compiled:", args.model)
+		return
+	dtype = np.float32 if args.float32 else np.float64
+	labels = info.pop("labels", None)
+	out = export_compiled_model(pipeline, labels, args.out, dtype=dtype, metadata=info)
+	print("Compiled model saved to:", out)
+
+
+if __name__ == "__main__":
+	main()
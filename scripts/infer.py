@@ -1,56 +1,256 @@
 #!/usr/bin/env python3
 import argparse
+import time
 from pathlib import Path
 
 import cv2
 import numpy as np
 
-from slr.hand import MediaPipeHandDetector, webcam_capture
-from slr.features import landmarks_to_feature_vector
-from slr.classifier import load_model
-from slr.text_buffer import TemporalLabelSmoother, TextBuilder
+from slr.hand import AdaptiveQualityController, MediaPipeHandDetector, webcam_capture
+from slr.features import FeatureExtractor
+from slr.filters import OneEuroLandmarkFilter
+from slr.classifier import load_model_bundle
+from slr.gating import MotionGate
+from slr.metrics import MetricsExporter, StageTimer, draw_overlay
+from slr.registry import HotSwapModel, ModelRegistry
+from slr.recording import LandmarkRecorder, LandmarkSession, ReplaySource, render_hands
+from slr.runtime import StagePipeline
+from slr.server import InferenceClient, parse_address
+from slr.temporal import SlidingWindowFeatures
+from slr.text_buffer import ProbabilityWindowDecoder, TemporalLabelSmoother, TextBuilder, ViterbiLabelDecoder
 
 
 def main():
 	parser = argparse.ArgumentParser(description="Real-time SLR inference from webcam")
 	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_svm.joblib"))
 	parser.add_argument("--labels", dest="labels", type=str, nargs='*', default=None, help="Optional label list to display")
+	parser.add_argument("--sequential", action="store_true", help="Run capture, detection, classification and rendering on one thread")
+	parser.add_argument("--queue-size", dest="queue_size", type=int, default=2, help="Bound of the queues between pipeline stages")
+	parser.add_argument("--decoder", dest="decoder", choices=["vote", "prob", "viterbi"], default="vote", help="Label smoothing: majority vote over labels, windowed probability sum, or sticky-HMM Viterbi over predict_proba")
+	parser.add_argument("--decoder-window", dest="decoder_window", type=int, default=None, help="Frames in the vote/prob smoothing window (defaults: vote 8, prob 6); smaller reacts faster")
+	parser.add_argument("--landmark-filter", dest="landmark_filter", action="store_true", help="Smooth landmark jitter with a One Euro filter before classification, so a smaller --decoder-window gives the same stability")
+	parser.add_argument("--filter-min-cutoff", dest="filter_min_cutoff", type=float, default=1.0, help="One Euro cutoff (Hz) for still hands; lower smooths more")
+	parser.add_argument("--filter-beta", dest="filter_beta", type=float, default=2.0, help="One Euro speed coefficient; higher follows fast motion with less lag")
+	parser.add_argument("--motion-threshold", dest="motion_threshold", type=float, default=0.0, help="Reuse the last prediction while RMS landmark motion (normalized units) stays below this; 0 disables, e.g. 0.02")
+	parser.add_argument("--target-fps", dest="target_fps", type=float, default=None, help="Adapt detector quality (model complexity, input scale, hand crop) to keep detection within this frame rate")
+	parser.add_argument("--headless", action="store_true", help="No window or drawing; print recognized phrases to stdout (Ctrl+C to stop)")
+	parser.add_argument("--overlay", action="store_true", help="Draw per-stage p50/p95/p99 latencies on the video")
+	parser.add_argument("--metrics-out", dest="metrics_out", type=Path, default=None, help="Periodically write per-stage latency percentiles to this JSON (or .csv) file")
+	parser.add_argument("--metrics-interval", dest="metrics_interval", type=float, default=5.0, help="Seconds between metrics file writes")
+	parser.add_argument("--metrics-port", dest="metrics_port", type=int, default=None, help="Serve per-stage latencies in Prometheus text format on this port (/metrics)")
+	parser.add_argument("--record", dest="record", type=Path, default=None, help="Save detected hand landmarks to this session file for later replay")
+	parser.add_argument("--replay", dest="replay", type=Path, default=None, help="Replay a recorded session instead of using the webcam and MediaPipe")
+	parser.add_argument("--replay-speed", dest="replay_speed", type=float, default=0.0, help="Replay pacing relative to the recording (1.0 = real time); 0 runs as fast as possible")
+	parser.add_argument("--server", dest="server", type=str, default=None, help="Classify on an inference server (unix:/path or host:port, see scripts/serve.py) instead of loading the model")
+	parser.add_argument("--registry", dest="registry", type=Path, default=None, help="Serve the LATEST model of this registry and switch to newly published versions while running")
 	args = parser.parse_args()
 
-	pipeline, saved_labels = load_model(args.model)
-	known_labels = args.labels or saved_labels or []
+	client = InferenceClient(parse_address(args.server)) if args.server else None
+	hot_model = None
+	if client is not None:
+		pipeline, model_info = None, {}
+	elif args.registry is not None:
+		hot_model = HotSwapModel(ModelRegistry(args.registry)).start()
+		pipeline, model_info = hot_model.current.predictor, hot_model.current.info
+	else:
+		pipeline, model_info = load_model_bundle(args.model)
+	known_labels = args.labels or model_info.get("labels") or []
+	window = model_info.get("feature_window")
+	temporal = SlidingWindowFeatures(window) if window else None
 
-	detector = MediaPipeHandDetector()
-	smoother = TemporalLabelSmoother()
+	detector = None
+	if args.replay is None:
+		detector = MediaPipeHandDetector(headless=args.headless)
+		if args.target_fps:
+			detector = AdaptiveQualityController(detector, target_fps=args.target_fps)
+	recorder = None
+	def make_decoder(classes):
+		if args.decoder == "prob":
+			if args.decoder_window:
+				return ProbabilityWindowDecoder(classes, window_size=args.decoder_window)
+			return ProbabilityWindowDecoder(classes)
+		if args.decoder == "viterbi":
+			return ViterbiLabelDecoder(classes)
+		if args.decoder_window:
+			return TemporalLabelSmoother(window_size=args.decoder_window, min_count=(args.decoder_window + 1) // 2)
+		return TemporalLabelSmoother()
+
+	# With --server, smoothing runs on the server
+	decoder = make_decoder([str(c) for c in pipeline.classes_]) if pipeline is not None else None
+	model_version = hot_model.version if hot_model is not None else None
 	text_builder = TextBuilder()
+	gate = MotionGate(args.motion_threshold)
+	landmark_filter = OneEuroLandmarkFilter(args.filter_min_cutoff, args.filter_beta) if args.landmark_filter else None
+	timer = StageTimer(enabled=bool(args.overlay or args.metrics_out or args.metrics_port is not None))
+	exporter = MetricsExporter(timer, args.metrics_out, args.metrics_interval, args.metrics_port) if timer.enabled else None
 
-	with webcam_capture() as cap:
-		while cap.isOpened():
-			ret, frame = cap.read()
-			if not ret:
-				break
-			hands, vis = detector.process_bgr_frame(frame)
-			feat = landmarks_to_feature_vector(hands)
-			pred_label = None
-			if feat and any(feat):
-				proba = pipeline.predict_proba([feat])[0]
-				idx = int(np.argmax(proba))
-				pred_label = pipeline.classes_[idx]
-				conf = float(proba[idx])
-				cv2.putText(vis, f"{pred_label} {conf:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 255), 2)
-			stable = smoother.push(pred_label or "") if pred_label else None
-			if stable:
-				phrase = text_builder.push_label(stable)
-				if phrase:
-					cv2.putText(vis, phrase, (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-			cv2.imshow("SLR Inference - press q to quit", vis)
-			if cv2.waitKey(1) & 0xFF == ord('q'):
+	def detect(frame):
+		with timer.span("detect"):
+			detected = detector.process_bgr_frame(frame)
+		if recorder is not None:
+			recorder.write(detected[0])
+		return detected
+
+	# Features are written into one reused buffer; only the classify stage
+	# touches it, and the gate and temporal window copy what they keep.
+	extract = FeatureExtractor()
+
+	def hand_features(hands, timestamp=None):
+		if landmark_filter is None:
+			return extract(hands)
+		points, mask = landmark_filter.filter_hands(hands, timestamp)
+		return extract.from_array(points, mask)
+
+	def swap_model(current):
+		# Called between frames: the new model takes over from the next frame,
+		# keeping decoder and temporal state unless labels or window changed.
+		nonlocal pipeline, temporal, decoder, model_version
+		if list(current.classes_) != list(pipeline.classes_):
+			decoder = make_decoder([str(c) for c in current.classes_])
+		new_window = current.info.get("feature_window")
+		if new_window != (temporal.window if temporal is not None else None):
+			temporal = SlidingWindowFeatures(new_window) if new_window else None
+		gate.reset()
+		pipeline = current.predictor
+		model_version = current.version
+		print(f"Switched to model {current.version}", flush=True)
+
+	def classify(detected, timestamp=None):
+		if hot_model is not None:
+			current = hot_model.current
+			if current.version != model_version:
+				swap_model(current)
+		hands, vis = detected
+		with timer.span("features"):
+			feat = hand_features(hands, timestamp)
+		pred_label = None
+		conf = 0.0
+		stable = None
+		if feat.any():
+			proba = gate.lookup(feat)
+			model_input = temporal.push(feat) if temporal is not None else feat
+			if proba is None:
+				with timer.span("predict"):
+					proba = pipeline.predict_proba(model_input[None])[0]
+				gate.store(feat, proba)
+			idx = int(np.argmax(proba))
+			pred_label = pipeline.classes_[idx]
+			conf = float(proba[idx])
+			with timer.span("smoothing"):
+				stable = decoder.push(pred_label) if args.decoder == "vote" else decoder.push(proba)
+		else:
+			gate.reset()
+			if temporal is not None:
+				temporal.reset()
+		phrase = None
+		if stable:
+			phrase = text_builder.push_label(stable)
+		return vis, pred_label, conf, phrase
+
+	def classify_remote(detected, timestamp=None):
+		hands, vis = detected
+		with timer.span("features"):
+			feat = hand_features(hands, timestamp)
+		with timer.span("predict"):
+			response = client.classify(feat)
+		return vis, response["label"], response["confidence"], response["phrase"]
+
+	if client is not None:
+		classify = classify_remote
+
+	def read_frame():
+		with timer.span("capture"):
+			return cap.read()
+
+	def render(result) -> bool:
+		with timer.span("render"):
+			return _render(result)
+
+	def _render(result) -> bool:
+		vis, pred_label, conf, phrase = result
+		if args.headless:
+			if phrase:
+				print(phrase, flush=True)
+			return False
+		if pred_label:
+			cv2.putText(vis, f"{pred_label} {conf:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 255), 2)
+		if args.motion_threshold > 0:
+			cv2.putText(vis, f"skip {gate.skip_rate:.0%}", (10, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+		if phrase:
+			cv2.putText(vis, phrase, (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+		if args.overlay:
+			draw_overlay(vis, timer)
+		cv2.imshow("SLR Inference - press q to quit", vis)
+		return cv2.waitKey(1) & 0xFF == ord('q')
+
+	def replay() -> None:
+		# Always sequential so every recorded frame is classified, in order.
+		session = LandmarkSession(args.replay)
+		width = session.metadata.get("width", 640)
+		height = session.metadata.get("height", 480)
+		frames = 0
+		t0 = time.perf_counter()
+		for timestamp, hands in ReplaySource(session, speed=args.replay_speed or None):
+			vis = None if args.headless else render_hands(hands, width, height, session.normalized)
+			frames += 1
+			# Recorded timestamps keep the landmark filter's timing at any replay speed.
+			if render(classify((hands, vis), timestamp)):
 				break
+		elapsed = time.perf_counter() - t0
+		print(f"Replayed {frames}/{len(session)} frames ({session.duration:.1f}s recorded) in {elapsed:.2f}s ({frames / max(elapsed, 1e-9):.0f} fps)")
+
+	if args.replay is not None:
+		try:
+			replay()
+		except KeyboardInterrupt:
+			pass
+		if not args.headless:
+			cv2.destroyAllWindows()
+	else:
+		with webcam_capture() as cap:
+			if args.record is not None:
+				recorder = LandmarkRecorder(args.record, {
+					"width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+					"height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+					"fps": cap.get(cv2.CAP_PROP_FPS),
+				})
+			try:
+				if args.sequential:
+					while cap.isOpened():
+						ret, frame = read_frame()
+						if not ret:
+							break
+						if render(classify(detect(frame))):
+							break
+				else:
+					with StagePipeline(read_frame, [detect, classify], queue_size=args.queue_size) as stages:
+						for result in stages:
+							if render(result):
+								break
+			except KeyboardInterrupt:
+				pass
 
-		detector.close()
-		cv2.destroyAllWindows()
+			detector.close()
+			if not args.headless:
+				cv2.destroyAllWindows()
+	if client is not None:
+		client.close()
+	if hot_model is not None:
+		hot_model.stop()
+	if recorder is not None:
+		recorder.close()
+		print(f"Recorded {recorder.written} frames to {args.record}")
+	if exporter is not None:
+		exporter.close()
+	if detector is not None and args.target_fps:
+		print(f"Adaptive quality: final level {detector.level}, {detector.switches} switches")
+	if args.motion_threshold > 0:
+		print(f"Motion gate: {gate.frames} frames, {gate.classified} classified, {gate.skipped} reused ({gate.skip_rate:.1%} skipped)")
+	if timer.enabled:
+		print("Stage latency:")
+		for line in timer.overlay_lines():
+			print(" ", line)
 
 
 if __name__ == "__main__":
 	main()
-
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+from slr.multistream import MultiStreamRuntime, parse_source
+from slr.text_buffer import ProbabilityWindowDecoder, TemporalLabelSmoother, ViterbiLabelDecoder
+
+
+DECODERS = {
+	"vote": lambda classes: TemporalLabelSmoother(),
+	"prob": ProbabilityWindowDecoder,
+	"viterbi": ViterbiLabelDecoder,
+}
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Real-time SLR inference over several cameras or video files")
+	parser.add_argument("sources", type=str, nargs="+", help="Device indices (e.g. 0 1) and/or video files")
+	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_svm.joblib"))
+	parser.add_argument("--workers", dest="workers", type=int, default=mp.cpu_count(), help="Detector processes (at most one per source)")
+	parser.add_argument("--slots", dest="slots", type=int, default=4, help="Shared-memory frame slots per source")
+	parser.add_argument("--decoder", dest="decoder", choices=sorted(DECODERS), default="vote")
+	parser.add_argument("--realtime", action="store_true", help="Pace video files at their native frame rate instead of as fast as possible")
+	parser.add_argument("--out", dest="out", type=Path, default=None, help="Write every processed frame as JSON lines")
+	args = parser.parse_args()
+
+	sources = [parse_source(s) for s in args.sources]
+	runtime = MultiStreamRuntime(
+		sources,
+		args.model,
+		workers=args.workers,
+		slots=args.slots,
+		decoder_factory=DECODERS[args.decoder],
+		label_decoder=args.decoder == "vote",
+		realtime=args.realtime,
+	)
+	out = args.out.open("w") if args.out else None
+	processed = 0
+	t0 = time.perf_counter()
+	try:
+		with runtime:
+			for result in runtime:
+				processed += 1
+				if out:
+					out.write(json.dumps({
+						"stream": result.stream_id,
+						"frame": result.seq,
+						"timestamp": result.timestamp,
+						"hands": len(result.hands),
+						"label": result.label,
+						"confidence": result.confidence,
+					}) + "\n")
+				if result.phrase:
+					print(f"[{result.stream_id}] {result.phrase}", flush=True)
+	except KeyboardInterrupt:
+		pass
+	finally:
+		if out:
+			out.close()
+	elapsed = time.perf_counter() - t0
+	for stream_id, (source, stats) in enumerate(zip(args.sources, runtime.stats())):
+		print(f"stream {stream_id} ({source}): {stats.frames} captured, {stats.processed} processed, {stats.dropped} dropped", file=sys.stderr)
+	print(f"Processed {processed} frames with {runtime.workers} workers in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.1f} fps)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
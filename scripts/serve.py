@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+from pathlib import Path
+
+from slr.classifier import load_model_bundle
+from slr.registry import HotSwapModel, ModelRegistry
+from slr.server import InferenceServer, parse_address
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Local SLR inference server (JSON lines over a Unix socket or TCP)")
+	parser.add_argument("--model", dest="model", type=Path, default=Path("models/slr_svm.joblib"))
+	parser.add_argument("--listen", dest="listen", type=str, default="unix:/tmp/slr.sock", help="unix:/path/to.sock or host:port")
+	parser.add_argument("--batch-window-ms", dest="batch_window_ms", type=float, default=2.0, help="How long to wait for more requests before predicting; larger favors throughput, 0 favors latency")
+	parser.add_argument("--max-batch", dest="max_batch", type=int, default=64)
+	parser.add_argument("--decoder", dest="decoder", choices=["vote", "prob", "viterbi"], default="vote", help="Per-session label smoothing")
+	parser.add_argument("--session-timeout", dest="session_timeout", type=float, default=300.0, help="Forget sessions idle for this many seconds")
+	parser.add_argument("--registry", dest="registry", type=Path, default=None, help="Serve the LATEST model of this registry and switch to newly published versions without restarting")
+	args = parser.parse_args()
+
+	hot_model = None
+	if args.registry is not None:
+		hot_model = HotSwapModel(ModelRegistry(args.registry))
+		predictor, info = hot_model.current.predictor, hot_model.current.info
+	else:
+		predictor, info = load_model_bundle(args.model)
+	server = InferenceServer(
+		predictor,
+		info,
+		batch_window=args.batch_window_ms / 1000.0,
+		max_batch=args.max_batch,
+		decoder=args.decoder,
+		session_timeout=args.session_timeout,
+	)
+	if hot_model is not None:
+		hot_model.version_changed.append(lambda model: server.use_model_threadsafe(model.predictor, model.info))
+		hot_model.version_changed.append(lambda model: print(f"Switched to model {model.version}", flush=True))
+		hot_model.start()
+	source = f"{args.registry} ({hot_model.version})" if hot_model is not None else args.model
+	print(f"Serving {source} on {args.listen} ({len(server.classes)} labels)", flush=True)
+	try:
+		asyncio.run(server.serve(parse_address(args.listen)))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		if hot_model is not None:
+			hot_model.stop()
+	print(f"{server.requests} requests in {server.batches} batches (mean batch {server.mean_batch_size:.1f})")
+
+
+if __name__ == "__main__":
+	main()
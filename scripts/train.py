@@ -2,27 +2,75 @@
 import argparse
 from pathlib import Path
 
-from slr.dataset import CsvDataset
-from slr.classifier import train_svm_classifier
+from slr.augment import FeatureAugmenter
+from slr.dataset import open_dataset
+from slr.classifier import search_svm_classifier, svm_search_grid, train_svm_classifier
+from slr.incremental import update_incremental_classifier
+from slr.knn import train_knn_classifier
+from slr.registry import ModelRegistry
+from slr.temporal import NUM_BLOCKS, segment_ids_from_labels, windowed_feature_matrix
 
 
 def main():
-	parser = argparse.ArgumentParser(description="Train SLR classifier from CSV dataset")
-	parser.add_argument("--data", dest="data", type=Path, default=Path("data/dataset.csv"))
+	parser = argparse.ArgumentParser(description="Train SLR classifier from a CSV or chunked dataset")
+	parser.add_argument("--data", dest="data", type=Path, default=Path("data/dataset.csv"), help="CSV file or chunked dataset directory")
 	parser.add_argument("--out", dest="out", type=Path, default=Path("models/slr_svm.joblib"))
+	parser.add_argument("--backend", dest="backend", choices=["svm", "knn"], default="svm", help="svm: StandardScaler + SVC; knn: nearest-neighbour model that scripts/enroll.py can extend without retraining")
+	parser.add_argument("--neighbors", dest="neighbors", type=int, default=5, help="k for --backend knn")
+	parser.add_argument("--incremental", action="store_true", help="Fold --data into the incremental linear model at --out instead of retraining an SVM")
+	parser.add_argument("--search", action="store_true", help="Sweep SVM kernels, C and gamma in parallel and keep the best model")
+	parser.add_argument("--search-random", dest="search_random", type=int, default=0, help="With --search, sample this many random candidates instead of the full grid")
+	parser.add_argument("--jobs", dest="jobs", type=int, default=-1, help="Parallel workers for --search (-1 = all cores)")
+	parser.add_argument("--window", dest="window", type=int, default=None, help="Train on sliding-window temporal features over this many frames (for moving signs)")
+	parser.add_argument("--augment", dest="augment", type=int, default=0, help="Add this many randomly rotated/stretched/mirrored/noised copies of the training data")
+	parser.add_argument("--augment-mirror", dest="augment_mirror", type=float, default=0.5, help="Probability that an augmented copy is mirrored to the other hand (0 if handedness matters)")
+	parser.add_argument("--augment-seed", dest="augment_seed", type=int, default=0)
+	parser.add_argument("--registry", dest="registry", type=Path, default=None, help="Also publish the trained model to this registry as its new LATEST version")
 	args = parser.parse_args()
+	if args.backend == "knn" and (args.incremental or args.search):
+		parser.error("--incremental and --search apply to the SVM backend; use scripts/enroll.py to extend a knn model")
 
-	dataset = CsvDataset(args.data)
-	X, y = dataset.read_all()
-	if not X or not y:
+	dataset = open_dataset(args.data)
+	X, y = dataset.read_arrays()
+	if len(X) == 0 or len(y) == 0:
 		print("No training data found. Use scripts/collect_data.py to record samples.")
 		return
 
-	res = train_svm_classifier(X, y, args.out)
+	metadata = {"feature_window": args.window}
+	if args.window:
+		# Rows are stored in capture order; each run of one label is a recording.
+		X = windowed_feature_matrix(X, args.window, segment_ids_from_labels(y))
+
+	augment = None
+	if args.augment > 0:
+		augment = FeatureAugmenter(
+			copies=args.augment,
+			mirror_prob=args.augment_mirror,
+			blocks=NUM_BLOCKS if args.window else 1,
+			seed=args.augment_seed,
+		)
+
+	if args.backend == "knn":
+		res = train_knn_classifier(X, y, args.out, k=args.neighbors, metadata=metadata, augment=augment)
+	elif args.incremental:
+		res = update_incremental_classifier(X, y, args.out, metadata=metadata, augment=augment)
+	elif args.search:
+		candidates = svm_search_grid(n_random=args.search_random)
+		res, results = search_svm_classifier(X, y, args.out, candidates=candidates, n_jobs=args.jobs, metadata=metadata, augment=augment)
+		print(f"{'kernel':8s} {'C':>9s} {'gamma':>9s} {'val_acc':>8s} {'us/sample':>10s} {'fit_s':>7s}")
+		for r in results:
+			gamma = r.gamma if isinstance(r.gamma, str) else f"{r.gamma:.4g}"
+			print(f"{r.kernel:8s} {r.c:9.4g} {gamma:>9s} {r.accuracy:8.4f} {r.latency_us:10.1f} {r.fit_seconds:7.2f}")
+		best = results[0]
+		print(f"Best: kernel={best.kernel} C={best.c:.4g} gamma={best.gamma}")
+	else:
+		res = train_svm_classifier(X, y, args.out, metadata=metadata, augment=augment)
 	print("Model saved to:", res.model_path)
+	if args.registry is not None:
+		version = ModelRegistry(args.registry).publish(res.model_path)
+		print(f"Published to {args.registry} as {version}")
 	print(res.report)
 
 
 if __name__ == "__main__":
 	main()
-
@@ -1,18 +1,52 @@
 """Sign Language Recognition (SLR) package.
 
 Modules:
-- hand: Hand landmark detection using MediaPipe
-- features: Landmark-to-feature vector conversion utilities
+- landmarks: Array-backed hand landmark container (NumPy only, no vision stack)
+- hand: Hand landmark detection using MediaPipe (imported on first use)
+- features: Landmark-to-feature conversion and a reusable-buffer extractor
+- filters: One Euro landmark filter for jitter reduction before classification
+- temporal: Sliding-window motion features for dynamic signs
 - dataset: Dataset IO helpers for feature/label storage
+- dedup: Near-duplicate sample filter using spatial hash buckets
+- augment: Vectorized feature augmentation (rotation, stretch, mirror, noise)
+- gating: Motion gate that reuses predictions while hands are static
 - classifier: Training and inference utilities for classifiers
+- incremental: Linear classifier updated from new samples without retraining
+- knn: Nearest-neighbour classifier with sample insertion and deletion
+- compiled: Pure-NumPy predictor exported from a trained SVM pipeline
 - text_buffer: Temporal smoothing and text construction utilities
+- runtime: Threaded capture/processing pipeline for real-time loops
+- sources: Frame iteration over video files and image directories
+- metrics: Per-stage latency spans, rolling percentiles and export
+- synthetic: Camera-free synthetic hand landmark streams for benchmarks
+- recording: Binary landmark session recorder and replay source
+- multistream: Multi-camera runtime with shared-memory frame transport
+- server: Micro-batching inference server and client (JSON lines)
+- registry: Versioned model registry with memory-mapped hot reload
 """
 
 __all__ = [
+	"landmarks",
 	"hand",
 	"features",
+	"filters",
+	"temporal",
 	"dataset",
+	"dedup",
+	"augment",
+	"gating",
 	"classifier",
+	"incremental",
+	"knn",
+	"compiled",
 	"text_buffer",
+	"runtime",
+	"sources",
+	"metrics",
+	"synthetic",
+	"recording",
+	"multistream",
+	"server",
+	"registry",
 ]
 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from .features import FEATURE_SIZE, NUM_HANDS, NUM_LANDMARKS
+
+
+def _random_rotations(rng: np.random.Generator, n: int, max_degrees: float) -> np.ndarray:
+	"""(n, 3, 3) rotations about uniformly random axes by up to `max_degrees`."""
+	axis = rng.normal(size=(n, 3))
+	axis /= np.linalg.norm(axis, axis=1, keepdims=True)
+	angle = np.radians(rng.uniform(-max_degrees, max_degrees, n))
+	x, y, z = axis.T
+	zero = np.zeros(n)
+	# Rodrigues: R = I + sin(a) K + (1 - cos(a)) K^2
+	K = np.stack([
+		np.stack([zero, -z, y], axis=1),
+		np.stack([z, zero, -x], axis=1),
+		np.stack([-y, x, zero], axis=1),
+	], axis=1)
+	sin = np.sin(angle)[:, None, None]
+	cos = np.cos(angle)[:, None, None]
+	return np.eye(3) + sin * K + (1.0 - cos) * (K @ K)
+
+
+class FeatureAugmenter:
+	"""Random, label-preserving variations of normalized feature rows.
+
+	Works on whole (N, blocks * 126) batches at once. Each row gets:
+	- mirror: with probability `mirror_prob`, x is negated and the left and
+	  right hand slots are swapped (the same sign made with the other hand)
+	- rotation: a random 3D rotation about the wrist by up to
+	  `max_rotation` degrees (camera viewpoint)
+	- scale jitter: independent x/y/z stretch by up to +-`scale_jitter`
+	  (camera aspect and hand proportions); a uniform scale would be undone
+	  by normalization
+	- noise: Gaussian landmark jitter with std `noise_std` (normalized units)
+	Rows are then rescaled so the mean wrist distance is 1 again, like the
+	output of `landmarks_to_feature_vector`. Missing hands stay zero.
+
+	`blocks` > 1 handles temporal rows from `slr.temporal` (current, mean,
+	velocity, displacement): every block gets the same geometric transform,
+	and the rescale factor comes from the current-frame block.
+
+	Calling the augmenter with (X, y) returns a generator of augmented
+	batches; see `__call__`.
+	"""
+
+	def __init__(
+		self,
+		copies: int = 4,
+		max_rotation: float = 15.0,
+		scale_jitter: float = 0.1,
+		mirror_prob: float = 0.5,
+		noise_std: float = 0.01,
+		blocks: int = 1,
+		batch_size: int = 4096,
+		seed: Optional[int] = None,
+	):
+		self.copies = copies
+		self.max_rotation = max_rotation
+		self.scale_jitter = scale_jitter
+		self.mirror_prob = mirror_prob
+		self.noise_std = noise_std
+		self.blocks = blocks
+		self.batch_size = batch_size
+		self.rng = np.random.default_rng(seed)
+
+	def transform(self, X: np.ndarray) -> np.ndarray:
+		"""Return one augmented float32 copy of the rows of `X`."""
+		X = np.asarray(X)
+		n = len(X)
+		if X.shape[1:] != (self.blocks * FEATURE_SIZE,):
+			raise ValueError(f"Expected rows of {self.blocks * FEATURE_SIZE} features, got {X.shape}")
+		rng = self.rng
+		points = X.astype(np.float64).reshape(n, self.blocks, NUM_HANDS, NUM_LANDMARKS, 3)
+		present = points.any(axis=(3, 4))
+		if self.mirror_prob > 0:
+			mirror = rng.random(n) < self.mirror_prob
+			points[mirror, ..., 0] *= -1.0
+			points[mirror] = points[mirror][:, :, ::-1]
+			present[mirror] = present[mirror][:, :, ::-1]
+		if self.max_rotation > 0:
+			rotations = _random_rotations(rng, n, self.max_rotation)
+			points = np.einsum("bij,bkhlj->bkhli", rotations, points)
+		if self.scale_jitter > 0:
+			points *= rng.uniform(1.0 - self.scale_jitter, 1.0 + self.scale_jitter, (n, 1, 1, 1, 3))
+		if self.noise_std > 0:
+			# The wrist stays at the origin, as after normalization.
+			noise = rng.normal(0.0, self.noise_std, (n, self.blocks, NUM_HANDS, NUM_LANDMARKS - 1, 3))
+			points[..., 1:, :] += noise * present[..., None, None]
+		current = points[:, 0, :, 1:, :]
+		mean_dist = np.sqrt(np.einsum("bhlj,bhlj->bhl", current, current)).mean(axis=-1)
+		safe = mean_dist > 1e-6
+		scale = np.where(safe, 1.0 / np.where(safe, mean_dist, 1.0), 1.0)
+		points *= scale[:, None, :, None, None]
+		return points.reshape(n, -1).astype(np.float32)
+
+	def __call__(self, X: np.ndarray, y: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+		"""Yield `copies` augmented passes over (X, y) in batches of `batch_size`.
+
+		Only one batch is in memory at a time; the originals are not yielded.
+		"""
+		X = np.asarray(X)
+		y = np.asarray(y)
+		for _ in range(self.copies):
+			for start in range(0, len(X), self.batch_size):
+				stop = start + self.batch_size
+				yield self.transform(X[start:stop]), y[start:stop]
+
+	def augmented_size(self, n: int) -> int:
+		return self.copies * n
+
+
+def materialize(
+	X: np.ndarray,
+	y: np.ndarray,
+	augmenter: FeatureAugmenter,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Originals followed by all augmented copies, filled into one preallocated array.
+
+	For learners that need the whole training set at once (SVC); streaming
+	learners should consume `augmenter(X, y)` directly.
+	"""
+	X = np.asarray(X, dtype=np.float32)
+	y = np.asarray(y)
+	total = len(X) + augmenter.augmented_size(len(X))
+	X_out = np.empty((total, X.shape[1]), dtype=np.float32)
+	y_out = np.empty(total, dtype=y.dtype)
+	X_out[: len(X)] = X
+	y_out[: len(y)] = y
+	offset = len(X)
+	for X_batch, y_batch in augmenter(X, y):
+		X_out[offset:offset + len(X_batch)] = X_batch
+		y_out[offset:offset + len(y_batch)] = y_batch
+		offset += len(X_batch)
+	return X_out, y_out
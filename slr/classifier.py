@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import joblib
 import numpy as np
-from sklearn.metrics import classification_report
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
@@ -20,19 +22,58 @@ class TrainResult:
 	labels: List[str]
 
 
+@dataclass
+class SearchCandidate:
+	kernel: str
+	c: float
+	gamma: str | float
+	accuracy: float
+	latency_us: float
+	fit_seconds: float
+
+
+def _split(X: np.ndarray, y: np.ndarray):
+	return train_test_split(
+		X, y, test_size=0.2, random_state=42, stratify=y if len(set(y)) > 1 else None
+	)
+
+
+def _save_pipeline(
+	pipeline: Pipeline,
+	y: np.ndarray,
+	model_out: Path,
+	metadata: Optional[Dict] = None,
+) -> Tuple[Path, List[str]]:
+	model_out = Path(model_out)
+	model_out.parent.mkdir(parents=True, exist_ok=True)
+	label_names = sorted(str(label) for label in set(y.tolist()))
+	joblib.dump({**(metadata or {}), "pipeline": pipeline, "labels": label_names}, model_out)
+	return model_out, label_names
+
+
 def train_svm_classifier(
-	features: List[List[float]],
-	labels: List[str],
+	features: List[List[float]] | np.ndarray,
+	labels: List[str] | np.ndarray,
 	model_out: Path,
 	kernel: str = "rbf",
 	c: float = 10.0,
 	gamma: str | float = "scale",
+	metadata: Optional[Dict] = None,
+	augment=None,
 ) -> TrainResult:
-	X = np.array(features, dtype=np.float32)
-	y = np.array(labels)
-	X_train, X_val, y_train, y_val = train_test_split(
-		X, y, test_size=0.2, random_state=42, stratify=y if len(set(y)) > 1 else None
-	)
+	"""Train and save a StandardScaler + SVC pipeline.
+
+	`metadata` entries (e.g. {"feature_window": 8}) are stored alongside the
+	model and returned by `load_model_bundle`. `augment` (a
+	`slr.augment.FeatureAugmenter`) adds augmented copies of the training
+	split; the validation split is left as recorded.
+	"""
+	X = np.asarray(features, dtype=np.float32)
+	y = np.asarray(labels)
+	X_train, X_val, y_train, y_val = _split(X, y)
+	if augment is not None:
+		from .augment import materialize
+		X_train, y_train = materialize(X_train, y_train, augment)
 	pipeline = Pipeline([
 		("scaler", StandardScaler()),
 		("clf", SVC(kernel=kernel, C=c, gamma=gamma, probability=True)),
@@ -42,13 +83,154 @@ def train_svm_classifier(
 	report = (
 		classification_report(y_val, y_pred) if len(y_val) > 0 else "Insufficient validation data"
 	)
-	model_out = Path(model_out)
-	model_out.parent.mkdir(parents=True, exist_ok=True)
-	joblib.dump({"pipeline": pipeline, "labels": sorted(list(set(labels)))}, model_out)
-	return TrainResult(model_path=model_out, report=report, labels=sorted(list(set(labels))))
+	model_out, label_names = _save_pipeline(pipeline, y, model_out, metadata)
+	return TrainResult(model_path=model_out, report=report, labels=label_names)
+
+
+def svm_search_grid(
+	kernels: Sequence[str] = ("rbf", "linear", "poly"),
+	cs: Sequence[float] = (0.1, 1.0, 10.0, 100.0),
+	gammas: Sequence[str | float] = ("scale", 0.001, 0.01, 0.1),
+	n_random: int = 0,
+	seed: int = 0,
+) -> List[Tuple[str, float, str | float]]:
+	"""Build (kernel, C, gamma) candidates: a full grid, or `n_random` draws.
+
+	Random draws sample C and gamma log-uniformly over the grid's range.
+	Linear kernels ignore gamma, so they get a single gamma value.
+	"""
+	if n_random > 0:
+		rng = np.random.default_rng(seed)
+		numeric = [g for g in gammas if not isinstance(g, str)] or [0.001, 0.1]
+		lo_c, hi_c = np.log10(min(cs)), np.log10(max(cs))
+		lo_g, hi_g = np.log10(min(numeric)), np.log10(max(numeric))
+		candidates = []
+		for _ in range(n_random):
+			kernel = str(rng.choice(list(kernels)))
+			c = float(10 ** rng.uniform(lo_c, hi_c))
+			gamma = "scale" if kernel == "linear" else float(10 ** rng.uniform(lo_g, hi_g))
+			candidates.append((kernel, c, gamma))
+		return candidates
+	return [
+		(kernel, float(c), gamma)
+		for kernel in kernels
+		for c in cs
+		for gamma in (gammas if kernel != "linear" else ("scale",))
+	]
+
+
+def _fit_candidate(
+	X_train: np.ndarray,
+	y_train: np.ndarray,
+	X_val: np.ndarray,
+	y_val: np.ndarray,
+	kernel: str,
+	c: float,
+	gamma: str | float,
+) -> Tuple[SVC, float, float]:
+	clf = SVC(kernel=kernel, C=c, gamma=gamma)
+	t0 = time.perf_counter()
+	clf.fit(X_train, y_train)
+	fit_seconds = time.perf_counter() - t0
+	accuracy = float(accuracy_score(y_val, clf.predict(X_val))) if len(y_val) else 0.0
+	return clf, accuracy, fit_seconds
+
+
+def _per_sample_latency_us(clf: SVC, rows: np.ndarray) -> float:
+	"""Mean single-row `decision_function` time in microseconds."""
+	clf.decision_function(rows[:1])
+	t0 = time.perf_counter()
+	for i in range(len(rows)):
+		clf.decision_function(rows[i:i + 1])
+	return (time.perf_counter() - t0) / max(len(rows), 1) * 1e6
+
+
+def search_svm_classifier(
+	features: List[List[float]] | np.ndarray,
+	labels: List[str] | np.ndarray,
+	model_out: Path,
+	candidates: Optional[Sequence[Tuple[str, float, str | float]]] = None,
+	n_jobs: int = -1,
+	metadata: Optional[Dict] = None,
+	augment=None,
+) -> Tuple[TrainResult, List[SearchCandidate]]:
+	"""Evaluate SVM hyperparameters in parallel and save the best model.
+
+	The split and StandardScaler are computed once; every candidate reuses
+	the same standardized matrices (joblib memory-maps them into workers).
+	Single-row latency is timed afterwards in this process, one candidate at
+	a time, so parallel fitting does not skew it. It measures
+	`decision_function` on the standardized row, not the `predict_proba`
+	call inference makes: candidates are fitted without probability
+	estimates to keep the sweep cheap. Platt scaling and pairwise coupling
+	add a cost that depends on the number of classes, not on the kernel, C
+	or gamma, so the ranking holds but deployed latency is higher.
+	Candidates are ranked by validation accuracy, then by per-sample
+	latency. The winner is refit with probability estimates and saved like
+	`train_svm_classifier`, including its handling of `augment`.
+	"""
+	X = np.asarray(features, dtype=np.float32)
+	y = np.asarray(labels)
+	X_train, X_val, y_train, y_val = _split(X, y)
+	if augment is not None:
+		from .augment import materialize
+		X_train, y_train = materialize(X_train, y_train, augment)
+	scaler = StandardScaler().fit(X_train)
+	X_train_s = np.ascontiguousarray(scaler.transform(X_train), dtype=np.float64)
+	X_val_s = np.ascontiguousarray(scaler.transform(X_val), dtype=np.float64)
+	candidates = list(candidates) if candidates is not None else svm_search_grid()
+	fitted = Parallel(n_jobs=n_jobs)(
+		delayed(_fit_candidate)(X_train_s, y_train, X_val_s, y_val, kernel, c, gamma)
+		for kernel, c, gamma in candidates
+	)
+	latency_rows = (X_val_s if len(X_val_s) else X_train_s)[:64]
+	results = [
+		SearchCandidate(kernel, c, gamma, accuracy, _per_sample_latency_us(clf, latency_rows), fit_seconds)
+		for (kernel, c, gamma), (clf, accuracy, fit_seconds) in zip(candidates, fitted)
+	]
+	del fitted
+	results.sort(key=lambda r: (-r.accuracy, r.latency_us))
+	best = results[0]
+	clf = SVC(kernel=best.kernel, C=best.c, gamma=best.gamma, probability=True)
+	clf.fit(X_train_s, y_train)
+	pipeline = Pipeline([("scaler", scaler), ("clf", clf)])
+	y_pred = pipeline.predict(X_val) if len(y_val) > 0 else []
+	report = (
+		classification_report(y_val, y_pred) if len(y_val) > 0 else "Insufficient validation data"
+	)
+	model_out, label_names = _save_pipeline(pipeline, y, model_out, metadata)
+	return TrainResult(model_path=model_out, report=report, labels=label_names), results
+
+
+def load_model_bundle(model_path: Path, mmap_mode: Optional[str] = None) -> Tuple[object, Dict]:
+	"""Load a saved model as (predictor, info).
+
+	The predictor exposes `predict_proba` and `classes_`; compiled artifacts
+	from `slr.compiled.export_compiled_model` load as `CompiledSVMPredictor`,
+	incremental models as `IncrementalLinearClassifier` and nearest-neighbour
+	models as `NearestNeighborClassifier`. `info` holds the
+	remaining saved entries, e.g. "labels" and "feature_window".
 
+	With `mmap_mode` set, the large arrays (support vectors, weights) are
+	memory-mapped from the file instead of copied, so processes loading the
+	same artifact share its pages. Use "c" (copy-on-write) for sklearn
+	pipelines: libsvm needs writable buffers but never writes to them, so
+	the pages stay shared.
+	"""
+	obj = dict(joblib.load(model_path, mmap_mode=mmap_mode))
+	if "incremental" in obj:
+		predictor = obj.pop("incremental")
+	elif "knn" in obj:
+		predictor = obj.pop("knn")
+	elif "compiled" in obj:
+		from .compiled import CompiledSVMPredictor
+		predictor = CompiledSVMPredictor(obj.pop("compiled"), dtype=obj.pop("dtype", "float64"))
+	else:
+		predictor = obj.pop("pipeline")
+	return predictor, obj
 
-def load_model(model_path: Path):
-	obj = joblib.load(model_path)
-	return obj["pipeline"], obj.get("labels")
 
+def load_model(model_path: Path, mmap_mode: Optional[str] = None):
+	"""Load a saved model as (predictor, labels); see `load_model_bundle`."""
+	predictor, info = load_model_bundle(model_path, mmap_mode=mmap_mode)
+	return predictor, info.get("labels")
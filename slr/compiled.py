@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+
+
+KERNELS = ("linear", "poly", "rbf", "sigmoid")
+
+# libsvm clamps pairwise Platt probabilities to [MIN_PROB, 1 - MIN_PROB]
+MIN_PROB = 1e-7
+
+# Batches up to this size solve the pairwise coupling with plain floats,
+# which beats per-op NumPy overhead for the typical single-frame call.
+SMALL_BATCH = 4
+
+
+class CompiledSVMPredictor:
+	"""Pure-NumPy evaluator for a frozen StandardScaler + SVC(probability=True).
+
+	Reproduces libsvm's one-vs-one decision values, Platt scaling and
+	pairwise-coupling probabilities, so `predict_proba` matches the sklearn
+	pipeline while skipping its per-call validation overhead. Exposes
+	`classes_` and `predict_proba` like the sklearn pipeline it replaces.
+	`predict` uses libsvm's one-vs-one vote like `Pipeline.predict`; the
+	inference scripts take the argmax of `predict_proba` instead, which
+	can pick a different label near decision boundaries for either model.
+
+	With `dtype=np.float32` the kernel evaluation runs in single precision:
+	faster, with probabilities equal to float64 up to rounding.
+	"""
+
+	def __init__(self, state: Dict[str, np.ndarray], dtype=np.float64):
+		self.dtype = np.dtype(dtype)
+		self.kernel = str(state["kernel"])
+		if self.kernel not in KERNELS:
+			raise ValueError(f"Unsupported kernel: {self.kernel}")
+		self.gamma = float(state["gamma"])
+		self.coef0 = float(state["coef0"])
+		self.degree = int(state["degree"])
+		self.classes_ = np.asarray(state["classes"])
+		self.mean = np.asarray(state["mean"], dtype=np.float64)
+		self.scale = np.asarray(state["scale"], dtype=np.float64)
+		self._mean32 = self.mean.astype(np.float32)
+		self._scale32 = self.scale.astype(np.float32)
+		self.support_vectors = np.asarray(state["support_vectors"], dtype=self.dtype)
+		self.sv_sq_norms = np.einsum("ij,ij->i", self.support_vectors, self.support_vectors)
+		self.pair_weights = np.asarray(state["pair_weights"], dtype=self.dtype)
+		self.intercept = np.asarray(state["intercept"], dtype=np.float64)
+		self.prob_a = np.asarray(state["prob_a"], dtype=np.float64)
+		self.prob_b = np.asarray(state["prob_b"], dtype=np.float64)
+		n_classes = len(self.classes_)
+		self._pair_index = np.triu_indices(n_classes, k=1)
+		self._state = state
+
+	@classmethod
+	def from_pipeline(cls, pipeline, dtype=np.float64) -> "CompiledSVMPredictor":
+		return cls(export_pipeline_state(pipeline), dtype=dtype)
+
+	def state(self) -> Dict[str, np.ndarray]:
+		return self._state
+
+	def _kernel(self, X: np.ndarray) -> np.ndarray:
+		dots = X @ self.support_vectors.T
+		if self.kernel == "linear":
+			return dots
+		if self.kernel == "rbf":
+			sq = np.einsum("ij,ij->i", X, X)[:, None] + self.sv_sq_norms[None, :] - 2.0 * dots
+			np.maximum(sq, 0.0, out=sq)
+			return np.exp(-self.gamma * sq)
+		if self.kernel == "poly":
+			return (self.gamma * dots + self.coef0) ** self.degree
+		return np.tanh(self.gamma * dots + self.coef0)
+
+	def decision_values(self, X) -> np.ndarray:
+		"""Return libsvm one-vs-one decision values, shape (N, n_pairs)."""
+		X = np.asarray(X)
+		if X.ndim == 1:
+			X = X[None, :]
+		# Standardize in the input's precision, as StandardScaler.transform does
+		if X.dtype == np.float32:
+			scaled = ((X - self._mean32) / self._scale32).astype(self.dtype, copy=False)
+		else:
+			scaled = ((X.astype(np.float64, copy=False) - self.mean) / self.scale).astype(self.dtype, copy=False)
+		return (self._kernel(scaled) @ self.pair_weights.T).astype(np.float64) + self.intercept
+
+	def predict_proba(self, X) -> np.ndarray:
+		dec = self.decision_values(X)
+		f = dec * self.prob_a + self.prob_b
+		# Numerically stable Platt sigmoid, as in libsvm's sigmoid_predict
+		pos = np.exp(-np.abs(f))
+		pairwise = np.where(f >= 0, pos / (1.0 + pos), 1.0 / (1.0 + pos))
+		pairwise = np.clip(pairwise, MIN_PROB, 1.0 - MIN_PROB)
+		n_classes = len(self.classes_)
+		r = np.zeros((len(dec), n_classes, n_classes))
+		rows, cols = self._pair_index
+		r[:, rows, cols] = pairwise
+		r[:, cols, rows] = 1.0 - pairwise
+		Q = -r.transpose(0, 2, 1) * r
+		diag = np.arange(n_classes)
+		Q[:, diag, diag] = np.einsum("nji,nji->ni", r, r)
+		if len(Q) <= SMALL_BATCH:
+			return np.array([_multiclass_probability_row(q.tolist()) for q in Q])
+		return _multiclass_probability(Q)
+
+	def predict(self, X) -> np.ndarray:
+		"""One-vs-one majority vote, as `SVC.predict` (ties go to the earlier class).
+
+		This can differ from the argmax of `predict_proba` near decision
+		boundaries, exactly as it does for the sklearn pipeline.
+		"""
+		dec = self.decision_values(X)
+		rows, cols = self._pair_index
+		winners = np.where(dec > 0, rows, cols)
+		votes = np.zeros((len(dec), len(self.classes_)), dtype=np.intp)
+		np.add.at(votes, (np.arange(len(dec))[:, None], winners), 1)
+		return self.classes_[np.argmax(votes, axis=1)]
+
+
+def _multiclass_probability_row(Q: List[List[float]]) -> List[float]:
+	"""libsvm's multiclass_probability (Wu, Lin and Weng) for one sample.
+
+	Q is the k x k coupling matrix built from the pairwise probabilities.
+	Follows libsvm's update order so results match it to rounding.
+	"""
+	k = len(Q)
+	p = [1.0 / k] * k
+	eps = 0.005 / k
+	for _ in range(max(100, k)):
+		Qp = [sum([q * x for q, x in zip(Qt, p)]) for Qt in Q]
+		pQp = sum([a * b for a, b in zip(p, Qp)])
+		if max([abs(x - pQp) for x in Qp]) < eps:
+			break
+		for t in range(k):
+			Qt = Q[t]
+			qtt = Qt[t]
+			qpt = Qp[t]
+			diff = (-qpt + pQp) / qtt
+			p[t] += diff
+			pQp = (pQp + diff * (diff * qtt + 2.0 * qpt)) / (1.0 + diff) / (1.0 + diff)
+			d1 = 1.0 + diff
+			Qp = [(a + diff * b) / d1 for a, b in zip(Qp, Qt)]
+			p = [x / d1 for x in p]
+	return p
+
+
+def _multiclass_probability(Q: np.ndarray) -> np.ndarray:
+	"""Batched `_multiclass_probability_row` over an (N, k, k) coupling matrix.
+
+	Rows iterate independently and stop at the same point libsvm would.
+	"""
+	n, k, _ = Q.shape
+	p = np.full((n, k), 1.0 / k)
+	active = np.ones(n, dtype=bool)
+	eps = 0.005 / k
+	for _ in range(max(100, k)):
+		rows = np.flatnonzero(active)
+		if len(rows) == 0:
+			break
+		Qa = Q[rows]
+		pa = p[rows]
+		Qp = np.einsum("nij,nj->ni", Qa, pa)
+		pQp = np.einsum("ni,ni->n", pa, Qp)
+		done = np.max(np.abs(Qp - pQp[:, None]), axis=1) < eps
+		active[rows[done]] = False
+		keep = ~done
+		if not keep.any():
+			break
+		rows, Qa, pa, Qp, pQp = rows[keep], Qa[keep], pa[keep], Qp[keep], pQp[keep]
+		for t in range(k):
+			qtt = Qa[:, t, t]
+			diff = (-Qp[:, t] + pQp) / qtt
+			pa[:, t] += diff
+			pQp = (pQp + diff * (diff * qtt + 2.0 * Qp[:, t])) / (1.0 + diff) / (1.0 + diff)
+			Qp = (Qp + diff[:, None] * Qa[:, t, :]) / (1.0 + diff)[:, None]
+			pa /= (1.0 + diff)[:, None]
+		p[rows] = pa
+	return p
+
+
+def export_pipeline_state(pipeline) -> Dict[str, np.ndarray]:
+	"""Freeze a fitted StandardScaler + SVC pipeline into plain arrays."""
+	scaler = pipeline.named_steps["scaler"]
+	clf = pipeline.named_steps["clf"]
+	if getattr(clf, "probA_", None) is None or len(clf.probA_) == 0:
+		raise ValueError("SVC must be trained with probability=True to export probabilities")
+	n_classes = len(clf.classes_)
+	n_support = np.asarray(clf.n_support_)
+	starts = np.concatenate([[0], np.cumsum(n_support)])
+	dual = np.asarray(clf._dual_coef_)
+	pair_weights = np.zeros((n_classes * (n_classes - 1) // 2, dual.shape[1]))
+	p = 0
+	for i in range(n_classes):
+		for j in range(i + 1, n_classes):
+			si, ei = starts[i], starts[i + 1]
+			sj, ej = starts[j], starts[j + 1]
+			pair_weights[p, si:ei] = dual[j - 1, si:ei]
+			pair_weights[p, sj:ej] = dual[i, sj:ej]
+			p += 1
+	n_features = clf.support_vectors_.shape[1]
+	mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+	scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+	return {
+		"kernel": clf.kernel,
+		"gamma": float(clf._gamma),
+		"coef0": float(clf.coef0),
+		"degree": int(clf.degree),
+		"classes": np.asarray(clf.classes_),
+		"mean": np.asarray(mean, dtype=np.float64),
+		"scale": np.asarray(scale, dtype=np.float64),
+		"support_vectors": np.asarray(clf.support_vectors_, dtype=np.float64),
+		"pair_weights": pair_weights,
+		"intercept": np.asarray(clf._intercept_, dtype=np.float64),
+		"prob_a": np.asarray(clf.probA_, dtype=np.float64),
+		"prob_b": np.asarray(clf.probB_, dtype=np.float64),
+	}
+
+
+def export_compiled_model(
+	pipeline,
+	labels: Optional[List[str]],
+	out_path: Path,
+	dtype=np.float64,
+	metadata: Optional[Dict] = None,
+) -> Path:
+	"""Save a compiled artifact that `slr.classifier.load_model` can read.
+
+	`dtype` selects the precision the loaded predictor evaluates in;
+	`metadata` is stored alongside as in `train_svm_classifier`.
+	"""
+	out_path = Path(out_path)
+	out_path.parent.mkdir(parents=True, exist_ok=True)
+	joblib.dump({
+		**(metadata or {}),
+		"compiled": export_pipeline_state(pipeline),
+		"labels": labels,
+		"dtype": np.dtype(dtype).name,
+	}, out_path)
+	return out_path
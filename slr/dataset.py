@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import csv
+import json
+import logging
+import os
+import queue
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -27,6 +38,13 @@ class CsvDataset:
 			writer = csv.writer(f)
 			writer.writerow([*sample.features, sample.label])
 
+	def append_many(self, samples: Sequence[Sample]) -> None:
+		if not samples:
+			return
+		with self.csv_path.open("a", newline="") as f:
+			writer = csv.writer(f)
+			writer.writerows([*sample.features, sample.label] for sample in samples)
+
 	def read_all(self) -> Tuple[List[List[float]], List[str]]:
 		features: List[List[float]] = []
 		labels: List[str] = []
@@ -41,3 +59,278 @@ class CsvDataset:
 				labels.append(row[-1])
 		return features, labels
 
+	def read_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+		"""Return (features, labels) as a float32 matrix and a label array."""
+		features, labels = self.read_all()
+		return np.asarray(features, dtype=np.float32), np.asarray(labels, dtype=str)
+
+	def iter_rows(self) -> Iterator[Tuple[List[str], str]]:
+		"""Yield raw (feature cells, label) rows without parsing floats."""
+		if not self.csv_path.exists():
+			return
+		with self.csv_path.open("r", newline="") as f:
+			for row in csv.reader(f):
+				if row:
+					yield row[:-1], row[-1]
+
+
+class ChunkedDataset:
+	"""Append-only binary dataset for large corpora.
+
+	Layout of the dataset directory:
+	- manifest.json: feature width, label dictionary and the ordered chunk list
+	- chunk-NNNNN.features.npy: float32 (rows, width) feature block
+	- chunk-NNNNN.labels.npy: int32 (rows,) label ids into the label dictionary
+
+	Chunks are never rewritten once the manifest references them, so readers
+	can memory-map them while a writer appends new chunks.
+
+	A missing directory raises `FileNotFoundError` unless `create` is set,
+	so a mistyped path is not read as an empty dataset.
+	"""
+
+	MANIFEST = "manifest.json"
+
+	def __init__(self, root: Path, create: bool = False):
+		self.root = Path(root)
+		if create:
+			self.root.mkdir(parents=True, exist_ok=True)
+		elif not self.root.is_dir():
+			raise FileNotFoundError(f"No chunked dataset at {self.root}")
+		self._manifest = self._load_manifest()
+
+	def _load_manifest(self) -> Dict:
+		path = self.root / self.MANIFEST
+		if not path.exists():
+			return {"num_features": None, "labels": [], "chunks": [], "next_chunk": 0}
+		with path.open("r") as f:
+			return json.load(f)
+
+	def _save_manifest(self) -> None:
+		tmp = self.root / (self.MANIFEST + ".tmp")
+		with tmp.open("w") as f:
+			json.dump(self._manifest, f, indent=1)
+		os.replace(tmp, self.root / self.MANIFEST)
+
+	@property
+	def labels(self) -> List[str]:
+		"""Label dictionary; label id i maps to labels[i]."""
+		return list(self._manifest["labels"])
+
+	@property
+	def num_rows(self) -> int:
+		return sum(chunk["rows"] for chunk in self._manifest["chunks"])
+
+	def _new_chunk_name(self) -> str:
+		"""Next unused chunk name; names are never reused, even after `compact`."""
+		index = self._manifest.get("next_chunk")
+		if index is None:
+			# Manifests written without the counter: continue after the highest chunk.
+			index = max((int(chunk["name"].rsplit("-", 1)[1]) for chunk in self._manifest["chunks"]), default=-1) + 1
+		self._manifest["next_chunk"] = index + 1
+		return f"chunk-{index:05d}"
+
+	def label_ids(self, labels: Iterable[str]) -> np.ndarray:
+		"""Map label strings to ids, extending the label dictionary as needed."""
+		names: List[str] = self._manifest["labels"]
+		index = {name: i for i, name in enumerate(names)}
+		ids = []
+		for label in labels:
+			if label not in index:
+				index[label] = len(names)
+				names.append(label)
+			ids.append(index[label])
+		return np.asarray(ids, dtype=np.int32)
+
+	def append(self, sample: Sample) -> None:
+		self.append_many([sample])
+
+	def append_many(self, samples: Sequence[Sample]) -> None:
+		if not samples:
+			return
+		features = np.asarray([s.features for s in samples], dtype=np.float32)
+		self.append_arrays(features, [s.label for s in samples])
+
+	def append_arrays(self, features: np.ndarray, labels: Sequence[str]) -> None:
+		"""Write one new chunk holding the given feature rows and labels."""
+		features = np.ascontiguousarray(features, dtype=np.float32)
+		if features.ndim != 2 or len(features) != len(labels):
+			raise ValueError("features must be (rows, width) with one label per row")
+		if len(features) == 0:
+			return
+		width = self._manifest["num_features"]
+		if width is None:
+			self._manifest["num_features"] = int(features.shape[1])
+		elif features.shape[1] != width:
+			raise ValueError(f"Expected {width} features per row, got {features.shape[1]}")
+		ids = self.label_ids(labels)
+		name = self._new_chunk_name()
+		np.save(self.root / f"{name}.features.npy", features)
+		np.save(self.root / f"{name}.labels.npy", ids)
+		self._manifest["chunks"].append({"name": name, "rows": int(len(features))})
+		self._save_manifest()
+
+	def iter_chunks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+		"""Yield memory-mapped (features, label_ids) views, one pair per chunk."""
+		for chunk in self._manifest["chunks"]:
+			name = chunk["name"]
+			features = np.load(self.root / f"{name}.features.npy", mmap_mode="r")
+			ids = np.load(self.root / f"{name}.labels.npy", mmap_mode="r")
+			yield features, ids
+
+	def read_ids(self) -> Tuple[np.ndarray, np.ndarray]:
+		"""Return (features, label_ids) for the whole dataset.
+
+		With a single chunk these are zero-copy memory-mapped views; several
+		chunks are concatenated once (see `compact` to merge them on disk).
+		"""
+		chunks = list(self.iter_chunks())
+		width = self._manifest["num_features"] or 0
+		if not chunks:
+			return np.empty((0, width), dtype=np.float32), np.empty(0, dtype=np.int32)
+		if len(chunks) == 1:
+			return chunks[0]
+		return (
+			np.concatenate([f for f, _ in chunks]),
+			np.concatenate([i for _, i in chunks]),
+		)
+
+	def read_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+		"""Return (features, labels) with labels decoded to strings."""
+		features, ids = self.read_ids()
+		names = np.asarray(self._manifest["labels"], dtype=str)
+		return features, names[ids] if len(ids) else np.empty(0, dtype=str)
+
+	def read_all(self) -> Tuple[List[List[float]], List[str]]:
+		features, labels = self.read_arrays()
+		return features.tolist(), labels.tolist()
+
+	def compact(self) -> None:
+		"""Merge all chunks into one so `read_ids` can return mmap views."""
+		chunks = self._manifest["chunks"]
+		if len(chunks) <= 1:
+			return
+		features, ids = self.read_ids()
+		name = self._new_chunk_name()
+		np.save(self.root / f"{name}.features.npy", features)
+		np.save(self.root / f"{name}.labels.npy", ids)
+		old = [chunk["name"] for chunk in chunks]
+		self._manifest["chunks"] = [{"name": name, "rows": int(len(features))}]
+		self._save_manifest()
+		for stale in old:
+			(self.root / f"{stale}.features.npy").unlink(missing_ok=True)
+			(self.root / f"{stale}.labels.npy").unlink(missing_ok=True)
+
+
+class BufferedSampleSink:
+	"""Queue samples for a dataset and write them from a background thread.
+
+	`put` only enqueues, so the capture loop never waits on disk. The writer
+	thread flushes whenever `batch_size` samples are pending or
+	`flush_interval` seconds have passed since the last write. Use as a
+	context manager (or call `close`) to flush everything on exit.
+
+	The dataset must provide `append_many(samples)`.
+	"""
+
+	_STOP = object()
+
+	def __init__(self, dataset, batch_size: int = 256, flush_interval: float = 1.0):
+		self.dataset = dataset
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self.written = 0
+		self._queue: "queue.Queue" = queue.Queue()
+		self._error: BaseException | None = None
+		self._thread = threading.Thread(target=self._run, name="sample-sink", daemon=True)
+		self._thread.start()
+
+	def put(self, sample: Sample) -> None:
+		if self._error is not None:
+			raise RuntimeError("Sample sink writer failed") from self._error
+		self._queue.put(sample)
+
+	def _write(self, pending: List[Sample]) -> None:
+		if pending:
+			self.dataset.append_many(pending)
+			self.written += len(pending)
+			pending.clear()
+
+	def _run(self) -> None:
+		pending: List[Sample] = []
+		deadline = time.monotonic() + self.flush_interval
+		try:
+			while True:
+				timeout = max(deadline - time.monotonic(), 0.0)
+				try:
+					item = self._queue.get(timeout=timeout)
+				except queue.Empty:
+					item = None
+				if item is self._STOP:
+					break
+				if item is not None:
+					pending.append(item)
+				if len(pending) >= self.batch_size or time.monotonic() >= deadline:
+					self._write(pending)
+					deadline = time.monotonic() + self.flush_interval
+			self._write(pending)
+		except BaseException as exc:
+			self._error = exc
+
+	def close(self) -> None:
+		"""Flush all queued samples and stop the writer thread."""
+		if self._thread.is_alive():
+			self._queue.put(self._STOP)
+			self._thread.join()
+		if self._error is not None:
+			raise RuntimeError("Sample sink writer failed") from self._error
+
+	def __enter__(self) -> "BufferedSampleSink":
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		if exc_type is None:
+			self.close()
+			return
+		# Already unwinding: report a writer failure without masking the
+		# original exception.
+		try:
+			self.close()
+		except RuntimeError as error:
+			logger.error("%s while handling %s", error, exc_type.__name__, exc_info=error.__cause__)
+
+
+def open_dataset(path: Path, create: bool = False):
+	"""Open a dataset, choosing the backend from the path.
+
+	`.csv` files use `CsvDataset`; anything else is a `ChunkedDataset`
+	directory, which must exist unless `create` is set (for writers).
+	"""
+	path = Path(path)
+	if path.suffix.lower() == ".csv":
+		return CsvDataset(path)
+	return ChunkedDataset(path, create=create)
+
+
+def convert_csv_to_chunked(csv_path: Path, out_dir: Path, chunk_rows: int = 65536) -> ChunkedDataset:
+	"""Stream a CSV dataset into a `ChunkedDataset` without loading it whole."""
+	if not Path(csv_path).is_file():
+		raise FileNotFoundError(f"No CSV dataset at {csv_path}")
+	source = CsvDataset(csv_path)
+	target = ChunkedDataset(out_dir, create=True)
+	cells: List[List[str]] = []
+	labels: List[str] = []
+
+	def flush() -> None:
+		if cells:
+			target.append_arrays(np.array(cells, dtype=np.float32), labels)
+			cells.clear()
+			labels.clear()
+
+	for row, label in source.iter_rows():
+		cells.append(row)
+		labels.append(label)
+		if len(cells) >= chunk_rows:
+			flush()
+	flush()
+	return target
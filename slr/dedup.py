@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .features import FEATURE_SIZE, NUM_HANDS, NUM_LANDMARKS
+
+
+HAND_SIZE = NUM_LANDMARKS * 3
+
+
+class NearDuplicateFilter:
+	"""Drop feature vectors that nearly repeat one already kept for the same label.
+
+	Two samples are near-duplicates when they have the same hands present
+	and their RMS landmark distance (normalized units, as in
+	`slr.gating.MotionGate`) is below `threshold`.
+
+	Kept vectors are indexed in `n_tables` spatial hash tables. Each table
+	randomly projects the 126 features to `n_dims` values and quantizes
+	them into cells of width `cell_scale * threshold` (with a random
+	offset), keyed together with the label and the hand-presence pattern. A
+	new sample is compared exactly against the vectors sharing one of its
+	cells, so a sample is only dropped after a true distance check. A rare
+	hash miss merely keeps a duplicate.
+
+	`seen`, `kept` and per-label counts (`counts`) report the shrinkage.
+	"""
+
+	def __init__(
+		self,
+		threshold: float = 0.02,
+		n_tables: int = 4,
+		n_dims: int = 8,
+		cell_scale: float = 4.0,
+		seed: int = 0,
+	):
+		if threshold <= 0:
+			raise ValueError("threshold must be > 0")
+		self.threshold = threshold
+		rng = np.random.default_rng(seed)
+		projections = rng.normal(size=(FEATURE_SIZE, n_tables * n_dims))
+		self._projections = projections / np.linalg.norm(projections, axis=0)
+		self._cell = cell_scale * threshold
+		self._offsets = rng.uniform(0.0, self._cell, n_tables * n_dims)
+		self._n_tables = n_tables
+		self._n_dims = n_dims
+		self._buckets: Dict[Tuple, List[int]] = {}
+		self._vectors = np.zeros((1024, FEATURE_SIZE), dtype=np.float32)
+		self._size = 0
+		self.counts: Dict[str, List[int]] = {}
+
+	@property
+	def seen(self) -> int:
+		return sum(seen for seen, _ in self.counts.values())
+
+	@property
+	def kept(self) -> int:
+		return sum(kept for _, kept in self.counts.values())
+
+	@property
+	def dropped(self) -> int:
+		return self.seen - self.kept
+
+	def _keys(self, X: np.ndarray) -> np.ndarray:
+		"""(N, n_tables, n_dims) integer cell coordinates."""
+		cells = np.floor((X @ self._projections + self._offsets) / self._cell).astype(np.int64)
+		return cells.reshape(len(X), self._n_tables, self._n_dims)
+
+	def _store(self, feat: np.ndarray) -> int:
+		if self._size == len(self._vectors):
+			self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+		index = self._size
+		self._vectors[index] = feat
+		self._size += 1
+		return index
+
+	def filter(self, features: np.ndarray, labels: Sequence[str]) -> np.ndarray:
+		"""Process rows in order; return a boolean mask of the rows kept.
+
+		Kept rows are remembered, so later calls (and later rows of the same
+		call) are compared against them too.
+		"""
+		X = np.asarray(features, dtype=np.float32)
+		if X.ndim != 2 or X.shape[1] != FEATURE_SIZE:
+			raise ValueError(f"Expected (N, {FEATURE_SIZE}) features, got {X.shape}")
+		keys = self._keys(X.astype(np.float64))
+		present = X.reshape(len(X), NUM_HANDS, HAND_SIZE).any(axis=2)
+		patterns = present @ (1 << np.arange(NUM_HANDS))
+		points = np.maximum(present.sum(axis=1), 1) * NUM_LANDMARKS
+		limit = self.threshold ** 2
+		keep = np.zeros(len(X), dtype=bool)
+		for i, label in enumerate(labels):
+			label = str(label)
+			counts = self.counts.setdefault(label, [0, 0])
+			counts[0] += 1
+			row_keys = [(label, int(patterns[i]), t, keys[i, t].tobytes()) for t in range(self._n_tables)]
+			candidates = {j for key in row_keys for j in self._buckets.get(key, ())}
+			if candidates:
+				ids = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+				delta = self._vectors[ids] - X[i]
+				if (np.einsum("ij,ij->i", delta, delta) / points[i] < limit).any():
+					continue
+			keep[i] = True
+			counts[1] += 1
+			index = self._store(X[i])
+			for key in row_keys:
+				self._buckets.setdefault(key, []).append(index)
+		return keep
+
+	def add(self, features: Sequence[float], label: str) -> bool:
+		"""Online variant of `filter` for one sample; True if it was kept."""
+		return bool(self.filter(np.asarray(features, dtype=np.float32)[None], [label])[0])
+
+	def report(self) -> List[str]:
+		lines = [
+			f"{label:16s} {seen:8d} -> {kept:8d}  ({1 - kept / seen:6.1%} dropped)"
+			for label, (seen, kept) in sorted(self.counts.items())
+		]
+		if self.seen:
+			lines.append(f"{'total':16s} {self.seen:8d} -> {self.kept:8d}  ({self.dropped / self.seen:6.1%} dropped)")
+		return lines
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Sequence, Tuple
-import math
+from typing import List, Optional, Sequence, Tuple
 
-from .hand import HandLandmarks
+import numpy as np
+
+from .landmarks import HandLandmarks
 
 
 NUM_LANDMARKS = 21
+NUM_HANDS = 2
+FEATURE_SIZE = NUM_HANDS * NUM_LANDMARKS * 3
 
 
 def _normalize_landmarks(landmarks: Sequence[Tuple[float, float, float]]) -> List[float]:
@@ -18,41 +21,132 @@ def _normalize_landmarks(landmarks: Sequence[Tuple[float, float, float]]) -> Lis
 	"""
 	if len(landmarks) != NUM_LANDMARKS:
 		return []
-	wx, wy, wz = landmarks[0]
-	shifted = [(x - wx, y - wy, z - wz) for (x, y, z) in landmarks]
-	dists = [math.sqrt(x * x + y * y + z * z) for (x, y, z) in shifted[1:]]
-	mean_dist = sum(dists) / max(len(dists), 1)
-	scale = 1.0 / mean_dist if mean_dist > 1e-6 else 1.0
-	normalized = []
-	for (x, y, z) in shifted:
-		normalized.extend([x * scale, y * scale, z * scale])
-	return normalized
+	points = np.asarray(landmarks, dtype=np.float64).reshape(1, NUM_LANDMARKS, 3)
+	return normalize_landmark_array(points)[0].ravel().tolist()
 
 
-def landmarks_to_feature_vector(hands: List[HandLandmarks]) -> List[float]:
-	"""Convert possibly two hands to a single fixed-length feature vector.
+def normalize_landmark_array(landmarks: np.ndarray) -> np.ndarray:
+	"""Vectorized `_normalize_landmarks` over an (..., 21, 3) array.
 
-	Concatenate normalized vectors for left and right. If only one hand is
-	available, pad the other with zeros.
+	Returns a float64 array of the same shape, translated to the wrist and
+	scaled so the mean wrist distance is 1.
 	"""
-	left: List[float] = []
-	right: List[float] = []
+	points = np.asarray(landmarks, dtype=np.float64)
+	shifted = points - points[..., :1, :]
+	dists = np.sqrt(np.einsum("...ij,...ij->...i", shifted[..., 1:, :], shifted[..., 1:, :]))
+	mean_dist = dists.mean(axis=-1)
+	safe = mean_dist > 1e-6
+	scale = np.where(safe, 1.0 / np.where(safe, mean_dist, 1.0), 1.0)
+	return shifted * scale[..., None, None]
+
+
+def hands_to_landmark_array(
+	hands: List[HandLandmarks],
+	points: Optional[np.ndarray] = None,
+	mask: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Place detected hands into (left, right) slots.
+
+	Returns a (2, 21, 3) float64 landmark array and a (2,) boolean mask of
+	filled slots, using the same slot rules as `landmarks_to_feature_vector`.
+	Pass `points` and `mask` to fill preallocated arrays instead.
+	"""
+	if points is None:
+		points = np.zeros((NUM_HANDS, NUM_LANDMARKS, 3), dtype=np.float64)
+	else:
+		points[...] = 0.0
+	if mask is None:
+		mask = np.zeros(NUM_HANDS, dtype=bool)
+	else:
+		mask[...] = False
 	for hand in hands:
 		if hand.handedness == "Left":
-			left = _normalize_landmarks(hand.landmarks)
+			slot = 0
 		elif hand.handedness == "Right":
-			right = _normalize_landmarks(hand.landmarks)
-		else:
+			slot = 1
+		elif not mask[0]:
 			# If unknown handedness, place in left if empty else right
-			if not left:
-				left = _normalize_landmarks(hand.landmarks)
-			elif not right:
-				right = _normalize_landmarks(hand.landmarks)
-
-	feature_size_single = NUM_LANDMARKS * 3
-	if not left:
-		left = [0.0] * feature_size_single
-	if not right:
-		right = [0.0] * feature_size_single
-	return left + right
+			slot = 0
+		elif not mask[1]:
+			slot = 1
+		else:
+			continue
+		valid = len(hand.landmarks) == NUM_LANDMARKS
+		if valid:
+			points[slot] = hand.landmarks
+		mask[slot] = valid
+	return points, mask
+
+
+def landmarks_to_feature_matrix(
+	landmarks: np.ndarray,
+	mask: np.ndarray,
+	dtype=np.float32,
+) -> np.ndarray:
+	"""Convert a batch of two-hand landmarks to feature vectors in one call.
+
+	- landmarks: (N, 2, 21, 3) array, slot 0 = left hand, slot 1 = right hand
+	- mask: (N, 2) boolean array marking which slots hold a hand
+	- Returns an (N, 126) array; empty slots are zero-filled
+	"""
+	points = np.asarray(landmarks)
+	mask = np.asarray(mask, dtype=bool)
+	if points.shape[1:] != (NUM_HANDS, NUM_LANDMARKS, 3):
+		raise ValueError(f"Expected landmarks of shape (N, 2, 21, 3), got {points.shape}")
+	if mask.shape != points.shape[:2]:
+		raise ValueError(f"Expected mask of shape {points.shape[:2]}, got {mask.shape}")
+	normalized = normalize_landmark_array(points)
+	normalized[~mask] = 0.0
+	return normalized.reshape(len(points), FEATURE_SIZE).astype(dtype, copy=False)
+
+
+def landmarks_to_feature_vector(hands: List[HandLandmarks]) -> List[float]:
+	"""Convert possibly two hands to a single fixed-length feature vector.
+
+	Concatenate normalized vectors for left and right. If only one hand is
+	available, pad the other with zeros.
+	"""
+	points, mask = hands_to_landmark_array(hands)
+	return landmarks_to_feature_matrix(points[None], mask[None], dtype=np.float64)[0].tolist()
+
+
+class FeatureExtractor:
+	"""Per-frame feature conversion into buffers allocated once.
+
+	Produces the same (126,) vector as `landmarks_to_feature_vector`, but
+	hands are slotted into a reused (2, 21, 3) `points` array and features
+	are written into a reused float64 output, so the steady state allocates
+	no arrays per frame. The returned array is overwritten by the next
+	call; copy it to keep it.
+	"""
+
+	def __init__(self):
+		self.points = np.zeros((NUM_HANDS, NUM_LANDMARKS, 3), dtype=np.float64)
+		self.mask = np.zeros(NUM_HANDS, dtype=bool)
+		self.features = np.zeros(FEATURE_SIZE, dtype=np.float64)
+		# Views and scratch arrays are made once too; slicing per frame
+		# would create new view objects every time.
+		self._out = self.features.reshape(NUM_HANDS, NUM_LANDMARKS, 3)
+		self._relative = self._out[:, 1:, :]
+		self._dists = np.zeros((NUM_HANDS, NUM_LANDMARKS - 1), dtype=np.float64)
+		self._mean_dist = np.zeros(NUM_HANDS, dtype=np.float64)
+
+	def __call__(self, hands: List[HandLandmarks]) -> np.ndarray:
+		hands_to_landmark_array(hands, self.points, self.mask)
+		return self.from_array(self.points, self.mask)
 
+	def from_array(self, points: np.ndarray, mask: np.ndarray) -> np.ndarray:
+		"""Normalize (2, 21, 3) slotted landmarks, as `landmarks_to_feature_matrix` does for one frame."""
+		out = self._out
+		np.subtract(points, points[:, :1, :], out=out)
+		# Same operations as `normalize_landmark_array`, so results match bit for bit
+		np.einsum("hij,hij->hi", self._relative, self._relative, out=self._dists)
+		np.sqrt(self._dists, out=self._dists)
+		np.mean(self._dists, axis=1, out=self._mean_dist)
+		for slot in range(NUM_HANDS):
+			mean_dist = self._mean_dist[slot]
+			if not mask[slot]:
+				out[slot] = 0.0
+			elif mean_dist > 1e-6:
+				out[slot] *= 1.0 / mean_dist
+		return self.features
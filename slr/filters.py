@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .features import NUM_HANDS, NUM_LANDMARKS, hands_to_landmark_array, normalize_landmark_array
+from .landmarks import HandLandmarks
+
+
+def _alpha(cutoff: np.ndarray | float, dt: float) -> np.ndarray | float:
+	"""Smoothing factor of a first-order low-pass with `cutoff` Hz over `dt` seconds."""
+	tau = 1.0 / (2.0 * np.pi * cutoff)
+	return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroLandmarkFilter:
+	"""One Euro adaptive low-pass over (2, 21, 3) two-hand landmark arrays.
+
+	Every landmark is smoothed with a cutoff of
+	`min_cutoff + beta * speed` Hz: slow (jittery) landmarks are smoothed
+	strongly and fast ones barely, so jitter is removed without adding lag
+	to real motion. Speed is the low-passed (`d_cutoff` Hz) landmark speed
+	in hand sizes per second (the hand's mean wrist-to-landmark distance),
+	so the same settings work for pixel and normalized coordinates and at
+	any distance from the camera.
+
+	Both hand slots are filtered in one vectorized update. Each slot keeps
+	its own state, which restarts when the hand leaves the frame, so a hand
+	that reappears elsewhere does not glide in from its old position.
+
+	`filter_hands` smooths hand shapes in normalized coordinates (wrist at
+	the origin, unit size, as the classifier sees them), so moving the hand
+	across the frame or towards the camera never lags the features.
+
+	`timestamp` (seconds) defaults to the monotonic clock; pass recording
+	timestamps when replaying faster or slower than real time.
+	"""
+
+	def __init__(self, min_cutoff: float = 1.0, beta: float = 2.0, d_cutoff: float = 1.0):
+		if min_cutoff <= 0 or d_cutoff <= 0:
+			raise ValueError("min_cutoff and d_cutoff must be > 0")
+		self.min_cutoff = min_cutoff
+		self.beta = beta
+		self.d_cutoff = d_cutoff
+		shape = (NUM_HANDS, NUM_LANDMARKS, 3)
+		self._x = np.zeros(shape, dtype=np.float64)
+		self._dx = np.zeros(shape, dtype=np.float64)
+		self._active = np.zeros(NUM_HANDS, dtype=bool)
+		self._last_time: Optional[float] = None
+
+	def reset(self) -> None:
+		self._x[:] = 0.0
+		self._dx[:] = 0.0
+		self._active[:] = False
+		self._last_time = None
+
+	def filter(self, points: np.ndarray, mask: np.ndarray, timestamp: Optional[float] = None) -> np.ndarray:
+		"""Filter one frame and return the smoothed (2, 21, 3) landmarks.
+
+		- points: (2, 21, 3) landmarks, slot 0 = left hand, slot 1 = right hand
+		- mask: (2,) boolean array marking which slots hold a hand
+		Empty slots are returned as zeros. The returned array is reused by
+		the next call; copy it to keep it.
+		"""
+		points = np.asarray(points, dtype=np.float64)
+		mask = np.asarray(mask, dtype=bool)
+		if points.shape != self._x.shape:
+			raise ValueError(f"Expected landmarks of shape {self._x.shape}, got {points.shape}")
+		now = time.monotonic() if timestamp is None else float(timestamp)
+		dt = None if self._last_time is None else now - self._last_time
+		self._last_time = now
+
+		# Both slots are updated as whole arrays; per-slot masks only select
+		# which results are kept, which is cheaper than fancy indexing.
+		tracked = (mask & self._active)[:, None, None]
+		if dt is not None and dt > 0 and self._active.any():
+			x = self._x
+			shifted = x[:, 1:, :] - x[:, :1, :]
+			size = np.sqrt(np.einsum("hij,hij->hi", shifted, shifted)).mean(axis=1)
+			size = np.maximum(size, 1e-6)[:, None, None]
+			dx = self._dx + _alpha(self.d_cutoff, dt) * ((points - x) / dt - self._dx)
+			speed = np.sqrt(np.einsum("hij,hij->hi", dx, dx))[..., None] / size
+			alpha = _alpha(self.min_cutoff + self.beta * speed, dt)
+			np.copyto(self._dx, dx, where=tracked)
+			np.copyto(self._x, x + alpha * (points - x), where=tracked)
+		# With a repeated timestamp (dt == 0) tracked hands keep their estimate.
+
+		started = (mask & ~self._active)[:, None, None]
+		np.copyto(self._x, points, where=started)
+		np.copyto(self._dx, 0.0, where=started)
+		empty = ~mask[:, None, None]
+		np.copyto(self._x, 0.0, where=empty)
+		np.copyto(self._dx, 0.0, where=empty)
+		self._active[:] = mask
+		return self._x
+
+	def filter_hands(self, hands: List[HandLandmarks], timestamp: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+		"""Slot and normalize detected hands, then filter them.
+
+		Returns (points, mask) ready for `landmarks_to_feature_matrix`.
+		"""
+		points, mask = hands_to_landmark_array(hands)
+		return self.filter(normalize_landmark_array(points), mask, timestamp), mask
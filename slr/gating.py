@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from .features import NUM_LANDMARKS
+
+
+HAND_SIZE = NUM_LANDMARKS * 3
+
+
+class MotionGate:
+	"""Reuse the last classification while the hands are (nearly) static.
+
+	Compares the normalized landmark feature vector of each frame with the
+	one that was last sent to the classifier. When the RMS landmark
+	displacement is below `threshold` (in normalized units, where the mean
+	wrist-to-landmark distance is 1) the cached result is returned instead of
+	running the classifier. A hand appearing or disappearing always counts
+	as motion, and `max_reuse` bounds how many frames in a row can reuse the
+	same result.
+
+	`frames`, `classified` and `skipped` count gate decisions; `skip_rate` is
+	the fraction of frames that reused a cached result.
+	"""
+
+	def __init__(self, threshold: float = 0.02, max_reuse: int = 30):
+		self.threshold = threshold
+		self.max_reuse = max_reuse
+		self.frames = 0
+		self.classified = 0
+		self.skipped = 0
+		self._last: Optional[np.ndarray] = None
+		self._last_present: Optional[np.ndarray] = None
+		self._result: Any = None
+		self._reused = 0
+
+	@property
+	def skip_rate(self) -> float:
+		return self.skipped / self.frames if self.frames else 0.0
+
+	def lookup(self, features: Sequence[float]) -> Any:
+		"""Return the cached result if the hands did not move, else None.
+
+		A None return means the caller should classify and then `store`.
+		"""
+		self.frames += 1
+		feat = np.asarray(features, dtype=np.float64)
+		if self._last is not None and self._reused < self.max_reuse and self.threshold > 0:
+			present = feat.reshape(-1, HAND_SIZE).any(axis=1)
+			if np.array_equal(present, self._last_present):
+				delta = feat - self._last
+				n_points = max(int(present.sum()), 1) * NUM_LANDMARKS
+				if np.sqrt(np.dot(delta, delta) / n_points) < self.threshold:
+					self._reused += 1
+					self.skipped += 1
+					return self._result
+		self.classified += 1
+		return None
+
+	def store(self, features: Sequence[float], result: Any) -> None:
+		"""Record the classified features and the result to reuse."""
+		feat = np.asarray(features, dtype=np.float64)
+		if self._last is None or self._last.shape != feat.shape:
+			self._last = feat.copy()
+		else:
+			# Copy into the kept buffer: callers may overwrite `features` later
+			# (e.g. a `FeatureExtractor` output).
+			np.copyto(self._last, feat)
+		self._last_present = self._last.reshape(-1, HAND_SIZE).any(axis=1)
+		self._result = result
+		self._reused = 0
+
+	def reset(self) -> None:
+		"""Forget the cached result (e.g. when the hands leave the frame)."""
+		self._last = None
+		self._last_present = None
+		self._result = None
+		self._reused = 0
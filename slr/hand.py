@@ -1,89 +1,308 @@
+from __future__ import annotations
+
 import contextlib
+import time
 from dataclasses import dataclass
-from typing import Iterator, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Re-exported: HandLandmarks lives in the NumPy-only `slr.landmarks`.
+from .landmarks import HandLandmarks
 
-import cv2
-try:
-	import mediapipe as mp
-except Exception as _exc:
-	mp = None  # type: ignore
-	_MEDIAPIPE_IMPORT_ERROR = _exc
+# cv2 and mediapipe are imported on first use, so code that only needs
+# HandLandmarks or QualityLevel does not load the vision stack.
 
 
-@dataclass
-class HandLandmarks:
-	"""Container for a single hand's landmarks normalized to image size.
+def _import_mediapipe():
+	try:
+		import mediapipe as mp
+	except Exception as exc:
+		raise RuntimeError(
+			"mediapipe is not installed or not supported on this Python version. "
+			"Install mediapipe on Python 3.10-3.12 and run in that interpreter. "
+			f"Original import error: {exc}"
+		) from exc
+	if not hasattr(mp, "solutions"):
+		raise RuntimeError(
+			f"mediapipe {getattr(mp, '__version__', '?')} does not provide the legacy "
+			"mp.solutions.hands API; install a release that still ships it."
+		)
+	return mp
+
 
-	Attributes:
-	- landmarks: List of (x, y, z) floats in pixel coordinates relative to the frame
-	- handedness: Optional string like "Left" or "Right"
+@dataclass(frozen=True)
+class QualityLevel:
+	"""Detector settings traded against speed.
+
+	- model_complexity: MediaPipe Hands model (1 = full, 0 = lite)
+	- scale: resize factor applied to the frame before detection
+	- roi: crop around the last detected hands (plus margin) when available
 	"""
-	landmarks: List[Tuple[float, float, float]]
-	handedness: Optional[str]
+	model_complexity: int = 1
+	scale: float = 1.0
+	roi: bool = False
+
+
+# Ordered from most accurate to cheapest
+QUALITY_LEVELS: Tuple[QualityLevel, ...] = (
+	QualityLevel(model_complexity=1, scale=1.0),
+	QualityLevel(model_complexity=0, scale=1.0),
+	QualityLevel(model_complexity=0, scale=0.75),
+	QualityLevel(model_complexity=0, scale=0.5),
+	QualityLevel(model_complexity=0, scale=0.5, roi=True),
+)
 
 
 class MediaPipeHandDetector:
-	"""Thin wrapper around MediaPipe Hands for easy iteration over frames."""
+	"""Thin wrapper around MediaPipe Hands for easy iteration over frames.
+
+	With `headless=True` no visualization is produced: the mirrored frame and
+	its RGB conversion are written into reused buffers, nothing is drawn,
+	and `process_bgr_frame` returns `(landmarks, None)`.
+	"""
 
 	def __init__(
 		self,
 		min_detection_confidence: float = 0.8,
 		min_tracking_confidence: float = 0.5,
 		max_num_hands: int = 2,
+		model_complexity: int = 1,
+		roi_margin: float = 0.25,
+		headless: bool = False,
 	):
-		if mp is None:
-			raise RuntimeError(
-				"mediapipe is not installed or not supported on this Python version. "
-				"Install mediapipe on Python 3.10-3.12 and run in that interpreter. "
-				f"Original import error: {_MEDIAPIPE_IMPORT_ERROR}"
-			)
+		mp = _import_mediapipe()
 		self._mp_hands = mp.solutions.hands
 		self._mp_drawing = mp.solutions.drawing_utils
-		self._hands = self._mp_hands.Hands(
-			model_complexity=1,
+		self.headless = headless
+		self._landmark_spec = self._mp_drawing.DrawingSpec(color=(255, 0, 255), thickness=4, circle_radius=2)
+		self._connection_spec = self._mp_drawing.DrawingSpec(color=(20, 180, 90), thickness=2, circle_radius=2)
+		# (name, shape) -> reusable output array for headless conversions
+		self._buffers: Dict[Tuple[str, Tuple[int, ...]], np.ndarray] = {}
+		self._hands_options = dict(
 			min_detection_confidence=min_detection_confidence,
 			min_tracking_confidence=min_tracking_confidence,
 			max_num_hands=max_num_hands,
 		)
+		self._hands_by_complexity: Dict[int, object] = {}
+		self.roi_margin = roi_margin
+		# Normalized (x0, y0, x1, y1) box around the hands of the last frame
+		self._last_bbox: Optional[Tuple[float, float, float, float]] = None
+		self.set_quality(QualityLevel(model_complexity=model_complexity))
+
+	@property
+	def quality(self) -> QualityLevel:
+		return self._quality
+
+	def set_quality(self, level: QualityLevel) -> None:
+		"""Switch detector settings; MediaPipe models are created on first use."""
+		if level.model_complexity not in self._hands_by_complexity:
+			self._hands_by_complexity[level.model_complexity] = self._mp_hands.Hands(
+				model_complexity=level.model_complexity, **self._hands_options
+			)
+		self._hands = self._hands_by_complexity[level.model_complexity]
+		self._quality = level
+
+	def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+		key = (name, shape)
+		buf = self._buffers.get(key)
+		if buf is None:
+			buf = self._buffers[key] = np.empty(shape, dtype=np.uint8)
+		return buf
+
+	def _roi(self, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+		"""Pixel crop (x0, y0, x1, y1) around the last hands, or None."""
+		if not self._quality.roi or self._last_bbox is None:
+			return None
+		x0, y0, x1, y1 = self._last_bbox
+		mx = (x1 - x0) * self.roi_margin + 0.05
+		my = (y1 - y0) * self.roi_margin + 0.05
+		px0 = int(max(x0 - mx, 0.0) * width)
+		py0 = int(max(y0 - my, 0.0) * height)
+		px1 = int(min(x1 + mx, 1.0) * width)
+		py1 = int(min(y1 + my, 1.0) * height)
+		if px1 - px0 < 32 or py1 - py0 < 32:
+			return None
+		return px0, py0, px1, py1
 
 	def process_bgr_frame(self, frame_bgr) -> Tuple[List[HandLandmarks], any]:
-		"""Process a BGR frame and return detected landmarks and a visualization frame."""
-		frame_bgr = cv2.flip(frame_bgr, 1)
-		image_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+		"""Process a BGR frame and return detected landmarks and a visualization frame.
+
+		The visualization frame is None in headless mode.
+		"""
+		import cv2
+
+		if self.headless:
+			frame_bgr = cv2.flip(frame_bgr, 1, dst=self._buffer("flip", frame_bgr.shape))
+		else:
+			# The mirrored copy is ours, so it doubles as the visualization frame
+			frame_bgr = cv2.flip(frame_bgr, 1)
+		height, width = frame_bgr.shape[:2]
+		roi = self._roi(width, height)
+		image_bgr = frame_bgr if roi is None else frame_bgr[roi[1]:roi[3], roi[0]:roi[2]]
+		if self._quality.scale < 1.0:
+			image_bgr = cv2.resize(
+				image_bgr, None, fx=self._quality.scale, fy=self._quality.scale, interpolation=cv2.INTER_AREA
+			)
+		if self.headless:
+			image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=self._buffer("rgb", image_bgr.shape))
+		else:
+			image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
 		results = self._hands.process(image_rgb)
+		if roi is not None and results.multi_hand_landmarks:
+			# Map crop-relative coordinates back to the full frame in place
+			sx = (roi[2] - roi[0]) / width
+			sy = (roi[3] - roi[1]) / height
+			ox = roi[0] / width
+			oy = roi[1] / height
+			for hand_lms in results.multi_hand_landmarks:
+				for lm in hand_lms.landmark:
+					lm.x = lm.x * sx + ox
+					lm.y = lm.y * sy + oy
+					lm.z = lm.z * sx
 		landmarks_all: List[HandLandmarks] = []
 		if results.multi_hand_landmarks:
 			for idx, hand_lms in enumerate(results.multi_hand_landmarks):
-				landmarks: List[Tuple[float, float, float]] = []
-				for lm in hand_lms.landmark:
-					landmarks.append((lm.x, lm.y, lm.z))
+				# Straight from the protobuf into one array, no per-point tuples
+				coords = (value for lm in hand_lms.landmark for value in (lm.x, lm.y, lm.z))
+				landmarks = np.fromiter(coords, dtype=np.float64, count=3 * len(hand_lms.landmark)).reshape(-1, 3)
 				handedness = None
 				if results.multi_handedness and idx < len(results.multi_handedness):
 					handedness = results.multi_handedness[idx].classification[0].label
 				landmarks_all.append(HandLandmarks(landmarks=landmarks, handedness=handedness))
+		if self._quality.roi:
+			self._last_bbox = _bounding_box(landmarks_all)
 
-		vis_bgr = frame_bgr.copy()
+		if self.headless:
+			return landmarks_all, None
+		vis_bgr = frame_bgr
 		if results.multi_hand_landmarks:
 			for hand_lms in results.multi_hand_landmarks:
 				self._mp_drawing.draw_landmarks(
 					vis_bgr,
 					hand_lms,
 					self._mp_hands.HAND_CONNECTIONS,
-					landmark_drawing_spec=self._mp_drawing.DrawingSpec(
-						color=(255, 0, 255), thickness=4, circle_radius=2
-					),
-					connection_drawing_spec=self._mp_drawing.DrawingSpec(
-						color=(20, 180, 90), thickness=2, circle_radius=2
-					),
+					landmark_drawing_spec=self._landmark_spec,
+					connection_drawing_spec=self._connection_spec,
 				)
 		return landmarks_all, vis_bgr
 
 	def close(self) -> None:
-		self._hands.close()
+		for hands in self._hands_by_complexity.values():
+			hands.close()
+
+	def reset(self) -> None:
+		"""Forget tracking and ROI state so the next frame is detected from scratch."""
+		self.close()
+		self._hands_by_complexity.clear()
+		self._last_bbox = None
+		self.set_quality(self._quality)
+
+
+def _bounding_box(hands: List[HandLandmarks]) -> Optional[Tuple[float, float, float, float]]:
+	points = [hand.landmarks[:, :2] for hand in hands if len(hand.landmarks)]
+	if not points:
+		return None
+	xy = np.concatenate(points)
+	(x0, y0), (x1, y1) = xy.min(axis=0).tolist(), xy.max(axis=0).tolist()
+	return x0, y0, x1, y1
+
+
+class AdaptiveQualityController:
+	"""Keep detection within a frame-time budget by switching quality levels.
+
+	Wraps a `MediaPipeHandDetector` and exposes the same `process_bgr_frame`
+	and `close`. An exponential moving average of detection latency is
+	compared with the budget 1 / target_fps:
+	- over budget: step to the next cheaper level once the average has had
+	  `settle_frames` frames on the current level
+	- under `headroom` * budget for `patience` frames: step back up, unless
+	  that level was measured over budget within the last `retry_frames`
+
+	The first `warmup_frames` latencies on a level (at start and after every
+	switch) are left out of the average: the first frames on a newly
+	created MediaPipe graph are several times slower than the rest, and a
+	single one would otherwise dominate the fresh average and trigger the
+	next step down.
+
+	The detector is the slowest stage of the pipelined runtime, so holding it
+	within budget holds the end-to-end frame rate.
+	"""
+
+	def __init__(
+		self,
+		detector: MediaPipeHandDetector,
+		target_fps: float = 30.0,
+		levels: Sequence[QualityLevel] = QUALITY_LEVELS,
+		smoothing: float = 0.1,
+		headroom: float = 0.6,
+		patience: int = 30,
+		retry_frames: int = 600,
+		settle_frames: int = 5,
+		warmup_frames: int = 2,
+	):
+		self.detector = detector
+		self.budget = 1.0 / target_fps
+		self.levels = list(levels)
+		self.smoothing = smoothing
+		self.headroom = headroom
+		self.patience = patience
+		self.retry_frames = retry_frames
+		self.settle_frames = settle_frames
+		self.warmup_frames = warmup_frames
+		self.level_index = 0
+		self.frames = 0
+		self.switches = 0
+		self.latency: Optional[float] = None
+		self._since_switch = 0
+		# level index -> frame number when it was last seen over budget
+		self._over_budget_at: Dict[int, int] = {}
+		self.detector.set_quality(self.levels[0])
+
+	@property
+	def level(self) -> QualityLevel:
+		return self.levels[self.level_index]
+
+	def _switch(self, index: int) -> None:
+		self.level_index = index
+		self.detector.set_quality(self.levels[index])
+		self.latency = None
+		self._since_switch = 0
+		self.switches += 1
+
+	def observe(self, seconds: float) -> None:
+		"""Feed one detection latency and adjust the quality level."""
+		self.frames += 1
+		self._since_switch += 1
+		measured = self._since_switch - self.warmup_frames
+		if measured <= 0:
+			return
+		a = self.smoothing
+		self.latency = seconds if self.latency is None else (1 - a) * self.latency + a * seconds
+		if self.latency > self.budget:
+			self._over_budget_at[self.level_index] = self.frames
+			# Give the average a few frames to settle on the new level first
+			if self.level_index + 1 < len(self.levels) and measured >= self.settle_frames:
+				self._switch(self.level_index + 1)
+		elif self.level_index > 0 and measured >= self.patience and self.latency < self.headroom * self.budget:
+			last_over = self._over_budget_at.get(self.level_index - 1)
+			if last_over is None or self.frames - last_over >= self.retry_frames:
+				self._switch(self.level_index - 1)
+
+	def process_bgr_frame(self, frame_bgr) -> Tuple[List[HandLandmarks], any]:
+		t0 = time.perf_counter()
+		result = self.detector.process_bgr_frame(frame_bgr)
+		self.observe(time.perf_counter() - t0)
+		return result
+
+	def close(self) -> None:
+		self.detector.close()
 
 
 @contextlib.contextmanager
 def webcam_capture(device_index: int = 0) -> Iterator[cv2.VideoCapture]:
+	import cv2
+
 	capture = cv2.VideoCapture(device_index)
 	try:
 		yield capture
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+from sklearn.metrics import classification_report
+
+from .classifier import TrainResult
+
+
+class IncrementalLinearClassifier:
+	"""Linear ridge head that learns from running sufficient statistics.
+
+	Keeps n, sum(x), X^T X and X^T Y (one-hot labels) for everything seen so
+	far, so `partial_fit` costs O(new_rows * D^2) plus one D x D solve,
+	regardless of how much data was learned before. Standardization is
+	derived from the same statistics, so the fit equals a batch ridge
+	regression on standardized features. New labels simply add a column.
+
+	`predict_proba` is a softmax over ridge scores scaled by `temperature`.
+	"""
+
+	def __init__(self, alpha: float = 1.0, temperature: float = 10.0):
+		self.alpha = alpha
+		self.temperature = temperature
+		self.classes_ = np.empty(0, dtype=object)
+		self.n_seen = 0
+		self._sum = None
+		self._xtx = None
+		self._xty = None
+		self._counts = np.zeros(0)
+		self._mean = None
+		self._scale = None
+		self._weights = None
+		self._bias = None
+
+	def _ensure_labels(self, labels: Sequence[str]) -> np.ndarray:
+		index = {label: i for i, label in enumerate(self.classes_)}
+		new = [label for label in dict.fromkeys(labels) if label not in index]
+		if new:
+			self.classes_ = np.concatenate([self.classes_, np.asarray(new, dtype=object)])
+			pad = len(new)
+			self._counts = np.concatenate([self._counts, np.zeros(pad)])
+			if self._xty is not None:
+				self._xty = np.hstack([self._xty, np.zeros((self._xty.shape[0], pad))])
+			index = {label: i for i, label in enumerate(self.classes_)}
+		return np.asarray([index[label] for label in labels], dtype=np.intp)
+
+	def partial_fit(self, features, labels) -> "IncrementalLinearClassifier":
+		X = np.asarray(features, dtype=np.float64)
+		labels = [str(label) for label in labels]
+		if len(X) != len(labels):
+			raise ValueError("features and labels must have the same length")
+		if len(X) == 0:
+			return self
+		ids = self._ensure_labels(labels)
+		if self._xtx is None:
+			d = X.shape[1]
+			self._sum = np.zeros(d)
+			self._xtx = np.zeros((d, d))
+			self._xty = np.zeros((d, len(self.classes_)))
+		Y = np.zeros((len(X), len(self.classes_)))
+		Y[np.arange(len(X)), ids] = 1.0
+		self.n_seen += len(X)
+		self._sum += X.sum(axis=0)
+		self._xtx += X.T @ X
+		self._xty += X.T @ Y
+		self._counts += Y.sum(axis=0)
+		self._solve()
+		return self
+
+	def _solve(self) -> None:
+		n = self.n_seen
+		mean = self._sum / n
+		var = np.diag(self._xtx) / n - mean * mean
+		scale = np.sqrt(np.maximum(var, 0.0))
+		scale[scale < 1e-12] = 1.0
+		gram = (self._xtx - n * np.outer(mean, mean)) / np.outer(scale, scale)
+		cross = (self._xty - np.outer(mean, self._counts)) / scale[:, None]
+		gram[np.diag_indices_from(gram)] += self.alpha
+		self._weights = np.linalg.solve(gram, cross)
+		self._bias = self._counts / n
+		self._mean = mean
+		self._scale = scale
+
+	def decision_function(self, features) -> np.ndarray:
+		if self._weights is None:
+			raise RuntimeError("Classifier has not seen any data yet")
+		X = np.asarray(features, dtype=np.float64)
+		return ((X - self._mean) / self._scale) @ self._weights + self._bias
+
+	def predict_proba(self, features) -> np.ndarray:
+		scores = self.decision_function(features) * self.temperature
+		scores -= scores.max(axis=1, keepdims=True)
+		np.exp(scores, out=scores)
+		scores /= scores.sum(axis=1, keepdims=True)
+		return scores
+
+	def predict(self, features) -> np.ndarray:
+		return self.classes_[np.argmax(self.decision_function(features), axis=1)]
+
+
+def _validation_report(model: IncrementalLinearClassifier, X: np.ndarray, y: np.ndarray) -> str:
+	if len(X) == 0:
+		return "Insufficient validation data"
+	return classification_report(y, model.predict(X), zero_division=0)
+
+
+def _save(model: IncrementalLinearClassifier, model_out: Path, metadata: Dict) -> List[str]:
+	labels = sorted(str(label) for label in model.classes_)
+	model_out = Path(model_out)
+	model_out.parent.mkdir(parents=True, exist_ok=True)
+	joblib.dump({**metadata, "incremental": model, "labels": labels}, model_out)
+	return labels
+
+
+def update_incremental_classifier(
+	features,
+	labels,
+	model_out: Path,
+	alpha: float = 1.0,
+	metadata: Optional[Dict] = None,
+	augment=None,
+) -> TrainResult:
+	"""Fold new samples (and possibly new labels) into a saved linear head.
+
+	Creates the model if `model_out` does not exist yet. Only the new samples
+	are read; the report is computed on those samples after the update.
+	`metadata` is fixed when the model is created; later updates must match.
+	With `augment` (a `slr.augment.FeatureAugmenter`) its augmented batches
+	are streamed into `partial_fit` one at a time, never all in memory.
+	"""
+	model_out = Path(model_out)
+	metadata = dict(metadata or {})
+	model = None
+	if model_out.exists():
+		saved = dict(joblib.load(model_out))
+		model = saved.pop("incremental", None)
+		if model is None:
+			raise ValueError(f"{model_out} is not an incremental model")
+		saved.pop("labels", None)
+		for key, value in metadata.items():
+			if saved.get(key) != value:
+				raise ValueError(f"{key}={value} does not match saved model ({key}={saved.get(key)})")
+		metadata = saved
+	if model is None:
+		model = IncrementalLinearClassifier(alpha=alpha)
+	X = np.asarray(features, dtype=np.float32)
+	y = np.asarray(labels).astype(str)
+	model.partial_fit(X, y)
+	if augment is not None:
+		for X_batch, y_batch in augment(X, y):
+			model.partial_fit(X_batch, y_batch)
+	saved_labels = _save(model, model_out, metadata)
+	return TrainResult(model_path=model_out, report=_validation_report(model, X, y), labels=saved_labels)
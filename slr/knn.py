@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+from sklearn.metrics import classification_report
+from sklearn.neighbors import BallTree, KDTree
+
+from .classifier import TrainResult, _split
+
+
+_TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+
+
+class NearestNeighborClassifier:
+	"""k-NN over enrolled feature vectors, with insertion and deletion.
+
+	Samples are standardized with a per-feature mean and scale fixed by the
+	first `add`, so stored vectors never need rescaling. Adding a sign or
+	dropping one is a cheap insert or delete, not a retrain.
+
+	`algorithm` picks the search index:
+	- "kd_tree" / "ball_tree": a scikit-learn tree. Samples added since the
+	  tree was built are searched by brute force and deleted ones are
+	  skipped in query results; the tree is rebuilt on the next query once
+	  either set exceeds `rebuild_fraction` of the indexed samples.
+	- "brute": one matrix product against all samples, with their squared
+	  norms cached at insertion; deleted samples are masked out.
+	- "auto" (default): like scikit-learn, a tree for up to 15 features
+	  and brute force above that. Trees prune poorly in high dimensions;
+	  on 126-feature hand vectors brute force is about twice as fast
+	  (about 0.3 ms vs 0.55-0.8 ms per frame at 2500 samples).
+
+	`predict_proba` gives each class the share of the `k` nearest
+	neighbours it holds (weighted by inverse distance with
+	`weights="distance"`). `classes_` lists labels that still have samples,
+	in enrollment order.
+	"""
+
+	def __init__(
+		self,
+		k: int = 5,
+		weights: str = "uniform",
+		algorithm: str = "auto",
+		leaf_size: int = 40,
+		rebuild_fraction: float = 0.1,
+	):
+		if k < 1:
+			raise ValueError("k must be >= 1")
+		if weights not in ("uniform", "distance"):
+			raise ValueError(f"Unknown weights: {weights}")
+		if algorithm not in ("auto", "brute", *_TREES):
+			raise ValueError(f"Unknown algorithm: {algorithm} (expected auto, brute, {', '.join(_TREES)})")
+		self.k = k
+		self.weights = weights
+		self.algorithm = algorithm
+		self.leaf_size = leaf_size
+		self.rebuild_fraction = rebuild_fraction
+		self._names: List[str] = []
+		self._vectors: Optional[np.ndarray] = None
+		self._sq_norms = np.zeros(0, dtype=np.float64)
+		self._label_ids = np.zeros(0, dtype=np.intp)
+		self._alive = np.zeros(0, dtype=bool)
+		self._size = 0
+		self._mean = None
+		self._scale = None
+		self._tree = None
+		self._tree_rows = np.zeros(0, dtype=np.intp)
+		self._tree_dead = 0
+
+	@property
+	def n_samples(self) -> int:
+		return int(self._alive[: self._size].sum())
+
+	def _live_labels(self) -> np.ndarray:
+		"""Boolean mask over all enrolled label names that still have samples."""
+		ids = self._label_ids[: self._size][self._alive[: self._size]]
+		return np.bincount(ids, minlength=len(self._names)) > 0
+
+	@property
+	def classes_(self) -> np.ndarray:
+		return np.asarray(self._names, dtype=object)[self._live_labels()]
+
+	def _scaled(self, features) -> np.ndarray:
+		return (np.asarray(features, dtype=np.float64) - self._mean) / self._scale
+
+	def _grow(self, n: int) -> None:
+		capacity = 0 if self._vectors is None else len(self._vectors)
+		if self._size + n <= capacity:
+			return
+		capacity = max(1024, 2 * capacity, self._size + n)
+		vectors = np.zeros((capacity, len(self._mean)), dtype=np.float64)
+		sq_norms = np.zeros(capacity, dtype=np.float64)
+		label_ids = np.zeros(capacity, dtype=np.intp)
+		alive = np.zeros(capacity, dtype=bool)
+		if self._vectors is not None:
+			vectors[: self._size] = self._vectors[: self._size]
+			sq_norms[: self._size] = self._sq_norms[: self._size]
+			label_ids[: self._size] = self._label_ids[: self._size]
+			alive[: self._size] = self._alive[: self._size]
+		self._vectors, self._sq_norms, self._label_ids, self._alive = vectors, sq_norms, label_ids, alive
+
+	def add(self, features, labels) -> "NearestNeighborClassifier":
+		"""Enroll samples; new labels become classes immediately."""
+		X = np.asarray(features, dtype=np.float64)
+		labels = [str(label) for label in labels]
+		if len(X) != len(labels):
+			raise ValueError("features and labels must have the same length")
+		if len(X) == 0:
+			return self
+		if self._mean is None:
+			self._mean = X.mean(axis=0)
+			scale = X.std(axis=0)
+			scale[scale < 1e-12] = 1.0
+			self._scale = scale
+		index = {name: i for i, name in enumerate(self._names)}
+		for label in dict.fromkeys(labels):
+			if label not in index:
+				index[label] = len(self._names)
+				self._names.append(label)
+		self._grow(len(X))
+		rows = slice(self._size, self._size + len(X))
+		self._vectors[rows] = self._scaled(X)
+		self._sq_norms[rows] = np.einsum("ij,ij->i", self._vectors[rows], self._vectors[rows])
+		self._label_ids[rows] = [index[label] for label in labels]
+		self._alive[rows] = True
+		self._size += len(X)
+		return self
+
+	def partial_fit(self, features, labels) -> "NearestNeighborClassifier":
+		return self.add(features, labels)
+
+	def remove_labels(self, labels: Sequence[str]) -> int:
+		"""Delete every sample of `labels`; returns how many were removed."""
+		doomed_names = {str(label) for label in labels}
+		ids = [i for i, name in enumerate(self._names) if name in doomed_names]
+		if not ids:
+			return 0
+		doomed = self._alive[: self._size] & np.isin(self._label_ids[: self._size], ids)
+		self._alive[: self._size][doomed] = False
+		if self._tree is not None:
+			self._tree_dead += int(doomed[self._tree_rows].sum())
+		return int(doomed.sum())
+
+	@property
+	def uses_tree(self) -> bool:
+		if self.algorithm == "auto":
+			return self._mean is not None and len(self._mean) <= 15
+		return self.algorithm != "brute"
+
+	def _distances(self, Xs: np.ndarray, rows) -> np.ndarray:
+		"""Euclidean distances from scaled queries to stored `rows`, via |a|^2 + |b|^2 - 2ab."""
+		sq = (Xs * Xs).sum(axis=1)[:, None] + self._sq_norms[rows][None, :] - 2.0 * Xs @ self._vectors[rows].T
+		return np.sqrt(np.maximum(sq, 0.0))
+
+	def _pending_rows(self) -> np.ndarray:
+		start = self._tree_rows[-1] + 1 if len(self._tree_rows) else 0
+		return np.flatnonzero(self._alive[start: self._size]) + start
+
+	def _ensure_tree(self) -> np.ndarray:
+		"""Rebuild the tree if it is missing or stale; return pending rows."""
+		pending = self._pending_rows()
+		limit = self.rebuild_fraction * max(len(self._tree_rows), 1)
+		if self._tree is None or len(pending) > max(limit, 64) or self._tree_dead > limit:
+			rows = np.flatnonzero(self._alive[: self._size])
+			tree = _TREES.get(self.algorithm, KDTree)
+			self._tree = tree(self._vectors[rows], leaf_size=self.leaf_size)
+			self._tree_rows = rows
+			self._tree_dead = 0
+			pending = rows[:0]
+		return pending
+
+	def kneighbors(self, features):
+		"""(distances, sample rows) of the `k` nearest enrolled samples, nearest first."""
+		if self.n_samples == 0:
+			raise RuntimeError("Classifier has no enrolled samples")
+		Xs = np.atleast_2d(self._scaled(features))
+		k = min(self.k, self.n_samples)
+		if not self.uses_tree:
+			size = self._size
+			dist = np.where(self._alive[:size], self._distances(Xs, slice(0, size)), np.inf)
+			rows = np.argpartition(dist, k - 1, axis=1)[:, :k] if k < size else np.broadcast_to(np.arange(size), dist.shape)
+			dist = np.take_along_axis(dist, rows, axis=1)
+			order = np.argsort(dist, axis=1, kind="stable")
+			return np.take_along_axis(dist, order, axis=1), np.take_along_axis(rows, order, axis=1)
+		pending = self._ensure_tree()
+		n_tree = len(self._tree_rows)
+		dist = np.empty((len(Xs), 0))
+		rows = np.empty((len(Xs), 0), dtype=np.intp)
+		if n_tree:
+			# Ask for extra neighbours to make up for deleted ones.
+			tree_dist, tree_idx = self._tree.query(Xs, k=min(k + self._tree_dead, n_tree))
+			dist, rows = tree_dist, self._tree_rows[tree_idx]
+		if len(pending):
+			pending_dist = self._distances(Xs, pending)
+			dist = np.hstack([dist, pending_dist])
+			rows = np.hstack([rows, np.broadcast_to(pending, pending_dist.shape)])
+		dist = np.where(self._alive[rows], dist, np.inf)
+		order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+		return np.take_along_axis(dist, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+	def predict_proba(self, features) -> np.ndarray:
+		dist, rows = self.kneighbors(features)
+		if self.weights == "distance":
+			votes = 1.0 / np.maximum(dist, 1e-9)
+		else:
+			votes = np.ones_like(dist)
+		scores = np.zeros((len(rows), len(self._names)))
+		np.add.at(scores, (np.arange(len(rows))[:, None], self._label_ids[rows]), votes)
+		scores = scores[:, self._live_labels()]
+		scores /= scores.sum(axis=1, keepdims=True)
+		return scores
+
+	def predict(self, features) -> np.ndarray:
+		return self.classes_[np.argmax(self.predict_proba(features), axis=1)]
+
+	def __getstate__(self):
+		# Saved models hold only live samples and the labels they use, so
+		# deleted rows are not carried from save to save; the tree is
+		# rebuilt on first use.
+		state = dict(self.__dict__)
+		keep = self._alive[: self._size]
+		live = self._live_labels()
+		new_ids = np.cumsum(live) - 1
+		state["_names"] = [name for name, used in zip(self._names, live) if used]
+		state["_vectors"] = None if self._vectors is None else self._vectors[: self._size][keep]
+		state["_sq_norms"] = self._sq_norms[: self._size][keep]
+		state["_label_ids"] = new_ids[self._label_ids[: self._size][keep]].astype(np.intp)
+		state["_alive"] = np.ones(int(keep.sum()), dtype=bool)
+		state["_size"] = int(keep.sum())
+		state["_tree"] = None
+		state["_tree_rows"] = np.zeros(0, dtype=np.intp)
+		state["_tree_dead"] = 0
+		return state
+
+
+def _save(model: NearestNeighborClassifier, model_out: Path, metadata: Dict) -> List[str]:
+	labels = sorted(str(label) for label in model.classes_)
+	model_out = Path(model_out)
+	model_out.parent.mkdir(parents=True, exist_ok=True)
+	joblib.dump({**metadata, "knn": model, "labels": labels}, model_out)
+	return labels
+
+
+def train_knn_classifier(
+	features,
+	labels,
+	model_out: Path,
+	k: int = 5,
+	weights: str = "uniform",
+	metadata: Optional[Dict] = None,
+	augment=None,
+) -> TrainResult:
+	"""Build and save a `NearestNeighborClassifier` from a dataset.
+
+	The report scores the validation split against the training split, as
+	for `train_svm_classifier`; the saved model then enrolls both splits.
+	`augment` adds augmented copies of the training split.
+	"""
+	X = np.asarray(features, dtype=np.float32)
+	y = np.asarray(labels).astype(str)
+	X_train, X_val, y_train, y_val = _split(X, y)
+	if augment is not None:
+		from .augment import materialize
+		X_train, y_train = materialize(X_train, y_train, augment)
+	model = NearestNeighborClassifier(k=k, weights=weights).add(X_train, y_train)
+	report = (
+		classification_report(y_val, model.predict(X_val), zero_division=0)
+		if len(y_val) > 0 else "Insufficient validation data"
+	)
+	model.add(X_val, y_val)
+	saved_labels = _save(model, model_out, dict(metadata or {}))
+	return TrainResult(model_path=Path(model_out), report=report, labels=saved_labels)
+
+
+def _load_saved(model_out: Path, metadata: Dict):
+	saved = dict(joblib.load(model_out))
+	model = saved.pop("knn", None)
+	if model is None:
+		raise ValueError(f"{model_out} is not a nearest-neighbour model")
+	saved.pop("labels", None)
+	for key, value in metadata.items():
+		if saved.get(key) != value:
+			raise ValueError(f"{key}={value} does not match saved model ({key}={saved.get(key)})")
+	return model, saved
+
+
+def enroll_knn_samples(
+	features,
+	labels,
+	model_out: Path,
+	k: int = 5,
+	replace: bool = False,
+	metadata: Optional[Dict] = None,
+) -> List[str]:
+	"""Add samples to a saved nearest-neighbour model (created if missing).
+
+	With `replace`, existing samples of the enrolled labels are deleted
+	first, so re-recording a sign replaces it. `metadata` is fixed when the
+	model is created; later enrollments must match. Returns the saved labels.
+	"""
+	model_out = Path(model_out)
+	metadata = dict(metadata or {})
+	if model_out.exists():
+		model, metadata = _load_saved(model_out, metadata)
+	else:
+		model = NearestNeighborClassifier(k=k)
+	y = np.asarray(labels).astype(str)
+	if replace:
+		model.remove_labels(sorted(set(y.tolist())))
+	model.add(np.asarray(features, dtype=np.float32), y)
+	return _save(model, model_out, metadata)
+
+
+def remove_knn_labels(model_out: Path, labels: Sequence[str]) -> int:
+	"""Delete all samples of `labels` from a saved model; returns the count removed."""
+	model, metadata = _load_saved(Path(model_out), {})
+	removed = model.remove_labels(labels)
+	_save(model, model_out, metadata)
+	return removed
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+class HandLandmarks:
+	"""Container for a single hand's landmarks normalized to image size.
+
+	Attributes:
+	- landmarks: (21, 3) array of (x, y, z) per landmark, in the detector's
+	  coordinates (MediaPipe: x, y relative to the frame size)
+	- handedness: Optional string like "Left" or "Right"
+
+	Arrays are kept as given (no copy), so `landmarks` may be a view into a
+	larger buffer such as a memory-mapped recording; anything else (e.g. a
+	list of (x, y, z) tuples) is converted to float64.
+	"""
+	__slots__ = ("landmarks", "handedness")
+
+	def __init__(self, landmarks, handedness: Optional[str] = None):
+		self.landmarks = landmarks if isinstance(landmarks, np.ndarray) else np.asarray(landmarks, dtype=np.float64)
+		self.handedness = handedness
+
+	def __repr__(self) -> str:
+		return f"HandLandmarks(handedness={self.handedness!r}, landmarks=<{len(self.landmarks)} points>)"
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RollingHistogram:
+	"""Latency samples of the last `capacity` events plus lifetime totals."""
+
+	def __init__(self, capacity: int = 1024):
+		self._samples = np.zeros(capacity, dtype=np.float64)
+		self._lock = threading.Lock()
+		self._next = 0
+		self.count = 0
+		self.total = 0.0
+
+	def add(self, seconds: float) -> None:
+		with self._lock:
+			self._samples[self._next] = seconds
+			self._next = (self._next + 1) % len(self._samples)
+			self.count += 1
+			self.total += seconds
+
+	def summary(self, quantiles: Sequence[float] = QUANTILES) -> Dict[str, float]:
+		"""Return count, sum, mean and rolling quantiles (seconds)."""
+		with self._lock:
+			filled = min(self.count, len(self._samples))
+			window = self._samples[:filled].copy()
+			count, total = self.count, self.total
+		out = {"count": count, "sum": total, "mean": total / count if count else 0.0}
+		values = np.quantile(window, quantiles) if filled else np.zeros(len(quantiles))
+		for q, value in zip(quantiles, values):
+			out[f"p{round(q * 100)}"] = float(value)
+		return out
+
+
+class _Span:
+	__slots__ = ("_hist", "_start")
+
+	def __init__(self, hist: RollingHistogram):
+		self._hist = hist
+		self._start = 0
+
+	def __enter__(self) -> "_Span":
+		self._start = time.perf_counter_ns()
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self._hist.add((time.perf_counter_ns() - self._start) * 1e-9)
+
+
+class _NullSpan:
+	__slots__ = ()
+
+	def __enter__(self) -> "_NullSpan":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StageTimer:
+	"""Per-stage latency spans on the monotonic clock with rolling histograms.
+
+	Use `with timer.span("detect"): ...` around each stage. A span object is
+	cached per stage name and is not re-entrant, so time each stage name
+	from one thread at a time (one name per pipeline stage). When disabled,
+	`span` returns a shared no-op context manager.
+	"""
+
+	def __init__(self, enabled: bool = True, capacity: int = 1024):
+		self.enabled = enabled
+		self.capacity = capacity
+		self._histograms: Dict[str, RollingHistogram] = {}
+		self._spans: Dict[str, _Span] = {}
+		self._lock = threading.Lock()
+
+	def histogram(self, name: str) -> RollingHistogram:
+		hist = self._histograms.get(name)
+		if hist is None:
+			with self._lock:
+				hist = self._histograms.setdefault(name, RollingHistogram(self.capacity))
+		return hist
+
+	def span(self, name: str):
+		if not self.enabled:
+			return _NULL_SPAN
+		span = self._spans.get(name)
+		if span is None:
+			span = self._spans[name] = _Span(self.histogram(name))
+		return span
+
+	def record(self, name: str, seconds: float) -> None:
+		if self.enabled:
+			self.histogram(name).add(seconds)
+
+	def snapshot(self) -> Dict[str, Dict[str, float]]:
+		"""Stage name -> summary (seconds), in first-seen stage order."""
+		return {name: hist.summary() for name, hist in list(self._histograms.items())}
+
+	def overlay_lines(self) -> List[str]:
+		return [
+			f"{name:9s} p50 {s['p50'] * 1e3:6.1f}  p95 {s['p95'] * 1e3:6.1f}  p99 {s['p99'] * 1e3:6.1f} ms"
+			for name, s in self.snapshot().items()
+		]
+
+	def to_prometheus(self, metric: str = "slr_stage_latency_seconds") -> str:
+		lines = [
+			f"# HELP {metric} Per-stage latency of the SLR runtime.",
+			f"# TYPE {metric} summary",
+		]
+		for name, s in self.snapshot().items():
+			for q in QUANTILES:
+				lines.append(f'{metric}{{stage="{name}",quantile="{q}"}} {s[f"p{round(q * 100)}"]:.9f}')
+			lines.append(f'{metric}_sum{{stage="{name}"}} {s["sum"]:.9f}')
+			lines.append(f'{metric}_count{{stage="{name}"}} {s["count"]}')
+		return "\n".join(lines) + "\n"
+
+	def write(self, path: Path) -> None:
+		"""Atomically write a snapshot as CSV (`.csv`) or JSON (otherwise)."""
+		path = Path(path)
+		path.parent.mkdir(parents=True, exist_ok=True)
+		snapshot = self.snapshot()
+		tmp = path.with_name(path.name + ".tmp")
+		with tmp.open("w", newline="") as f:
+			if path.suffix.lower() == ".csv":
+				writer = csv.writer(f)
+				writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+				for name, s in snapshot.items():
+					writer.writerow([name, s["count"], *(f"{s[k] * 1e3:.3f}" for k in ("mean", "p50", "p95", "p99"))])
+			else:
+				json.dump({"timestamp": time.time(), "stages": snapshot}, f, indent=1)
+		os.replace(tmp, path)
+
+
+def draw_overlay(frame, timer: StageTimer, origin=(10, 160)) -> None:
+	"""Draw the per-stage p50/p95/p99 table onto a BGR frame."""
+	import cv2
+
+	x, y = origin
+	for i, line in enumerate(timer.overlay_lines()):
+		cv2.putText(frame, line, (x, y + 18 * i), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 255, 0), 1)
+
+
+class MetricsExporter:
+	"""Export a `StageTimer` periodically to a file and/or over HTTP.
+
+	- path: rewritten every `interval` seconds (JSON, or CSV for `.csv`)
+	- port: serves Prometheus text format at http://host:port/metrics
+	Both run on daemon threads; `close` writes a final snapshot.
+	"""
+
+	def __init__(
+		self,
+		timer: StageTimer,
+		path: Optional[Path] = None,
+		interval: float = 5.0,
+		port: Optional[int] = None,
+		host: str = "127.0.0.1",
+	):
+		self.timer = timer
+		self.path = Path(path) if path else None
+		self.interval = interval
+		self._stop = threading.Event()
+		self._threads: List[threading.Thread] = []
+		self._server: Optional[ThreadingHTTPServer] = None
+		if self.path is not None:
+			self._threads.append(threading.Thread(target=self._write_loop, name="metrics-writer", daemon=True))
+		if port is not None:
+			self._server = ThreadingHTTPServer((host, port), self._handler())
+			self._threads.append(threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True))
+		for thread in self._threads:
+			thread.start()
+
+	def _handler(self):
+		timer = self.timer
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				if self.path.rstrip("/") not in ("", "/metrics"):
+					self.send_error(404)
+					return
+				body = timer.to_prometheus().encode()
+				self.send_response(200)
+				self.send_header("Content-Type", "text/plain; version=0.0.4")
+				self.send_header("Content-Length", str(len(body)))
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args):
+				pass
+
+		return Handler
+
+	def _write_loop(self) -> None:
+		while not self._stop.wait(self.interval):
+			self.timer.write(self.path)
+
+	def close(self) -> None:
+		self._stop.set()
+		if self._server is not None:
+			self._server.shutdown()
+			self._server.server_close()
+		for thread in self._threads:
+			thread.join(timeout=1.0)
+		if self.path is not None:
+			self.timer.write(self.path)
+
+	def __enter__(self) -> "MetricsExporter":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+Source = Union[int, str, Path]
+
+_END = "end"
+_ERROR = "error"
+_FRAME = "frame"
+
+
+def parse_source(value: str) -> Source:
+	"""Device index for digit strings (e.g. "0"), else a video path or URL."""
+	return int(value) if value.isdigit() else value
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+	"""Attach to a ring created by the parent without taking ownership of it."""
+	if sys.version_info >= (3, 13):
+		return shared_memory.SharedMemory(name=name, track=False)
+	# Workers are started by the owning process and share its resource
+	# tracker, so the extra registration is a no-op and nothing is unlinked
+	# when a worker exits.
+	return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrameRing:
+	"""Fixed number of same-shape uint8 frame slots in shared memory.
+
+	Created by the capturing process; workers attach by `name` and read a
+	slot as a NumPy view, so frames cross process boundaries without being
+	pickled. Slot ownership is tracked by the caller (see `MultiStreamRuntime`).
+	"""
+
+	def __init__(self, shape: Tuple[int, ...], slots: int, name: Optional[str] = None):
+		self.shape = tuple(shape)
+		self.slots = slots
+		size = int(np.prod(self.shape)) * slots
+		self._owner = name is None
+		self._shm = shared_memory.SharedMemory(create=True, size=size) if self._owner else _attach(name)
+		self.name = self._shm.name
+		self.frames = np.ndarray((slots, *self.shape), dtype=np.uint8, buffer=self._shm.buf)
+
+	def close(self) -> None:
+		del self.frames
+		self._shm.close()
+		if self._owner:
+			self._shm.unlink()
+
+
+def _default_detector():
+	from .hand import MediaPipeHandDetector
+	return MediaPipeHandDetector(headless=True)
+
+
+def _worker_main(
+	tasks: "mp.Queue",
+	results: "mp.Queue",
+	model_path: Optional[Path],
+	detector_factory: Callable[[], Any],
+) -> None:
+	"""Detect, featurize and classify frames of the streams routed here.
+
+	Each stream gets its own detector (so tracking state is not shared
+	between cameras) and its own temporal window.
+	"""
+	from .classifier import load_model_bundle
+	from .features import landmarks_to_feature_vector
+	from .temporal import SlidingWindowFeatures
+
+	pipeline = None
+	window = None
+	if model_path is not None:
+		pipeline, info = load_model_bundle(model_path)
+		window = info.get("feature_window")
+	rings: Dict[str, SharedFrameRing] = {}
+	detectors: Dict[int, Any] = {}
+	temporals: Dict[int, SlidingWindowFeatures] = {}
+	try:
+		while True:
+			task = tasks.get()
+			if task is None:
+				break
+			if task[0] == _END:
+				results.put(task)
+				continue
+			_, stream_id, ring_name, shape, slots, slot, seq, timestamp = task
+			ring = rings.get(ring_name)
+			if ring is None:
+				ring = rings[ring_name] = SharedFrameRing(shape, slots, name=ring_name)
+			detector = detectors.get(stream_id)
+			if detector is None:
+				detector = detectors[stream_id] = detector_factory()
+			hands, _ = detector.process_bgr_frame(ring.frames[slot])
+			proba = None
+			feat = landmarks_to_feature_vector(hands)
+			temporal = temporals.get(stream_id)
+			if window and temporal is None:
+				temporal = temporals[stream_id] = SlidingWindowFeatures(window)
+			if feat and any(feat):
+				if pipeline is not None:
+					model_input = temporal.push(feat) if temporal is not None else feat
+					proba = pipeline.predict_proba([model_input])[0]
+			elif temporal is not None:
+				temporal.reset()
+			results.put((_FRAME, stream_id, slot, seq, timestamp, hands, proba))
+	except BaseException:
+		results.put((_ERROR, traceback.format_exc()))
+	finally:
+		for detector in detectors.values():
+			detector.close()
+		for ring in rings.values():
+			ring.close()
+
+
+@dataclass
+class StreamResult:
+	"""One processed frame of one stream."""
+	stream_id: int
+	seq: int
+	timestamp: float
+	hands: List[Any]
+	label: Optional[str] = None
+	confidence: float = 0.0
+	phrase: Optional[str] = None
+
+
+@dataclass
+class StreamStats:
+	frames: int = 0
+	processed: int = 0
+	dropped: int = 0
+
+
+@dataclass
+class _Stream:
+	source: Source
+	decoder: Any
+	text_builder: Any
+	free_slots: "queue.Queue" = field(default_factory=queue.Queue)
+	ring: Optional[SharedFrameRing] = None
+	stats: StreamStats = field(default_factory=StreamStats)
+
+
+class MultiStreamRuntime:
+	"""Capture several sources and process them on a pool of worker processes.
+
+	- sources: device indices and/or video paths (see `parse_source`)
+	- model_path: model bundle each worker loads; None only detects hands
+	- workers: detector processes; stream `i` is always routed to worker
+	  `i % workers`, so its frames are processed in order
+	- slots: shared-memory frame slots per stream; when all are in flight
+	  a live source drops the newest frame (counted in `stats`), while a
+	  video file read faster than real time waits for a free slot
+	- decoder_factory: builds a label smoother per stream (default:
+	  `TemporalLabelSmoother`); it is called with the model classes and
+	  its `push` is given the label when `label_decoder` is True, else the
+	  probability row
+	- realtime: pace video files at their native frame rate
+
+	One capture thread per stream copies frames into that stream's
+	`SharedFrameRing` and sends only the slot index to its worker. Iterating
+	yields `StreamResult`s on the calling thread, where each stream keeps
+	its own smoother and `TextBuilder` state.
+	"""
+
+	def __init__(
+		self,
+		sources: Sequence[Source],
+		model_path: Optional[Path] = None,
+		workers: Optional[int] = None,
+		slots: int = 4,
+		decoder_factory: Optional[Callable[[List[str]], Any]] = None,
+		label_decoder: bool = True,
+		realtime: bool = False,
+		detector_factory: Callable[[], Any] = _default_detector,
+	):
+		from .text_buffer import TemporalLabelSmoother, TextBuilder
+
+		self.sources = list(sources)
+		self.workers = max(1, min(workers or mp.cpu_count(), len(self.sources)))
+		self.slots = slots
+		self.realtime = realtime
+		self.label_decoder = label_decoder
+		self.classes: List[str] = []
+		if model_path is not None:
+			from .classifier import load_model_bundle
+			predictor, _ = load_model_bundle(model_path)
+			self.classes = [str(c) for c in predictor.classes_]
+		make_decoder = decoder_factory or (lambda classes: TemporalLabelSmoother())
+		self._streams = [
+			_Stream(source, make_decoder(self.classes), TextBuilder()) for source in self.sources
+		]
+		for stream in self._streams:
+			for slot in range(slots):
+				stream.free_slots.put(slot)
+		ctx = mp.get_context("spawn")
+		self._tasks = [ctx.Queue() for _ in range(self.workers)]
+		self._results = ctx.Queue()
+		self._processes = [
+			ctx.Process(
+				target=_worker_main,
+				args=(self._tasks[i], self._results, model_path, detector_factory),
+				name=f"slr-worker-{i}",
+				daemon=True,
+			)
+			for i in range(self.workers)
+		]
+		self._stop = threading.Event()
+		self._threads: List[threading.Thread] = []
+
+	def stats(self) -> List[StreamStats]:
+		return [stream.stats for stream in self._streams]
+
+	def start(self) -> "MultiStreamRuntime":
+		for process in self._processes:
+			process.start()
+		for stream_id in range(len(self._streams)):
+			thread = threading.Thread(target=self._capture_loop, args=(stream_id,), name=f"capture-{stream_id}", daemon=True)
+			self._threads.append(thread)
+			thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		for thread in self._threads:
+			thread.join(timeout=2.0)
+		for tasks in self._tasks:
+			tasks.put(None)
+		for process in self._processes:
+			process.join(timeout=5.0)
+			if process.is_alive():
+				process.terminate()
+		# A capture thread still blocked in read() would write into its ring
+		# after unmapping; leave those rings to the resource tracker.
+		busy = {stream_id for stream_id, thread in enumerate(self._threads) if thread.is_alive()}
+		for stream_id, stream in enumerate(self._streams):
+			if stream.ring is not None and stream_id not in busy:
+				stream.ring.close()
+				stream.ring = None
+
+	def _acquire_slot(self, stream: _Stream, wait: bool) -> Optional[int]:
+		if not wait:
+			try:
+				return stream.free_slots.get_nowait()
+			except queue.Empty:
+				return None
+		while not self._stop.is_set():
+			try:
+				return stream.free_slots.get(timeout=0.05)
+			except queue.Empty:
+				continue
+		return None
+
+	def _capture_loop(self, stream_id: int) -> None:
+		import cv2
+
+		stream = self._streams[stream_id]
+		tasks = self._tasks[stream_id % self.workers]
+		capture = cv2.VideoCapture(stream.source)
+		is_file = not isinstance(stream.source, int)
+		interval = 0.0
+		if self.realtime and is_file:
+			fps = capture.get(cv2.CAP_PROP_FPS)
+			interval = 1.0 / fps if fps > 0 else 0.0
+		seq = 0
+		start = time.monotonic()
+		try:
+			while not self._stop.is_set() and capture.isOpened():
+				ok, frame = capture.read()
+				if not ok:
+					break
+				if interval:
+					delay = start + seq * interval - time.monotonic()
+					if delay > 0:
+						time.sleep(delay)
+				stream.stats.frames += 1
+				timestamp = time.monotonic() - start
+				if stream.ring is None:
+					stream.ring = SharedFrameRing(frame.shape, self.slots)
+				elif frame.shape != stream.ring.shape:
+					raise ValueError(f"Stream {stream_id} changed frame shape from {stream.ring.shape} to {frame.shape}")
+				slot = self._acquire_slot(stream, wait=is_file and not self.realtime)
+				if slot is None:
+					stream.stats.dropped += 1
+					seq += 1
+					continue
+				np.copyto(stream.ring.frames[slot], frame)
+				tasks.put((_FRAME, stream_id, stream.ring.name, stream.ring.shape, self.slots, slot, seq, timestamp))
+				seq += 1
+		finally:
+			capture.release()
+			tasks.put((_END, stream_id))
+
+	def _handle(self, item: Tuple) -> StreamResult:
+		_, stream_id, slot, seq, timestamp, hands, proba = item
+		stream = self._streams[stream_id]
+		stream.free_slots.put(slot)
+		stream.stats.processed += 1
+		result = StreamResult(stream_id, seq, timestamp, hands)
+		if proba is None:
+			return result
+		idx = int(np.argmax(proba))
+		result.label = self.classes[idx]
+		result.confidence = float(proba[idx])
+		stable = stream.decoder.push(result.label if self.label_decoder else proba)
+		if stable:
+			result.phrase = stream.text_builder.push_label(stable)
+		return result
+
+	def __iter__(self) -> Iterator[StreamResult]:
+		remaining = len(self._streams)
+		while remaining and not self._stop.is_set():
+			try:
+				item = self._results.get(timeout=0.1)
+			except queue.Empty:
+				if not any(process.is_alive() for process in self._processes):
+					raise RuntimeError("All stream workers exited")
+				continue
+			if item[0] == _END:
+				remaining -= 1
+			elif item[0] == _ERROR:
+				raise RuntimeError(f"Stream worker failed:\n{item[1]}")
+			else:
+				yield self._handle(item)
+
+	def __enter__(self) -> "MultiStreamRuntime":
+		return self.start()
+
+	def __exit__(self, *exc) -> None:
+		self.stop()
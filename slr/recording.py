@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .features import NUM_HANDS, NUM_LANDMARKS, landmarks_to_feature_matrix
+from .landmarks import HandLandmarks
+
+
+MAGIC = b"SLRLMK\x00\x01"
+
+# Per-hand handedness codes; 0 marks an empty hand slot.
+HANDEDNESS_CODES = {"Left": 1, "Right": 2, None: 3}
+_HANDEDNESS_NAMES = {code: name for name, code in HANDEDNESS_CODES.items()}
+
+RECORD_DTYPE = np.dtype([
+	("timestamp", "<f8"),
+	("handedness", "u1", (NUM_HANDS,)),
+	("landmarks", "<f4", (NUM_HANDS, NUM_LANDMARKS, 3)),
+])
+
+
+def _slot_table() -> np.ndarray:
+	"""Map a record's handedness codes to the source hand of each feature slot.
+
+	Follows the slot rules of `hands_to_landmark_array` for every code pair;
+	-1 marks an empty slot.
+	"""
+	table = np.full((4, 4, NUM_HANDS), -1, dtype=np.int64)
+	for c0 in range(4):
+		for c1 in range(4):
+			slots = table[c0, c1]
+			for index, code in enumerate((c0, c1)):
+				if code == HANDEDNESS_CODES["Left"]:
+					slots[0] = index
+				elif code == HANDEDNESS_CODES["Right"]:
+					slots[1] = index
+				elif code and slots[0] < 0:
+					slots[0] = index
+				elif code and slots[1] < 0:
+					slots[1] = index
+	return table
+
+
+_SLOT_TABLE = _slot_table()
+
+
+def _header_bytes(metadata: Dict[str, Any]) -> bytes:
+	"""MAGIC, uint32 length and JSON metadata, padded so records are 8-byte aligned."""
+	body = json.dumps(metadata).encode("utf-8")
+	pad = -(len(MAGIC) + 4 + len(body)) % 8
+	body += b" " * pad
+	return MAGIC + struct.pack("<I", len(body)) + body
+
+
+class LandmarkRecorder:
+	"""Append timestamped detector output to a compact binary session file.
+
+	Layout: an 8-byte magic, a uint32 length and a JSON metadata header,
+	followed by fixed-size records (`RECORD_DTYPE`): a float64 timestamp
+	(seconds since the recorder was created unless given), a handedness code
+	per hand and the landmarks as float32. Hands are stored in detector
+	order, up to `NUM_HANDS`, so a replay reproduces the exact
+	`HandLandmarks` lists. Records are written in batches of `batch_size`;
+	`close` flushes the rest.
+
+	The header's `coordinates` key records how x and y are expressed:
+	"normalized" (the default, as MediaPipe reports them: fractions of the
+	frame width and height) or "pixel" (e.g. `SyntheticHandStream`).
+	"""
+
+	def __init__(self, path: Path, metadata: Optional[Dict[str, Any]] = None, batch_size: int = 256):
+		self.path = Path(path)
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		header = {"format": 1, "created": time.time(), "coordinates": "normalized", **(metadata or {})}
+		self._file = self.path.open("wb")
+		self._file.write(_header_bytes(header))
+		self._buffer = np.zeros(batch_size, dtype=RECORD_DTYPE)
+		self._pending = 0
+		self._start = time.monotonic()
+		self.written = 0
+
+	def write(self, hands: List[HandLandmarks], timestamp: Optional[float] = None) -> None:
+		record = self._buffer[self._pending]
+		record["timestamp"] = time.monotonic() - self._start if timestamp is None else timestamp
+		record["handedness"] = 0
+		for slot, hand in enumerate(hands[:NUM_HANDS]):
+			if len(hand.landmarks) != NUM_LANDMARKS:
+				continue
+			record["handedness"][slot] = HANDEDNESS_CODES.get(hand.handedness, HANDEDNESS_CODES[None])
+			record["landmarks"][slot] = hand.landmarks
+		self._pending += 1
+		self.written += 1
+		if self._pending == len(self._buffer):
+			self.flush()
+
+	def flush(self) -> None:
+		if self._pending:
+			self._file.write(self._buffer[: self._pending].tobytes())
+			self._pending = 0
+		self._file.flush()
+
+	def close(self) -> None:
+		if not self._file.closed:
+			self.flush()
+			self._file.close()
+
+	def __enter__(self) -> "LandmarkRecorder":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
+
+
+class LandmarkSession:
+	"""Read-only, memory-mapped view of a recorded session.
+
+	Supports `len`, indexing (`session.hands(i)`) and iteration over
+	`(timestamp, hands)`. A truncated trailing record (e.g. after a crash)
+	is ignored.
+	"""
+
+	def __init__(self, path: Path):
+		self.path = Path(path)
+		with self.path.open("rb") as f:
+			if f.read(len(MAGIC)) != MAGIC:
+				raise ValueError(f"{self.path} is not a landmark session file")
+			(length,) = struct.unpack("<I", f.read(4))
+			self.metadata: Dict[str, Any] = json.loads(f.read(length).decode("utf-8"))
+		offset = len(MAGIC) + 4 + length
+		count = (self.path.stat().st_size - offset) // RECORD_DTYPE.itemsize
+		if count > 0:
+			self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=offset, shape=(count,))
+		else:
+			self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+	def __len__(self) -> int:
+		return len(self.records)
+
+	@property
+	def timestamps(self) -> np.ndarray:
+		return self.records["timestamp"]
+
+	@property
+	def normalized(self) -> bool:
+		"""True if x and y are fractions of the frame size."""
+		# Sessions written before the key existed always came from the detector.
+		return self.metadata.get("coordinates", "normalized") == "normalized"
+
+	@property
+	def duration(self) -> float:
+		return float(self.timestamps[-1] - self.timestamps[0]) if len(self) else 0.0
+
+	def hands(self, index: int) -> List[HandLandmarks]:
+		record = self.records[index]
+		hands = []
+		for code, points in zip(record["handedness"].tolist(), record["landmarks"]):
+			if code:
+				# A float32 view into the session: replay copies no landmarks.
+				hands.append(HandLandmarks(landmarks=points, handedness=_HANDEDNESS_NAMES[code]))
+		return hands
+
+	def __iter__(self) -> Iterator[Tuple[float, List[HandLandmarks]]]:
+		for i in range(len(self)):
+			yield float(self.records[i]["timestamp"]), self.hands(i)
+
+	def feature_matrix(self, dtype=np.float32) -> np.ndarray:
+		"""(N, 126) features of every record, without building HandLandmarks."""
+		codes = self.records["handedness"]
+		source = _SLOT_TABLE[codes[:, 0], codes[:, 1]]
+		points = np.take_along_axis(self.records["landmarks"], np.maximum(source, 0)[:, :, None, None], axis=1)
+		return landmarks_to_feature_matrix(points, source >= 0, dtype=dtype)
+
+
+class ReplaySource:
+	"""Feed a recorded session back through the pipeline.
+
+	- speed: None replays as fast as the consumer pulls; otherwise the
+	  recorded timing is kept, scaled by `speed` (2.0 = twice real time)
+	- loop: start over at the end instead of stopping
+
+	Iterating yields `(timestamp, hands)` like `LandmarkSession`.
+	"""
+
+	def __init__(self, session: LandmarkSession, speed: Optional[float] = None, loop: bool = False):
+		self.session = session
+		self.speed = speed
+		self.loop = loop
+
+	def __iter__(self) -> Iterator[Tuple[float, List[HandLandmarks]]]:
+		while True:
+			start = time.perf_counter()
+			first: Optional[float] = None
+			for timestamp, hands in self.session:
+				if self.speed:
+					first = timestamp if first is None else first
+					delay = (timestamp - first) / self.speed - (time.perf_counter() - start)
+					if delay > 0:
+						time.sleep(delay)
+				yield timestamp, hands
+			if not self.loop or not len(self.session):
+				return
+
+
+def render_hands(hands: List[HandLandmarks], width: int = 640, height: int = 480, normalized: bool = True) -> np.ndarray:
+	"""Draw landmarks on a blank BGR canvas, for displaying replayed sessions.
+
+	With `normalized` (MediaPipe output) x and y are scaled by `width` and
+	`height`; otherwise they are drawn as pixel coordinates.
+	"""
+	import cv2
+
+	canvas = np.zeros((height, width, 3), dtype=np.uint8)
+	sx, sy = (width, height) if normalized else (1, 1)
+	for hand in hands:
+		color = (255, 0, 255) if hand.handedness == "Left" else (20, 180, 90)
+		for x, y, _ in hand.landmarks:
+			cv2.circle(canvas, (int(x * sx), int(y * sy)), 3, color, -1)
+	return canvas
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .classifier import load_model_bundle
+
+
+LATEST = "LATEST"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+	tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+	tmp.write_text(text)
+	os.replace(tmp, path)
+
+
+def _sha256(path: Path) -> str:
+	digest = hashlib.sha256()
+	with path.open("rb") as f:
+		for block in iter(lambda: f.read(1 << 20), b""):
+			digest.update(block)
+	return digest.hexdigest()
+
+
+class ModelRegistry:
+	"""Directory of immutable, numbered model artifacts with a LATEST pointer.
+
+	Layout:
+	- versions/v0001.joblib, versions/v0001.json (published time, source, sha256)
+	- LATEST: name of the version to serve
+
+	Artifacts are copied in under a temporary name and renamed, and LATEST is
+	replaced atomically, so readers never see a partial file. Published
+	versions are never modified; roll back by pointing LATEST at an older one.
+	"""
+
+	def __init__(self, root: Path):
+		self.root = Path(root)
+		self.versions_dir = self.root / "versions"
+		self.versions_dir.mkdir(parents=True, exist_ok=True)
+
+	def versions(self) -> List[str]:
+		"""Published versions, oldest first (numeric order, so v10000 follows v9999)."""
+		names = (p.stem for p in self.versions_dir.glob("v*.joblib"))
+		return sorted((name for name in names if name[1:].isdigit()), key=lambda v: int(v[1:]))
+
+	def path(self, version: str) -> Path:
+		return self.versions_dir / f"{version}.joblib"
+
+	def info(self, version: str) -> Dict[str, Any]:
+		meta = self.versions_dir / f"{version}.json"
+		return json.loads(meta.read_text()) if meta.exists() else {}
+
+	def latest(self) -> Optional[str]:
+		try:
+			version = (self.root / LATEST).read_text().strip()
+		except FileNotFoundError:
+			return None
+		return version or None
+
+	def set_latest(self, version: str) -> None:
+		if not self.path(version).exists():
+			raise FileNotFoundError(f"No such model version: {version}")
+		_write_atomic(self.root / LATEST, version + "\n")
+
+	def publish(self, artifact: Path, make_latest: bool = True) -> str:
+		"""Copy a saved model into the registry as the next version."""
+		artifact = Path(artifact)
+		tmp = self.versions_dir / f".publish.{os.getpid()}.tmp"
+		shutil.copyfile(artifact, tmp)
+		try:
+			while True:
+				existing = self.versions()
+				version = f"v{int(existing[-1][1:]) + 1 if existing else 1:04d}"
+				target = self.path(version)
+				try:
+					# link() fails if a concurrent publisher took this number.
+					os.link(tmp, target)
+					break
+				except FileExistsError:
+					continue
+		finally:
+			tmp.unlink()
+		meta = {"version": version, "published": time.time(), "source": str(artifact), "sha256": _sha256(target)}
+		_write_atomic(self.versions_dir / f"{version}.json", json.dumps(meta, indent=1))
+		if make_latest:
+			self.set_latest(version)
+		return version
+
+	def load(self, version: Optional[str] = None, mmap_mode: Optional[str] = "c") -> "LoadedModel":
+		"""Load `version` (default: LATEST), memory-mapped (copy-on-write) unless `mmap_mode` is None."""
+		version = version or self.latest()
+		if version is None:
+			raise FileNotFoundError(f"No model published in {self.root}")
+		predictor, info = load_model_bundle(self.path(version), mmap_mode=mmap_mode)
+		return LoadedModel(version, predictor, info)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+	"""A predictor together with its registry version and saved metadata."""
+	version: str
+	predictor: Any
+	info: Dict[str, Any] = field(default_factory=dict)
+
+	@property
+	def classes_(self):
+		return self.predictor.classes_
+
+	def predict_proba(self, X):
+		return self.predictor.predict_proba(X)
+
+
+class HotSwapModel:
+	"""Serve the registry's LATEST model and switch when a new one is published.
+
+	A watcher thread polls LATEST every `poll_interval` seconds and loads a
+	new version in the background (memory-mapped by default, so its arrays
+	are paged in from the file rather than copied). It then replaces the
+	current model with a single reference assignment. In-flight predictions
+	finish on the model they started with and no frame waits for a load. The
+	old model is freed once its last user drops it.
+
+	Take `current` once per frame and use that snapshot for both
+	`predict_proba` and `classes_`; the `predict_proba`/`classes_` shortcuts
+	on this object each read the latest model. `version_changed` callbacks
+	run on the watcher thread with the new `LoadedModel`.
+	"""
+
+	def __init__(self, registry: ModelRegistry, poll_interval: float = 2.0, mmap_mode: Optional[str] = "c"):
+		self.registry = registry
+		self.poll_interval = poll_interval
+		self.mmap_mode = mmap_mode
+		self.current: LoadedModel = registry.load(mmap_mode=mmap_mode)
+		self.swaps = 0
+		self.last_error: Optional[BaseException] = None
+		self.version_changed: List[Callable[[LoadedModel], None]] = []
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def version(self) -> str:
+		return self.current.version
+
+	@property
+	def classes_(self):
+		return self.current.classes_
+
+	def predict_proba(self, X):
+		return self.current.predict_proba(X)
+
+	def check(self) -> bool:
+		"""Load and swap in LATEST if it changed; return True on a swap."""
+		latest = self.registry.latest()
+		if latest is None or latest == self.current.version:
+			return False
+		try:
+			model = self.registry.load(latest, mmap_mode=self.mmap_mode)
+		except Exception as exc:
+			# Keep serving the current model; retry on the next poll.
+			self.last_error = exc
+			return False
+		self.current = model
+		self.swaps += 1
+		self.last_error = None
+		for callback in self.version_changed:
+			callback(model)
+		return True
+
+	def _watch(self) -> None:
+		while not self._stop.wait(self.poll_interval):
+			self.check()
+
+	def start(self) -> "HotSwapModel":
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+			self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join(timeout=self.poll_interval + 1.0)
+			self._thread = None
+
+	def __enter__(self) -> "HotSwapModel":
+		return self.start()
+
+	def __exit__(self, *exc) -> None:
+		self.stop()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+_END = object()
+
+
+class LatestFrameBuffer:
+	"""Single-slot, latest-frame-wins buffer between capture and processing.
+
+	The producer never blocks: a frame that has not been taken yet is simply
+	replaced (and counted in `dropped`). The consumer always gets the newest
+	frame, so a slow downstream stage adds no queueing latency.
+	"""
+
+	def __init__(self):
+		self._cond = threading.Condition()
+		self._frame: Any = None
+		self._seq = 0
+		self._taken = 0
+		self._closed = False
+		self.dropped = 0
+
+	def put(self, frame: Any) -> None:
+		with self._cond:
+			if self._seq > self._taken:
+				self.dropped += 1
+			self._frame = frame
+			self._seq += 1
+			self._cond.notify()
+
+	def get(self, timeout: Optional[float] = None) -> Any:
+		"""Return the newest unseen frame, or `_END` once closed and drained."""
+		with self._cond:
+			if not self._cond.wait_for(lambda: self._seq > self._taken or self._closed, timeout):
+				raise queue.Empty
+			if self._seq == self._taken:
+				return _END
+			self._taken = self._seq
+			frame, self._frame = self._frame, None
+			return frame
+
+	def close(self) -> None:
+		with self._cond:
+			self._closed = True
+			self._cond.notify_all()
+
+
+class StagePipeline:
+	"""Run capture and processing stages on separate threads.
+
+	- read_frame: returns (ok, frame) like `cv2.VideoCapture.read`; runs on a
+	  capture thread that feeds a `LatestFrameBuffer`
+	- stages: callables applied in order, each on its own thread, connected
+	  by bounded queues of `queue_size`
+
+	Iterating the pipeline yields the output of the last stage on the calling
+	thread, which is where rendering (e.g. `cv2.imshow`) should happen.
+	Throughput approaches that of the slowest stage instead of their sum.
+	"""
+
+	def __init__(
+		self,
+		read_frame: Callable[[], Tuple[bool, Any]],
+		stages: Sequence[Callable[[Any], Any]],
+		queue_size: int = 2,
+	):
+		self._read_frame = read_frame
+		self._stages = list(stages)
+		self._frames = LatestFrameBuffer()
+		self._queues: List["queue.Queue"] = [queue.Queue(maxsize=queue_size) for _ in self._stages]
+		self._stop = threading.Event()
+		self._threads: List[threading.Thread] = []
+		self._error: BaseException | None = None
+
+	@property
+	def dropped_frames(self) -> int:
+		return self._frames.dropped
+
+	def start(self) -> "StagePipeline":
+		self._threads.append(threading.Thread(target=self._capture_loop, name="capture", daemon=True))
+		for index, stage in enumerate(self._stages):
+			self._threads.append(threading.Thread(
+				target=self._stage_loop, args=(index, stage), name=f"stage-{index}", daemon=True
+			))
+		for thread in self._threads:
+			thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		self._frames.close()
+		for thread in self._threads:
+			thread.join(timeout=1.0)
+
+	def _put(self, q: "queue.Queue", item: Any) -> bool:
+		while not self._stop.is_set():
+			try:
+				q.put(item, timeout=0.05)
+				return True
+			except queue.Full:
+				continue
+		return False
+
+	def _capture_loop(self) -> None:
+		try:
+			while not self._stop.is_set():
+				ok, frame = self._read_frame()
+				if not ok:
+					break
+				self._frames.put(frame)
+		except BaseException as exc:
+			self._error = exc
+		finally:
+			self._frames.close()
+
+	def _next_input(self, index: int) -> Any:
+		while not self._stop.is_set():
+			try:
+				if index == 0:
+					return self._frames.get(timeout=0.05)
+				return self._queues[index - 1].get(timeout=0.05)
+			except queue.Empty:
+				continue
+		return _END
+
+	def _stage_loop(self, index: int, stage: Callable[[Any], Any]) -> None:
+		out = self._queues[index]
+		try:
+			while True:
+				item = self._next_input(index)
+				if item is _END:
+					break
+				if not self._put(out, stage(item)):
+					return
+		except BaseException as exc:
+			self._error = exc
+		self._put(out, _END)
+
+	def __iter__(self) -> Iterator[Any]:
+		out = self._queues[-1]
+		while not self._stop.is_set():
+			try:
+				item = out.get(timeout=0.05)
+			except queue.Empty:
+				continue
+			if item is _END:
+				break
+			yield item
+		if self._error is not None:
+			raise RuntimeError("Pipeline stage failed") from self._error
+
+	def __enter__(self) -> "StagePipeline":
+		return self.start()
+
+	def __exit__(self, *exc) -> None:
+		self.stop()
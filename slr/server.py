@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .features import FEATURE_SIZE
+from .temporal import SlidingWindowFeatures
+from .text_buffer import ProbabilityWindowDecoder, TemporalLabelSmoother, TextBuilder, ViterbiLabelDecoder
+
+
+logger = logging.getLogger(__name__)
+
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(value: str) -> Address:
+	"""`unix:/path/to.sock` or a bare path -> socket path; `host:port` -> (host, port)."""
+	if value.startswith("unix:"):
+		return value[len("unix:"):]
+	host, sep, port = value.rpartition(":")
+	if sep and port.isdigit():
+		return (host or "127.0.0.1", int(port))
+	return value
+
+
+@dataclass
+class _Session:
+	decoder: Any
+	text_builder: TextBuilder
+	temporal: Optional[SlidingWindowFeatures]
+	last_seen: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Pending:
+	session: _Session
+	features: np.ndarray
+	future: "asyncio.Future"
+	predictor: Any
+
+
+class InferenceServer:
+	"""Serve a model bundle to many clients with micro-batched prediction.
+
+	Requests from all connections are queued; the batcher takes the first
+	one, waits up to `batch_window` seconds (or until `max_batch` requests)
+	for more and runs a single `predict_proba` over the batch in a worker
+	thread. A larger window raises throughput under load at the cost of up
+	to `batch_window` extra latency; 0 only batches what is already queued.
+
+	Smoothing (`decoder`: vote, prob or viterbi), phrase building and the
+	temporal window of models trained with `--window` are kept per session
+	on the server; sessions idle for `session_timeout` seconds are dropped.
+
+	Protocol: one JSON object per line in each direction.
+	- {"session": "s1", "features": [126 floats], "id": 7} ->
+	  {"id": 7, "label": ..., "confidence": ..., "stable": ..., "phrase": ...}
+	- {"session": "s1", "reset": true} -> {"id": null, "reset": true}
+	A malformed request, or one the model fails on, gets
+	{"id": ..., "error": "..."} and the connection stays open.
+
+	`use_model` (or `use_model_threadsafe` from another thread, e.g. a
+	`HotSwapModel` callback) switches models between batches; requests
+	already queued finish on the model they were prepared for.
+	"""
+
+	def __init__(
+		self,
+		predictor: Any,
+		info: Optional[Dict[str, Any]] = None,
+		batch_window: float = 0.002,
+		max_batch: int = 64,
+		decoder: str = "vote",
+		session_timeout: float = 300.0,
+	):
+		self.predictor = predictor
+		self.classes = [str(c) for c in predictor.classes_]
+		self.window = (info or {}).get("feature_window")
+		self.batch_window = batch_window
+		self.max_batch = max_batch
+		self.decoder = decoder
+		self.session_timeout = session_timeout
+		self.batches = 0
+		self.requests = 0
+		self._sessions: Dict[str, _Session] = {}
+		self._queue: Optional[asyncio.Queue] = None
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+	@property
+	def mean_batch_size(self) -> float:
+		return self.requests / self.batches if self.batches else 0.0
+
+	def use_model(self, predictor: Any, info: Optional[Dict[str, Any]] = None) -> None:
+		"""Serve `predictor` from the next request on.
+
+		Sessions are kept unless the labels or the temporal window change,
+		in which case their smoothing state no longer applies.
+		"""
+		classes = [str(c) for c in predictor.classes_]
+		window = (info or {}).get("feature_window")
+		if classes != self.classes or window != self.window:
+			self._sessions.clear()
+		self.predictor, self.classes, self.window = predictor, classes, window
+
+	def use_model_threadsafe(self, predictor: Any, info: Optional[Dict[str, Any]] = None) -> None:
+		if self._loop is None:
+			self.use_model(predictor, info)
+		else:
+			self._loop.call_soon_threadsafe(self.use_model, predictor, info)
+
+	def _new_decoder(self):
+		if self.decoder == "prob":
+			return ProbabilityWindowDecoder(self.classes)
+		if self.decoder == "viterbi":
+			return ViterbiLabelDecoder(self.classes)
+		return TemporalLabelSmoother()
+
+	def _session(self, session_id: str) -> _Session:
+		session = self._sessions.get(session_id)
+		if session is None:
+			temporal = SlidingWindowFeatures(self.window) if self.window else None
+			session = self._sessions[session_id] = _Session(self._new_decoder(), TextBuilder(), temporal)
+		session.last_seen = time.monotonic()
+		return session
+
+	def reset(self, session_id: str) -> None:
+		self._sessions.pop(session_id, None)
+
+	async def classify(self, session_id: str, features: Sequence[float]) -> Dict[str, Any]:
+		"""Queue one frame of `session_id` and wait for its batched result."""
+		feat = np.asarray(features, dtype=np.float64)
+		if feat.shape != (FEATURE_SIZE,):
+			raise ValueError(f"Expected {FEATURE_SIZE} features, got {feat.shape}")
+		session = self._session(session_id)
+		if not feat.any():
+			if session.temporal is not None:
+				session.temporal.reset()
+			return {"label": None, "confidence": 0.0, "stable": None, "phrase": None}
+		if session.temporal is not None:
+			# Copy: push returns a buffer that is reused by the next push.
+			feat = session.temporal.push(feat).copy()
+		future = asyncio.get_running_loop().create_future()
+		await self._queue.put(_Pending(session, feat, future, self.predictor))
+		return await future
+
+	async def _next_batch(self) -> List[_Pending]:
+		loop = asyncio.get_running_loop()
+		batch = [await self._queue.get()]
+		deadline = loop.time() + self.batch_window
+		while len(batch) < self.max_batch:
+			try:
+				batch.append(self._queue.get_nowait())
+				continue
+			except asyncio.QueueEmpty:
+				pass
+			timeout = deadline - loop.time()
+			if timeout <= 0:
+				break
+			try:
+				batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+			except asyncio.TimeoutError:
+				break
+		return batch
+
+	async def _batch_loop(self) -> None:
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = await self._next_batch()
+			# Normally one group; more only right after a model switch.
+			for predictor, group in groupby(batch, key=lambda item: item.predictor):
+				await self._predict(loop, predictor, list(group))
+
+	async def _predict(self, loop: asyncio.AbstractEventLoop, predictor: Any, batch: List[_Pending]) -> None:
+		X = np.stack([item.features for item in batch])
+		try:
+			proba = await loop.run_in_executor(None, predictor.predict_proba, X)
+		except Exception as exc:
+			for item in batch:
+				if not item.future.done():
+					item.future.set_exception(exc)
+			return
+		self.batches += 1
+		self.requests += len(batch)
+		classes = [str(c) for c in predictor.classes_]
+		# Results are applied in arrival order, so each session's
+		# smoother sees its frames in sequence.
+		for item, row in zip(batch, proba):
+			idx = int(np.argmax(row))
+			label = classes[idx]
+			session = item.session
+			stable = session.decoder.push(label) if self.decoder == "vote" else session.decoder.push(row)
+			phrase = session.text_builder.push_label(stable) if stable else None
+			if not item.future.done():
+				item.future.set_result({"label": label, "confidence": float(row[idx]), "stable": stable, "phrase": phrase})
+
+	async def _expire_loop(self) -> None:
+		while True:
+			await asyncio.sleep(max(self.session_timeout / 4, 1.0))
+			cutoff = time.monotonic() - self.session_timeout
+			for session_id in [s for s, state in self._sessions.items() if state.last_seen < cutoff]:
+				del self._sessions[session_id]
+
+	async def _respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+		request_id = request.get("id")
+		session_id = str(request.get("session", "default"))
+		try:
+			if request.get("reset"):
+				self.reset(session_id)
+				return {"id": request_id, "reset": True}
+			result = await self.classify(session_id, request["features"])
+		except (KeyError, TypeError, ValueError) as exc:
+			return {"id": request_id, "error": str(exc)}
+		except Exception as exc:
+			# A failing model (e.g. a bad hot-swapped version) must not drop the connection.
+			logger.exception("Request %r failed", request_id)
+			return {"id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+		return {"id": request_id, **result}
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				try:
+					request = json.loads(line)
+				except json.JSONDecodeError as exc:
+					response = {"id": None, "error": f"Invalid JSON: {exc}"}
+				else:
+					if not isinstance(request, dict):
+						response = {"id": None, "error": f"Expected a JSON object, got {type(request).__name__}"}
+					else:
+						response = await self._respond(request)
+				writer.write(json.dumps(response).encode() + b"\n")
+				await writer.drain()
+		except ConnectionError:
+			pass
+		finally:
+			writer.close()
+
+	async def serve(self, address: Address) -> None:
+		"""Listen on a Unix socket path or a (host, port) pair until cancelled."""
+		self._queue = asyncio.Queue()
+		self._loop = asyncio.get_running_loop()
+		if isinstance(address, tuple):
+			server = await asyncio.start_server(self._handle, *address)
+		else:
+			Path(address).unlink(missing_ok=True)
+			server = await asyncio.start_unix_server(self._handle, address)
+		tasks = [asyncio.create_task(self._batch_loop()), asyncio.create_task(self._expire_loop())]
+		try:
+			async with server:
+				await server.serve_forever()
+		finally:
+			for task in tasks:
+				task.cancel()
+			if not isinstance(address, tuple):
+				Path(address).unlink(missing_ok=True)
+
+
+class InferenceClient:
+	"""Blocking client for `InferenceServer`, one session per client.
+
+	`classify` sends a feature vector and waits for its result; the server
+	batches requests from many clients together.
+	"""
+
+	def __init__(self, address: Address, session: Optional[str] = None, timeout: Optional[float] = 5.0):
+		if isinstance(address, tuple):
+			self._sock = socket.create_connection(address, timeout=timeout)
+			self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		else:
+			self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+			self._sock.settimeout(timeout)
+			self._sock.connect(str(address))
+		self._file = self._sock.makefile("rb")
+		self.session = session or uuid.uuid4().hex
+		self._next_id = 0
+
+	def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+		self._next_id += 1
+		request["id"] = self._next_id
+		self._sock.sendall(json.dumps(request).encode() + b"\n")
+		line = self._file.readline()
+		if not line:
+			raise ConnectionError("Server closed the connection")
+		response = json.loads(line)
+		if "error" in response:
+			raise ValueError(response["error"])
+		return response
+
+	def classify(self, features: Sequence[float]) -> Dict[str, Any]:
+		return self._call({"session": self.session, "features": [float(x) for x in features]})
+
+	def reset(self) -> None:
+		self._call({"session": self.session, "reset": True})
+
+	def close(self) -> None:
+		self._file.close()
+		self._sock.close()
+
+	def __enter__(self) -> "InferenceClient":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
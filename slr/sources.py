@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp"}
+
+
+def list_image_frames(directory: Path) -> List[Path]:
+	"""Return the image files of a frame directory in lexical (frame) order."""
+	return sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def probe_source(path: Path) -> Tuple[int, float]:
+	"""Return (frame_count, fps) for a video file or frame directory.
+
+	Frame directories report fps 0.0; video frame counts come from container
+	metadata and may be approximate.
+	"""
+	path = Path(path)
+	if path.is_dir():
+		return len(list_image_frames(path)), 0.0
+	capture = cv2.VideoCapture(str(path))
+	try:
+		if not capture.isOpened():
+			raise IOError(f"Cannot open video source: {path}")
+		return int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), float(capture.get(cv2.CAP_PROP_FPS))
+	finally:
+		capture.release()
+
+
+def iter_frames(path: Path, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, object]]:
+	"""Yield (frame_index, BGR frame) for frames [start, stop) of a source.
+
+	`path` is either a video file or a directory of image frames. With
+	`stop=None` frames are read until the source ends.
+
+	Videos seek to `start` with `CAP_PROP_POS_FRAMES`. Seeking is
+	approximate for some codecs and containers (e.g. variable frame rate
+	or files without a seek index): the first frame read may be a few
+	frames away from `start`, so indices near segment boundaries can be
+	off by a few frames.
+	"""
+	path = Path(path)
+	if path.is_dir():
+		frames = list_image_frames(path)[start:stop]
+		for index, frame_path in enumerate(frames, start=start):
+			frame = cv2.imread(str(frame_path))
+			if frame is not None:
+				yield index, frame
+		return
+	capture = cv2.VideoCapture(str(path))
+	try:
+		if not capture.isOpened():
+			raise IOError(f"Cannot open video source: {path}")
+		if start:
+			capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+		index = start
+		while stop is None or index < stop:
+			ret, frame = capture.read()
+			if not ret:
+				break
+			yield index, frame
+			index += 1
+	finally:
+		capture.release()
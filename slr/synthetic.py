@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .features import NUM_LANDMARKS, landmarks_to_feature_vector
+from .landmarks import HandLandmarks
+
+
+# Finger base direction (radians from the wrist's "up") and bone lengths
+# (relative to palm size) for thumb, index, middle, ring and pinky. Each
+# finger contributes 4 landmarks in MediaPipe order after the wrist.
+_FINGER_ANGLES = np.radians([-55.0, -18.0, 0.0, 16.0, 32.0])
+_BONE_LENGTHS = np.array([
+	[0.35, 0.32, 0.26, 0.22],
+	[0.95, 0.40, 0.24, 0.20],
+	[0.95, 0.45, 0.28, 0.22],
+	[0.90, 0.42, 0.26, 0.20],
+	[0.85, 0.32, 0.20, 0.18],
+])
+_MAX_BEND = np.radians(80.0)
+
+
+def _hand_pose(curls: np.ndarray) -> np.ndarray:
+	"""Canonical (21, 3) right-hand landmarks for per-finger curls in [0, 1]."""
+	points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float64)
+	for finger in range(5):
+		angle = _FINGER_ANGLES[finger]
+		pos = np.zeros(3)
+		for joint in range(4):
+			if joint > 0:
+				angle += curls[finger] * _MAX_BEND
+			length = _BONE_LENGTHS[finger, joint]
+			pos = pos + length * np.array([np.sin(angle), -np.cos(angle), -0.15 * curls[finger] * joint])
+			points[1 + 4 * finger + joint] = pos
+	return points
+
+
+class SyntheticHandStream:
+	"""Plausible MediaPipe-like hand landmark frames without a camera.
+
+	Each label gets a fixed hand shape (per-finger curls) for one or two
+	hands. Frames are produced in runs of `segment_frames` per label, with
+	the hands drifting across a `width` x `height` frame, slowly rotating and
+	changing size, plus per-landmark jitter of `noise` pixels. With
+	`drop_rate` > 0 a hand is occasionally missing, as with real detection.
+
+	Iterating yields `(hands, label)` where `hands` is a list of
+	`HandLandmarks` in pixel coordinates.
+	"""
+
+	def __init__(
+		self,
+		labels: Sequence[str] = ("HELLO", "THANKS", "YES", "NO"),
+		two_hands: bool = True,
+		segment_frames: int = 30,
+		noise: float = 1.5,
+		drop_rate: float = 0.0,
+		width: int = 640,
+		height: int = 480,
+		seed: int = 0,
+	):
+		self.labels = list(labels)
+		self.two_hands = two_hands
+		self.segment_frames = segment_frames
+		self.noise = noise
+		self.drop_rate = drop_rate
+		self.width = width
+		self.height = height
+		self._rng = np.random.default_rng(seed)
+		n_hands = 2 if two_hands else 1
+		self._shapes = {
+			label: [_hand_pose(self._rng.uniform(0.0, 1.0, 5)) for _ in range(n_hands)]
+			for label in self.labels
+		}
+
+	def _place(self, pose: np.ndarray, center: np.ndarray, size: float, angle: float, mirror: bool) -> np.ndarray:
+		points = pose.copy()
+		if mirror:
+			points[:, 0] = -points[:, 0]
+		c, s = np.cos(angle), np.sin(angle)
+		rot = np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+		points = points @ rot.T * size
+		points[:, :2] += center
+		points[:, :2] += self._rng.normal(0.0, self.noise, (NUM_LANDMARKS, 2))
+		return points
+
+	def frames(self, n_frames: int) -> Iterator[Tuple[List[HandLandmarks], str]]:
+		rng = self._rng
+		center = np.array([self.width / 2, self.height / 2])
+		velocity = np.zeros(2)
+		size = 0.25 * self.height
+		angle = 0.0
+		for i in range(n_frames):
+			label = self.labels[(i // self.segment_frames) % len(self.labels)]
+			velocity = 0.9 * velocity + rng.normal(0.0, 1.5, 2)
+			center = np.clip(center + velocity, [0.3 * self.width, 0.3 * self.height], [0.7 * self.width, 0.7 * self.height])
+			size = float(np.clip(size * (1.0 + rng.normal(0.0, 0.01)), 0.15 * self.height, 0.35 * self.height))
+			angle = float(np.clip(angle + rng.normal(0.0, 0.01), -0.4, 0.4))
+			hands = []
+			for slot, pose in enumerate(self._shapes[label]):
+				if self.drop_rate and rng.random() < self.drop_rate:
+					continue
+				offset = np.array([(slot - 0.5) * 1.5 * size, 0.0]) if self.two_hands else 0.0
+				points = self._place(pose, center + offset, size, angle, mirror=slot == 0)
+				handedness = "Left" if slot == 0 and self.two_hands else "Right"
+				hands.append(HandLandmarks(landmarks=points, handedness=handedness))
+			yield hands, label
+
+	def __iter__(self) -> Iterator[Tuple[List[HandLandmarks], str]]:
+		while True:
+			yield from self.frames(self.segment_frames * len(self.labels))
+
+
+def synthetic_feature_dataset(
+	n_labels: int = 10,
+	n_per_label: int = 200,
+	seed: int = 0,
+	**stream_kwargs,
+) -> Tuple[np.ndarray, np.ndarray]:
+	"""Feature matrix (float64) and label array from a `SyntheticHandStream`."""
+	labels = [f"SIGN_{i}" for i in range(n_labels)]
+	stream = SyntheticHandStream(labels, segment_frames=n_per_label, seed=seed, **stream_kwargs)
+	X: List[List[float]] = []
+	y: List[str] = []
+	for hands, label in stream.frames(n_labels * n_per_label):
+		feat = landmarks_to_feature_vector(hands)
+		if feat and any(feat):
+			X.append(feat)
+			y.append(label)
+	return np.asarray(X, dtype=np.float64), np.asarray(y)
+
+
+def synthetic_hand_frames(n_frames: int, seed: Optional[int] = 0, **stream_kwargs) -> List[List[HandLandmarks]]:
+	"""Materialize `n_frames` of synthetic hands (labels discarded)."""
+	stream = SyntheticHandStream(seed=seed, **stream_kwargs)
+	return [hands for hands, _ in stream.frames(n_frames)]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# Blocks per frame: current, window mean, velocity, window displacement
+NUM_BLOCKS = 4
+
+
+def windowed_feature_size(frame_size: int) -> int:
+	return NUM_BLOCKS * frame_size
+
+
+class SlidingWindowFeatures:
+	"""Streaming temporal features over the last `window` frame vectors.
+
+	Each `push` returns [current, mean, velocity, displacement] where
+	- mean: average of the frames currently in the window
+	- velocity: current - previous frame (zeros for the first frame)
+	- displacement: current - oldest frame in the window
+
+	A ring buffer and a running sum keep every update O(frame_size),
+	independent of the window length. Call `reset` when the hands disappear
+	so a new gesture does not inherit motion from the previous one.
+	"""
+
+	def __init__(self, window: int = 8, frame_size: int = 126):
+		if window < 1:
+			raise ValueError("window must be >= 1")
+		self.window = window
+		self.frame_size = frame_size
+		self._ring = np.zeros((window, frame_size), dtype=np.float64)
+		self._sum = np.zeros(frame_size, dtype=np.float64)
+		self._out = np.zeros(windowed_feature_size(frame_size), dtype=np.float64)
+		self._count = 0
+		self._head = 0
+
+	def reset(self) -> None:
+		self._sum[:] = 0.0
+		self._count = 0
+		self._head = 0
+
+	def push(self, frame: Sequence[float]) -> np.ndarray:
+		"""Add a frame vector and return the windowed feature vector.
+
+		The returned array is reused by the next call; copy it to keep it.
+		"""
+		frame = np.asarray(frame, dtype=np.float64)
+		size = self.frame_size
+		prev = self._ring[(self._head - 1) % self.window] if self._count else frame
+		if self._count == self.window:
+			self._sum -= self._ring[self._head]
+		else:
+			self._count += 1
+		out = self._out
+		# velocity needs the previous frame before its slot can be overwritten
+		np.subtract(frame, prev, out=out[2 * size:3 * size])
+		self._ring[self._head] = frame
+		self._sum += frame
+		self._head = (self._head + 1) % self.window
+		oldest = self._ring[self._head] if self._count == self.window else self._ring[0]
+		out[:size] = frame
+		np.divide(self._sum, self._count, out=out[size:2 * size])
+		np.subtract(frame, oldest, out=out[3 * size:])
+		return out
+
+
+def segment_ids_from_labels(labels: Sequence[str]) -> np.ndarray:
+	"""Number runs of consecutive equal labels; each run is one recording."""
+	labels = np.asarray(labels)
+	if len(labels) == 0:
+		return np.zeros(0, dtype=np.int64)
+	changes = np.concatenate([[0], (labels[1:] != labels[:-1]).astype(np.int64)])
+	return np.cumsum(changes)
+
+
+def windowed_feature_matrix(
+	features: np.ndarray,
+	window: int,
+	segment_ids: Optional[np.ndarray] = None,
+) -> np.ndarray:
+	"""Batch equivalent of running `SlidingWindowFeatures` over each segment.
+
+	- features: (N, D) frame vectors in capture order
+	- segment_ids: (N,) ids of contiguous recordings; the window restarts at
+	  each new id (default: one segment)
+	- Returns an (N, 4 * D) float32 matrix
+	"""
+	X = np.asarray(features, dtype=np.float64)
+	n, d = X.shape
+	if segment_ids is None:
+		segment_ids = np.zeros(n, dtype=np.int64)
+	segment_ids = np.asarray(segment_ids)
+	idx = np.arange(n)
+	starts = np.zeros(n, dtype=np.int64)
+	if n:
+		boundary = np.concatenate([[True], segment_ids[1:] != segment_ids[:-1]])
+		starts = np.maximum.accumulate(np.where(boundary, idx, 0))
+	first = np.maximum(starts, idx - window + 1)
+	csum = np.concatenate([np.zeros((1, d)), np.cumsum(X, axis=0)])
+	mean = (csum[idx + 1] - csum[first]) / (idx - first + 1)[:, None]
+	prev = np.where(idx > starts, idx - 1, idx)
+	out = np.empty((n, windowed_feature_size(d)), dtype=np.float32)
+	out[:, :d] = X
+	out[:, d:2 * d] = mean
+	out[:, 2 * d:3 * d] = X - X[prev]
+	out[:, 3 * d:] = X - X[first]
+	return out
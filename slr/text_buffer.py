@@ -1,27 +1,154 @@
 from __future__ import annotations
 
-from collections import deque, Counter
+import math
+from collections import deque
 from dataclasses import dataclass
-from typing import Deque, List, Optional
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
 
 
 @dataclass
 class TemporalLabelSmoother:
-	"""Smooth frame-wise predictions into stable labels."""
+	"""Smooth frame-wise predictions into stable labels.
+
+	Majority vote over the last `window_size` labels. Counts are kept in
+	count buckets (count -> labels), so each push is O(1) regardless of
+	window size or vocabulary. On a tie the just-pushed label wins, else the
+	label that reached the top count first.
+	"""
 	window_size: int = 8
 	min_count: int = 4
 
 	def __post_init__(self):
-		self._window: Deque[str] = deque(maxlen=self.window_size)
+		self._window: Deque[str] = deque()
+		self._counts: Dict[str, int] = {}
+		# count -> insertion-ordered set of labels with that count
+		self._buckets: Dict[int, Dict[str, None]] = {}
+		self._max_count = 0
+
+	def _move(self, label: str, delta: int) -> None:
+		old = self._counts.get(label, 0)
+		new = old + delta
+		if old:
+			bucket = self._buckets[old]
+			del bucket[label]
+			if not bucket:
+				del self._buckets[old]
+				if old == self._max_count and delta < 0:
+					self._max_count = new
+		if new:
+			self._counts[label] = new
+			self._buckets.setdefault(new, {})[label] = None
+			self._max_count = max(self._max_count, new)
+		else:
+			del self._counts[label]
 
 	def push(self, label: str) -> Optional[str]:
+		if len(self._window) == self.window_size:
+			self._move(self._window.popleft(), -1)
 		self._window.append(label)
-		counts = Counter(self._window)
-		label, count = counts.most_common(1)[0]
-		if count >= self.min_count:
-			return label
+		self._move(label, +1)
+		if self._max_count < self.min_count:
+			return None
+		top = self._buckets[self._max_count]
+		return label if label in top else next(iter(top))
+
+	def reset(self) -> None:
+		self._window.clear()
+		self._counts.clear()
+		self._buckets.clear()
+		self._max_count = 0
+
+
+@dataclass
+class ProbabilityWindowDecoder:
+	"""Decode `predict_proba` vectors with a running probability sum.
+
+	A soft majority vote: keeps the per-class sum of probabilities over the
+	last `window_size` frames, updated in O(n_classes) per frame. The leader
+	is emitted when its lead over the runner-up, averaged over the full
+	window, reaches `min_margin`. Confident frames count for more than
+	hesitant ones, so a stable label needs fewer frames than with
+	`TemporalLabelSmoother` at the same flicker rate.
+	"""
+	classes: Sequence[str]
+	window_size: int = 6
+	min_margin: float = 0.2
+
+	def __post_init__(self):
+		self._classes = list(self.classes)
+		self._ring = np.zeros((self.window_size, len(self._classes)))
+		self._sum = np.zeros(len(self._classes))
+		self._count = 0
+		self._head = 0
+
+	def push(self, proba: Sequence[float]) -> Optional[str]:
+		proba = np.asarray(proba, dtype=np.float64)
+		if self._count == self.window_size:
+			self._sum -= self._ring[self._head]
+		else:
+			self._count += 1
+		self._ring[self._head] = proba
+		self._sum += proba
+		self._head = (self._head + 1) % self.window_size
+		if len(self._sum) < 2:
+			return self._classes[0] if len(self._sum) else None
+		second, best = np.partition(self._sum, -2)[-2:]
+		if (best - second) / self.window_size >= self.min_margin:
+			return self._classes[int(np.argmax(self._sum))]
 		return None
 
+	def reset(self) -> None:
+		self._sum[:] = 0.0
+		self._count = 0
+		self._head = 0
+
+
+@dataclass
+class ViterbiLabelDecoder:
+	"""Online Viterbi decoding of `predict_proba` vectors with a sticky HMM.
+
+	Hidden states are the classes; a label keeps itself with probability
+	`stay` and otherwise jumps uniformly. The classifier probabilities are
+	the emissions. Per frame the best-path log scores are updated in
+	O(n_classes); the best state is emitted when it leads the runner-up by
+	`min_margin` (log-odds), so a long confident run can't be undone by one
+	noisy frame and a new sign needs only a few confident frames.
+	"""
+	classes: Sequence[str]
+	stay: float = 0.95
+	min_margin: float = 5.0
+	floor: float = 1e-3
+
+	def __post_init__(self):
+		self._classes = list(self.classes)
+		k = len(self._classes)
+		self._log_stay = math.log(self.stay + (1.0 - self.stay) / k)
+		self._log_switch = math.log((1.0 - self.stay) / k)
+		self._scores: Optional[np.ndarray] = None
+
+	def push(self, proba: Sequence[float]) -> Optional[str]:
+		logp = np.log(np.maximum(np.asarray(proba, dtype=np.float64), self.floor))
+		if self._scores is None:
+			scores = logp
+		else:
+			# max over predecessors: stay in j, or switch from the best state
+			stay = self._scores + self._log_stay
+			switch = self._scores.max() + self._log_switch
+			scores = np.maximum(stay, switch) + logp
+		scores -= scores.max()
+		self._scores = scores
+		if len(scores) < 2:
+			return self._classes[0] if len(scores) else None
+		second, best = np.partition(scores, -2)[-2:]
+		if best - second >= self.min_margin:
+			return self._classes[int(np.argmax(scores))]
+		return None
+
+	def reset(self) -> None:
+		self._scores = None
+
 
 @dataclass
 class TextBuilder:
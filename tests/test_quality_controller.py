@@ -0,0 +1,58 @@
+from slr.hand import QUALITY_LEVELS, AdaptiveQualityController
+
+# Per-level detection cost (seconds) for QUALITY_LEVELS, cheapest last.
+LEVEL_COSTS = [0.040, 0.025, 0.018, 0.012, 0.008]
+
+
+class StubDetector:
+	def __init__(self):
+		self.levels = []
+
+	def set_quality(self, level):
+		self.levels.append(level)
+
+
+def _run(controller: AdaptiveQualityController, frames: int, first_frame_factor: float = 1.0) -> None:
+	"""Feed synthetic latencies; the first frame on each level costs `first_frame_factor` times more."""
+	for _ in range(frames):
+		cost = LEVEL_COSTS[controller.level_index]
+		if controller._since_switch == 0:
+			cost *= first_frame_factor
+		controller.observe(cost)
+
+
+def test_steps_down_to_first_level_within_budget():
+	detector = StubDetector()
+	controller = AdaptiveQualityController(detector, target_fps=30.0)
+	_run(controller, 3000)
+	assert controller.level_index == 1
+	assert controller.switches == 1
+	assert detector.levels == [QUALITY_LEVELS[0], QUALITY_LEVELS[1]]
+
+
+def test_slow_first_frame_after_switch_does_not_cascade():
+	controller = AdaptiveQualityController(StubDetector(), target_fps=30.0)
+	_run(controller, 3000, first_frame_factor=4.0)
+	assert controller.level_index == 1
+	assert controller.switches == 1
+
+
+def test_steps_back_up_when_load_drops():
+	controller = AdaptiveQualityController(StubDetector(), target_fps=30.0, retry_frames=100)
+	_run(controller, 100)
+	assert controller.level_index == 1
+	# Level 0 becomes cheap (e.g. a smaller frame); after retry_frames the
+	# controller tries it again and stays there.
+	for _ in range(1000):
+		controller.observe(0.010)
+	assert controller.level_index == 0
+
+
+def test_warmup_frames_are_not_averaged():
+	controller = AdaptiveQualityController(StubDetector(), target_fps=30.0, warmup_frames=2)
+	controller.observe(1.0)
+	controller.observe(1.0)
+	assert controller.latency is None
+	controller.observe(0.010)
+	assert controller.latency == 0.010
+	assert controller.level_index == 0